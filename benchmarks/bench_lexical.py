@@ -0,0 +1,85 @@
+"""
+Lexical feature extraction: NumPy backend vs. the Counter-based backend.
+
+Builds a synthetic text of the requested size from a fixed vocabulary with
+a Zipf-like word distribution, checks that both backends return identical
+feature values and reports their timings. Run from the repository root:
+
+    python benchmarks/bench_lexical.py --megabytes 10
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.features.lexical_features import LexicalFeatureExtractor  # noqa: E402
+from src.preprocessing.tokenized_document import TokenizedDocument  # noqa: E402
+
+
+def synthetic_text(size: int, seed: int = 0) -> str:
+    """Random prose of roughly ``size`` characters."""
+    rng = np.random.default_rng(seed)
+    syllables = ['ka', 'lo', 'mer', 'sti', 'un', 'dre', 'pha', 'ox', 'il', 'ten', 'qu', 'ar']
+    vocabulary = [
+        ''.join(rng.choice(syllables, size=rng.integers(1, 5)))
+        for _ in range(50000)
+    ]
+    vocabulary[:5] = ['The', 'and', 'of', 'A', 'to']
+    weights = 1 / np.arange(1, len(vocabulary) + 1)
+    weights /= weights.sum()
+    punctuation = np.array(['', '', '', '', ',', '.', ';', '!', '?'])
+
+    parts, length = [], 0
+    while length < size:
+        words = rng.choice(vocabulary, size=10000, p=weights)
+        marks = rng.choice(punctuation, size=10000)
+        chunk = ' '.join(word + mark for word, mark in zip(words, marks))
+        parts.append(chunk)
+        length += len(chunk) + 1
+    return ' '.join(parts)[:size]
+
+
+def best_of(runs: int, function, *args):
+    """Best wall-clock time of several runs and the last result."""
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = function(*args)
+        timings.append(time.perf_counter() - start)
+    return min(timings), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark lexical feature backends')
+    parser.add_argument('--megabytes', type=float, default=10, help='Size of the synthetic text')
+    parser.add_argument('--runs', type=int, default=3, help='Runs per backend')
+    args = parser.parse_args()
+
+    text = synthetic_text(int(args.megabytes * 1024 * 1024))
+    tokenize_time, doc = best_of(args.runs, TokenizedDocument, text)
+    print(f"text: {len(text) / 1e6:.1f}M chars, {len(doc.word_starts)} words; "
+          f"tokenization {tokenize_time:.3f} s")
+
+    results = {}
+    for backend in ('python', 'numpy'):
+        extractor = LexicalFeatureExtractor(backend=backend)
+        elapsed, features = best_of(args.runs, extractor.extract_features, doc)
+        results[backend] = (elapsed, features)
+        print(f"{backend:<7} {elapsed:.3f} s")
+
+    python_features, numpy_features = results['python'][1], results['numpy'][1]
+    if python_features != numpy_features:
+        differing = sorted(
+            key for key in python_features.keys() | numpy_features.keys()
+            if python_features.get(key) != numpy_features.get(key)
+        )
+        raise SystemExit(f"Backends disagree on: {differing}")
+    print(f"identical features; speedup {results['python'][0] / results['numpy'][0]:.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,82 @@
+"""
+Cold-start latency of the ``stilo`` command line.
+
+Every measurement runs in a fresh interpreter, so module imports are paid
+in full each time. Run from the repository root:
+
+    python benchmarks/bench_startup.py --runs 10
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+SCENARIOS = {
+    'help': [sys.executable, '-m', 'src.main', '--help'],
+    'bootstrap_help': [sys.executable, '-m', 'src.main', 'bootstrap', '--help'],
+    'import_app': [sys.executable, '-c', 'import src.stylometric_analysis_app'],
+    'construct_app': [
+        sys.executable, '-c',
+        'from src.stylometric_analysis_app import StylometricAnalysisApp; StylometricAnalysisApp()'
+    ],
+}
+
+# Modules that must not be imported before the stage that needs them
+DEFERRED_MODULES = ['spacy', 'sklearn', 'pandas', 'textblob', 'nltk', 'rich', 'pdfplumber']
+
+
+def time_command(command, runs):
+    """Wall-clock seconds of each run of a command."""
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run(command, cwd=ROOT, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=True)
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def loaded_heavy_modules():
+    """Heavy modules imported as a side effect of constructing the app."""
+    code = (
+        'import sys, json\n'
+        'from src.stylometric_analysis_app import StylometricAnalysisApp\n'
+        'StylometricAnalysisApp()\n'
+        f'print(json.dumps([m for m in {DEFERRED_MODULES!r} if m in sys.modules]))'
+    )
+    output = subprocess.run([sys.executable, '-c', code], cwd=ROOT, capture_output=True, text=True, check=True)
+    return json.loads(output.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark stilo cold-start latency')
+    parser.add_argument('--runs', type=int, default=5, help='Runs per scenario')
+    parser.add_argument('--json', action='store_true', help='Print results as JSON')
+    args = parser.parse_args()
+
+    results = {}
+    for name, command in SCENARIOS.items():
+        timings = time_command(command, args.runs)
+        results[name] = {
+            'median_s': statistics.median(timings),
+            'min_s': min(timings),
+            'max_s': max(timings)
+        }
+    results['heavy_modules_after_construct'] = loaded_heavy_modules()
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    for name in SCENARIOS:
+        timing = results[name]
+        print(f"{name:<16} median {timing['median_s'] * 1000:8.1f} ms  "
+              f"(min {timing['min_s'] * 1000:.1f}, max {timing['max_s'] * 1000:.1f})")
+    print(f"heavy modules loaded by construction: {results['heavy_modules_after_construct'] or 'none'}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,53 @@
+"""
+Syntactic feature extraction throughput per tier.
+
+Loads the spaCy model once per tier (see ``SYNTACTIC_TIERS``), parses the
+same synthetic documents with ``extract_features_batch`` and reports load
+time, components and throughput. Needs the model from ``stilo bootstrap``.
+Run from the repository root:
+
+    python benchmarks/bench_syntactic.py --documents 200
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from bench_lexical import synthetic_text  # noqa: E402
+from src.features.syntactic_features import SYNTACTIC_TIERS, SyntacticFeatureExtractor  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark syntactic feature tiers')
+    parser.add_argument('--documents', type=int, default=200, help='Number of documents')
+    parser.add_argument('--characters', type=int, default=5000, help='Characters per document')
+    parser.add_argument('--batch-size', type=int, default=8, help='Documents per nlp.pipe batch')
+    parser.add_argument('--processes', type=int, default=1, help='spaCy worker processes')
+    args = parser.parse_args()
+
+    texts = [synthetic_text(args.characters, seed=seed) for seed in range(args.documents)]
+    total_characters = sum(map(len, texts))
+
+    for tier in SYNTACTIC_TIERS:
+        extractor = SyntacticFeatureExtractor(tier=tier)
+        start = time.perf_counter()
+        try:
+            pipeline = extractor.nlp
+        except OSError as e:
+            raise SystemExit(f"spaCy model not available ({e}); run: stilo bootstrap")
+        load_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        features = list(extractor.extract_features_batch(
+            texts, batch_size=args.batch_size, n_process=args.processes
+        ))
+        elapsed = time.perf_counter() - start
+        print(f"{tier:<5} load {load_time:.2f} s, components {', '.join(pipeline.pipe_names)}")
+        print(f"      {len(features) / elapsed:.1f} docs/s, {total_characters / elapsed / 1000:.0f}k chars/s, "
+              f"{len(features[0])} features")
+
+
+if __name__ == '__main__':
+    main()
@@ -5,10 +5,15 @@ setup(
     version="0.1",
     packages=find_packages(),
     install_requires=[
+        "numpy>=1.21.0",
+        "scipy>=1.7.0",
         "pandas>=1.3.0",
         "nltk>=3.6.5",
+        "pdfplumber>=0.10.4",
         "PyPDF2>=2.0.0",
         "scikit-learn>=0.24.2",
+        "joblib>=1.0.0",
+        "readability>=0.3",
         "pydantic>=1.8.2",
         "spacy>=3.1.0",
         "textblob>=0.15.3",
@@ -0,0 +1,114 @@
+from typing import Optional, Tuple
+import numpy as np
+from src.preprocessing.tokenized_document import TokenizedDocument
+
+# Odd 64-bit multipliers for polynomial hashing. Arithmetic wraps modulo
+# 2**64, so every power of an odd base stays invertible and distinct spans
+# collide only by chance.
+PRIMARY_BASE = 0x100000001B3
+SECONDARY_BASE = 0x9E3779B97F4A7C15
+
+
+def span_hashes(codes: np.ndarray, starts: np.ndarray, ends: np.ndarray,
+                base: int = PRIMARY_BASE) -> np.ndarray:
+    """
+    Polynomial hashes of text spans, computed for all spans at once.
+
+    Prefix sums of ``code * base**position`` give every span's weighted sum
+    with one subtraction; multiplying by ``base**-start`` (odd numbers are
+    invertible modulo 2**64) shifts it to a position-independent value, so
+    equal spans hash equally wherever they occur, in any text.
+
+    Args:
+        codes: Code points of the text
+        starts: Span start offsets
+        ends: Span end offsets
+
+    Returns:
+        uint64 hash of every span
+    """
+    n = len(codes)
+    prefix = np.zeros(n + 1, dtype=np.uint64)
+    np.cumsum(codes.astype(np.uint64) * _powers(base, n), out=prefix[1:])
+    inverse_powers = _powers(pow(base, -1, 1 << 64), n)
+    return (prefix[ends] - prefix[starts]) * inverse_powers[starts]
+
+
+def _powers(base: int, count: int) -> np.ndarray:
+    """``base**i`` modulo 2**64 for i in range(count)."""
+    powers = np.empty(count, dtype=np.uint64)
+    if count:
+        powers[0] = 1
+        powers[1:] = base
+        np.cumprod(powers, out=powers)
+    return powers
+
+
+def mix64(hashes: np.ndarray) -> np.ndarray:
+    """
+    Scramble 64-bit hashes so every output bit depends on every input bit.
+
+    Polynomial hashes have weak low bits; sketches that index by some bits
+    and count leading zeros of others need uniformly distributed bits.
+    This is the MurmurHash3 64-bit finalizer.
+    """
+    hashes = hashes.astype(np.uint64, copy=True)
+    hashes ^= hashes >> np.uint64(33)
+    hashes *= np.uint64(0xFF51AFD7ED558CCD)
+    hashes ^= hashes >> np.uint64(33)
+    hashes *= np.uint64(0xC4CEB9FE1A85EC53)
+    hashes ^= hashes >> np.uint64(33)
+    return hashes
+
+
+def span_ids(codes: np.ndarray, starts: np.ndarray,
+             ends: np.ndarray) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+    """
+    Map text spans to integer ids, equal ids meaning equal text.
+
+    Spans are grouped by their primary hash; every group is then checked
+    against its first member with the span length and an independent
+    secondary hash, so a collision is detected rather than silently
+    merging two different spans.
+
+    Args:
+        codes: Code points of the text
+        starts: Span start offsets
+        ends: Span end offsets
+
+    Returns:
+        Tuple of (ids, counts) where ``ids[i]`` indexes ``counts``, or None
+        if a hash collision was detected
+    """
+    primary = span_hashes(codes, starts, ends, PRIMARY_BASE)
+    _, first, ids, counts = np.unique(
+        primary, return_index=True, return_inverse=True, return_counts=True
+    )
+    ids = ids.ravel()
+    representative = first[ids]
+    lengths = ends - starts
+    if not np.array_equal(lengths, lengths[representative]):
+        return None
+    secondary = span_hashes(codes, starts, ends, SECONDARY_BASE)
+    if not np.array_equal(secondary, secondary[representative]):
+        return None
+    return ids, counts
+
+
+def lowercase_word_hashes(doc: TokenizedDocument) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Mixed hashes and lengths of the lowercased words of a document.
+
+    Args:
+        doc: Tokenized text
+
+    Returns:
+        Tuple of (uint64 hash of every word, length of every lowercased word)
+    """
+    lowered = doc.lowercase_codes()
+    if lowered is None:
+        # Lowercasing splits some words; hash the lowercased words instead
+        doc = TokenizedDocument(' '.join(doc.words(lowercase=True)))
+        lowered = doc.codes
+    hashes = span_hashes(lowered, doc.word_starts, doc.word_ends)
+    return mix64(hashes), doc.word_lengths
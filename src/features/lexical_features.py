@@ -1,19 +1,46 @@
 import numpy as np
-from typing import Dict, List
-import re
+from typing import Dict, Optional, Tuple, Union
 from collections import Counter
 import logging
-from textblob import TextBlob
+from src.features.hashing import lowercase_word_hashes, span_ids
+from src.features.schema import feature_schema
+from src.features.sketches import VocabularySketch
+from src.features.statistics import Moments
+from src.preprocessing.tokenized_document import TokenizedDocument
 
 logger = logging.getLogger(__name__)
 
+BACKENDS = ('numpy', 'python')
+VOCABULARY_MODES = ('exact', 'approximate')
+
 class LexicalFeatureExtractor:
     """Extracts lexical features from text for stylometric analysis."""
     
-    def __init__(self):
-        self.word_pattern = re.compile(r'\b\w+\b')
+    def __init__(self, backend: str = 'numpy', vocabulary_mode: str = 'exact',
+                 sketch_precision: int = 14, sketch_sample_size: int = 4096):
+        """
+        Args:
+            backend: 'numpy' maps words to integer ids and counts them with
+                ``np.unique``, and counts characters with ``np.bincount``;
+                'python' counts word and character strings with ``Counter``.
+                Both produce identical feature values.
+            vocabulary_mode: 'exact' counts every distinct word; 'approximate'
+                estimates the type and hapax ratios with a constant-memory
+                ``VocabularySketch`` (see its docstring for error bounds)
+            sketch_precision: HyperLogLog precision of the approximate mode
+            sketch_sample_size: Bottom-k sample size of the approximate mode
+        """
+        if backend not in BACKENDS:
+            raise ValueError(f"Unknown lexical backend: {backend}")
+        if vocabulary_mode not in VOCABULARY_MODES:
+            raise ValueError(f"Unknown vocabulary mode: {vocabulary_mode}")
+        self.backend = backend
+        self.vocabulary_mode = vocabulary_mode
+        self.sketch_precision = sketch_precision
+        self.sketch_sample_size = sketch_sample_size
         
-    def extract_features(self, text: str) -> Dict[str, float]:
+    def extract_features(self, text: Union[str, TokenizedDocument],
+                         out: Optional[np.ndarray] = None) -> Dict[str, float]:
         """
         Extract lexical features from the text.
         
@@ -26,82 +53,137 @@ class LexicalFeatureExtractor:
         - Word length distributions
         
         Args:
-            text: Preprocessed input text
+            text: Preprocessed input text, or its shared tokenization
+            out: Row of the feature schema (see ``FeatureSchema``) that the
+                features are also written into
             
         Returns:
             Dictionary of lexical features
         """
         try:
+            doc = text if isinstance(text, TokenizedDocument) else TokenizedDocument(text)
+            
             # Basic text statistics
-            words = self.word_pattern.findall(text.lower())
-            word_counts = Counter(words)
-            char_counts = Counter(text)
+            if self.vocabulary_mode == 'approximate':
+                word_lengths, vocabulary = self.sketch_vocabulary(doc)
+                codes, counts = doc.character_counts()
+                char_counts = dict(zip(map(chr, codes.tolist()), counts.tolist()))
+                type_ratio, hapax_ratio = vocabulary.ratios()
+            else:
+                counts = self._count_vectorized(doc) if self.backend == 'numpy' else None
+                if counts is None:
+                    counts = self._count_python(doc)
+                word_lengths, word_frequencies, char_counts = counts
+                type_ratio = self._calculate_ttr(word_frequencies, len(word_lengths))
+                hapax_ratio = self._calculate_hapax_ratio(word_frequencies, len(word_lengths))
             
             # Calculate features
             features = {
-                'avg_word_length': self._calculate_avg_word_length(words),
-                'vocabulary_richness': len(word_counts) / len(words) if words else 0,
-                'type_token_ratio': self._calculate_ttr(words),
-                'hapax_ratio': self._calculate_hapax_ratio(word_counts, len(words)),
-                'char_diversity': len(char_counts) / len(text) if text else 0,
-                'word_length_variance': self._calculate_word_length_variance(words),
-                'unique_words_ratio': len(set(words)) / len(words) if words else 0,
-                'punctuation_ratio': self._calculate_punctuation_ratio(text)
+                'avg_word_length': self._calculate_avg_word_length(word_lengths),
+                'vocabulary_richness': type_ratio,
+                'type_token_ratio': type_ratio,
+                'hapax_ratio': hapax_ratio,
+                'char_diversity': len(char_counts) / doc.length if doc.length else 0,
+                'word_length_variance': self._calculate_word_length_variance(word_lengths),
+                'unique_words_ratio': type_ratio,
+                'punctuation_ratio': self._calculate_punctuation_ratio(doc)
             }
             
             # Add character frequency distributions
-            char_freqs = self._calculate_char_frequencies(text)
+            char_freqs = self._calculate_char_frequencies(char_counts, doc.length)
             features.update(char_freqs)
+            if out is not None:
+                feature_schema().write(features, out)
             
             return features
             
         except Exception as e:
             logger.error(f"Error extracting lexical features: {str(e)}")
             raise
+
+    def sketch_vocabulary(self, doc: TokenizedDocument) -> Tuple[np.ndarray, VocabularySketch]:
+        """
+        Summarize the words of a text in a constant-memory vocabulary sketch.
+        
+        Returns:
+            Tuple of (word lengths, sketch of the lowercased words)
+        """
+        hashes, word_lengths = lowercase_word_hashes(doc)
+        vocabulary = VocabularySketch(self.sketch_precision, self.sketch_sample_size)
+        vocabulary.add(hashes)
+        return word_lengths, vocabulary
+
+    def _count_vectorized(self, doc: TokenizedDocument
+                          ) -> Optional[Tuple[np.ndarray, np.ndarray, Dict[str, int]]]:
+        """
+        Count words and characters on integer arrays.
+        
+        Returns:
+            Tuple of (word lengths, occurrences of each distinct word,
+            character counts), or None when the text needs the string-based
+            counting (lowercasing changes its length, or a hash collision)
+        """
+        lowered = doc.lowercase_codes()
+        if lowered is None:
+            return None
+        word_ids = span_ids(lowered, doc.word_starts, doc.word_ends)
+        if word_ids is None:
+            logger.debug("Word hash collision, counting words as strings")
+            return None
+        _, word_frequencies = word_ids
+        
+        codes, counts = doc.character_counts()
+        char_counts = dict(zip(map(chr, codes.tolist()), counts.tolist()))
+        return doc.word_lengths, word_frequencies, char_counts
+        
+    def _count_python(self, doc: TokenizedDocument) -> Tuple[np.ndarray, np.ndarray, Dict[str, int]]:
+        """Count words and characters as strings."""
+        words = doc.words(lowercase=True)
+        word_lengths = np.fromiter(map(len, words), dtype=np.int64, count=len(words))
+        word_counts = Counter(words)
+        word_frequencies = np.fromiter(word_counts.values(), dtype=np.int64, count=len(word_counts))
+        return word_lengths, word_frequencies, Counter(doc.text)
             
-    def _calculate_avg_word_length(self, words: List[str]) -> float:
+    def _calculate_avg_word_length(self, word_lengths: np.ndarray) -> float:
         """Calculate average word length."""
-        if not words:
-            return 0
-        return np.mean([len(word) for word in words])
+        return Moments.from_values(word_lengths).mean()
         
-    def _calculate_ttr(self, words: List[str]) -> float:
+    def _calculate_ttr(self, word_frequencies: np.ndarray, total_words: int) -> float:
         """Calculate Type-Token Ratio."""
-        if not words:
+        if not total_words:
             return 0
-        return len(set(words)) / len(words)
+        return len(word_frequencies) / total_words
         
-    def _calculate_hapax_ratio(self, word_counts: Counter, total_words: int) -> float:
+    def _calculate_hapax_ratio(self, word_frequencies: np.ndarray, total_words: int) -> float:
         """Calculate ratio of words that appear only once."""
         if not total_words:
             return 0
-        hapax_count = sum(1 for count in word_counts.values() if count == 1)
+        hapax_count = int(np.count_nonzero(word_frequencies == 1))
         return hapax_count / total_words
         
-    def _calculate_word_length_variance(self, words: List[str]) -> float:
+    def _calculate_word_length_variance(self, word_lengths: np.ndarray) -> float:
         """Calculate variance in word lengths."""
-        if not words:
-            return 0
-        word_lengths = [len(word) for word in words]
-        return np.var(word_lengths)
+        return Moments.from_values(word_lengths).variance()
         
-    def _calculate_char_frequencies(self, text: str) -> Dict[str, float]:
+    def _calculate_char_frequencies(self, char_counts: Dict[str, int], total_chars: int) -> Dict[str, float]:
         """Calculate character frequency distributions."""
-        if not text:
+        if not total_chars:
             return {}
             
-        char_counts = Counter(text.lower())
-        total_chars = len(text)
+        # Fold case on the distinct characters rather than the whole text
+        lower_counts = Counter()
+        for char, count in char_counts.items():
+            for lower_char in char.lower():
+                lower_counts[lower_char] += count
         
         return {
             f'freq_{char}': count/total_chars 
-            for char, count in char_counts.items()
+            for char, count in lower_counts.items()
             if char.isalpha()
         }
         
-    def _calculate_punctuation_ratio(self, text: str) -> float:
+    def _calculate_punctuation_ratio(self, doc: TokenizedDocument) -> float:
         """Calculate ratio of punctuation marks to total characters."""
-        if not text:
+        if not doc.length:
             return 0
-        punctuation_count = sum(1 for char in text if not char.isalnum() and not char.isspace())
-        return punctuation_count / len(text) 
\ No newline at end of file
+        return doc.punctuation_count / doc.length 
\ No newline at end of file
@@ -0,0 +1,177 @@
+import itertools
+import numpy as np
+from typing import Iterable, Optional, Tuple, Union
+import logging
+from src.features.hashing import PRIMARY_BASE, lowercase_word_hashes, mix64, span_hashes
+from src.preprocessing.tokenized_document import SPACE, TokenizedDocument
+
+logger = logging.getLogger(__name__)
+
+NORMS = ('l2', 'l1', None)
+
+# Added to the hashes of each n-gram kind before mixing, so a character
+# n-gram and a word n-gram never share a bucket systematically
+_CHAR_SALT = 0x43484152
+_WORD_SALT = 0x574F5244
+
+
+def _sum_by_bucket(buckets: np.ndarray, weights: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Distinct buckets in ascending order and the summed weight of each."""
+    columns, inverse = np.unique(buckets, return_inverse=True)
+    return columns, np.bincount(inverse.ravel(), weights=weights, minlength=len(columns))
+
+
+class NgramFeatureExtractor:
+    """
+    Character and word n-gram profiles as fixed-size sparse vectors.
+
+    N-grams are never materialized as strings: every n-gram is a polynomial
+    hash computed from the shared ``TokenizedDocument`` arrays and folded
+    into one of ``n_features`` buckets (the hashing trick), so memory
+    depends on the number of distinct buckets hit, not on the vocabulary.
+    Vectors of different documents share the same columns and stack into
+    a corpus matrix with ``scipy.sparse.vstack``.
+    """
+
+    def __init__(self, char_range: Optional[Tuple[int, int]] = (2, 4),
+                 word_range: Optional[Tuple[int, int]] = (1, 2),
+                 n_features: int = 1 << 18, alternate_sign: bool = True,
+                 norm: Optional[str] = 'l2'):
+        """
+        Args:
+            char_range: Smallest and largest character n-gram length, or
+                None to skip character n-grams
+            word_range: Smallest and largest word n-gram length, or None to
+                skip word n-grams
+            n_features: Number of columns of the output vectors
+            alternate_sign: Give each bucket's contributions a hash-derived
+                sign, so collisions cancel out in expectation
+            norm: Normalize each vector to unit 'l2' or 'l1' norm, or None
+                for raw counts
+        """
+        for name, ngram_range in (('char_range', char_range), ('word_range', word_range)):
+            if ngram_range is not None and not 1 <= ngram_range[0] <= ngram_range[1]:
+                raise ValueError(f"Invalid {name}: {ngram_range}")
+        if char_range is None and word_range is None:
+            raise ValueError("At least one of char_range and word_range is required")
+        if n_features < 1:
+            raise ValueError(f"n_features must be positive, got {n_features}")
+        if norm not in NORMS:
+            raise ValueError(f"Unknown norm: {norm}")
+        self.char_range = char_range
+        self.word_range = word_range
+        self.n_features = n_features
+        self.alternate_sign = alternate_sign
+        self.norm = norm
+
+    def extract_features(self, text: Union[str, TokenizedDocument]):
+        """
+        Hash the n-grams of a text into a sparse vector.
+
+        Character n-grams are taken over the lowercased text with every
+        whitespace character read as a space; word n-grams over the
+        lowercased words.
+
+        Args:
+            text: Preprocessed input text, or its shared tokenization
+
+        Returns:
+            ``scipy.sparse.csr_matrix`` of shape (1, n_features)
+        """
+        from scipy import sparse
+
+        try:
+            doc = text if isinstance(text, TokenizedDocument) else TokenizedDocument(text)
+            columns, values = self._bucket_counts(doc)
+            vector = sparse.csr_matrix(
+                (values, columns, np.array([0, len(columns)])),
+                shape=(1, self.n_features)
+            )
+            return self._normalize(vector)
+
+        except Exception as e:
+            logger.error(f"Error extracting n-gram features: {str(e)}")
+            raise
+
+    def transform(self, texts: Iterable[Union[str, TokenizedDocument]]):
+        """
+        Stack the n-gram vectors of several texts into a corpus matrix.
+
+        Returns:
+            ``scipy.sparse.csr_matrix`` with one row per text
+        """
+        from scipy import sparse
+
+        rows = [self.extract_features(text) for text in texts]
+        if not rows:
+            return sparse.csr_matrix((0, self.n_features), dtype=np.float32)
+        return sparse.vstack(rows, format='csr')
+
+    def _bucket_counts(self, doc: TokenizedDocument) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Sum the signed contributions of all n-grams per bucket.
+
+        Returns:
+            Tuple of (sorted bucket indices, float32 value of each bucket)
+            with empty buckets removed
+        """
+        ngram_hashes = []
+        if self.char_range is not None:
+            ngram_hashes = self._char_ngram_hashes(doc)
+        if self.word_range is not None:
+            ngram_hashes = itertools.chain(ngram_hashes, self._word_ngram_hashes(doc))
+
+        # Reduce one n-gram length at a time so only one full-length hash
+        # array is alive at once
+        columns = np.zeros(0, dtype=np.uint64)
+        values = np.zeros(0, dtype=np.float64)
+        for hashes in ngram_hashes:
+            buckets = hashes % np.uint64(self.n_features)
+            if self.alternate_sign:
+                # The top bit is independent of the low bits used for the bucket
+                weights = np.where(hashes >> np.uint64(63), -1.0, 1.0)
+            else:
+                weights = np.ones(len(hashes))
+            columns, values = _sum_by_bucket(
+                np.concatenate((columns, buckets)), np.concatenate((values, weights))
+            )
+        nonzero = values != 0
+        return columns[nonzero].astype(np.int32), values[nonzero].astype(np.float32)
+
+    def _char_ngram_hashes(self, doc: TokenizedDocument) -> Iterable[np.ndarray]:
+        """Mixed hashes of every character n-gram, one array per length."""
+        codes = doc.lowercase_codes()
+        if codes is None:
+            # Lowercasing changes the text length; hash the lowered text
+            doc = TokenizedDocument(doc.text.lower())
+            codes = doc.codes
+        codes = np.where(doc.flags & SPACE, ord(' '), codes)
+        low, high = self.char_range
+        for n in range(low, min(high, len(codes)) + 1):
+            starts = np.arange(len(codes) - n + 1)
+            ngrams = span_hashes(codes, starts, starts + n)
+            yield mix64(ngrams + np.uint64(_CHAR_SALT + n))
+
+    def _word_ngram_hashes(self, doc: TokenizedDocument) -> Iterable[np.ndarray]:
+        """Mixed hashes of every word n-gram, one array per length."""
+        words, _ = lowercase_word_hashes(doc)
+        low, high = self.word_range
+        ngrams = words
+        for n in range(1, min(high, len(words)) + 1):
+            if n > 1:
+                # Extend every (n-1)-gram by the word that follows it
+                ngrams = ngrams[:-1] * np.uint64(PRIMARY_BASE) + words[n - 1:]
+            if n >= low:
+                yield mix64(ngrams + np.uint64(_WORD_SALT + n))
+
+    def _normalize(self, vector):
+        """Scale the vector's values to unit norm in place."""
+        if self.norm is None or not vector.nnz:
+            return vector
+        values = vector.data.astype(np.float64)
+        if self.norm == 'l2':
+            scale = np.sqrt(np.dot(values, values))
+        else:
+            scale = np.abs(values).sum()
+        vector.data = (values / scale).astype(np.float32)
+        return vector
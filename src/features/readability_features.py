@@ -1,20 +1,30 @@
 import logging
-import math
-from typing import Dict, List
-import nltk
-from textblob import TextBlob
-import re
+from typing import Dict, List, Optional, Sequence, Union
+import numpy as np
+from src.features.readability_formulas import readability_scores
+from src.features.schema import feature_schema
+from src.features.statistics import ReadabilityStatistics
+from src.features.syllable_lexicon import SyllableCounter, SyllableLexicon
+from src.features.windowed_readability import WindowedReadability
+from src.preprocessing.tokenized_document import TokenizedDocument
 
 logger = logging.getLogger(__name__)
 
 class ReadabilityAnalyzer:
     """Analyzes text readability using various metrics."""
     
-    def __init__(self):
-        self.syllable_dict = {}
-        self.sentence_pattern = re.compile(r'[.!?]+(?=\s+|$)')
+    def __init__(self, lexicon_path: Optional[str] = None, syllable_cache_size: int = 1 << 16):
+        """
+        Args:
+            lexicon_path: Syllable lexicon built by ``stilo bootstrap``
+                (``default_lexicon_path()`` if omitted); without it every
+                word is counted by the vowel-group heuristic
+            syllable_cache_size: Maximum number of heuristic counts kept
+        """
+        self.syllable_counter = SyllableCounter(SyllableLexicon.load(lexicon_path), syllable_cache_size)
         
-    def analyze(self, text: str) -> Dict[str, float]:
+    def analyze(self, text: Union[str, TokenizedDocument],
+                out: Optional[np.ndarray] = None) -> Dict[str, float]:
         """
         Calculate various readability metrics.
         
@@ -25,107 +35,91 @@ class ReadabilityAnalyzer:
         - SMOG Index
         - Dale-Chall Score
         - Automated Readability Index
+        - Coleman-Liau Index
+        - LIX and RIX
+        - Linsear Write
+        
+        The text is counted once into a ``ReadabilityStatistics`` record
+        and every metric is derived from the counts.
         
         Args:
-            text: Preprocessed input text
+            text: Preprocessed input text, or its shared tokenization
+            out: Row of the feature schema (see ``FeatureSchema``) that the
+                features are also written into
             
         Returns:
             Dictionary of readability metrics
         """
         try:
-            # Split text into sentences using regex
-            sentences = [s.strip() for s in self.sentence_pattern.split(text) if s.strip()]
-            # Split into words (simpler approach)
-            words = [w for w in text.split() if w.strip()]
-            
-            num_sentences = len(sentences)
-            num_words = len(words)
-            num_syllables = sum(self._count_syllables(word) for word in words)
-            num_complex_words = sum(1 for word in words if self._count_syllables(word) >= 3)
-            
-            metrics = {
-                'flesch_reading_ease': self._flesch_reading_ease(
-                    num_syllables, num_words, num_sentences
-                ),
-                'flesch_kincaid_grade': self._flesch_kincaid_grade(
-                    num_syllables, num_words, num_sentences
-                ),
-                'gunning_fog': self._gunning_fog(
-                    num_words, num_complex_words, num_sentences
-                ),
-                'smog_index': self._smog_index(
-                    num_complex_words, num_sentences
-                ),
-                'automated_readability_index': self._automated_readability_index(
-                    text, num_words, num_sentences
-                ),
-                'average_syllables_per_word': num_syllables / num_words if num_words else 0,
-                'complex_word_ratio': num_complex_words / num_words if num_words else 0
-            }
-            
+            doc = text if isinstance(text, TokenizedDocument) else TokenizedDocument(text)
+            metrics = self.analyze_statistics(ReadabilityStatistics.from_document(doc, self.syllable_counter))
+            if out is not None:
+                feature_schema().write(metrics, out)
             return metrics
             
         except Exception as e:
             logger.error(f"Error calculating readability metrics: {str(e)}")
             raise
-            
-    def _count_syllables(self, word: str) -> int:
-        """Count the number of syllables in a word."""
-        word = word.lower()
+
+    def analyze_windows(self, text: Union[str, TokenizedDocument], window_size: int = 200,
+                        stride: Optional[int] = None) -> Dict[str, np.ndarray]:
+        """
+        Calculate readability and lexical metrics of sliding windows over a text.
         
-        # Check cache
-        if word in self.syllable_dict:
-            return self.syllable_dict[word]
-            
-        # Count vowel groups
-        count = 0
-        vowels = "aeiouy"
-        prev_char_is_vowel = False
+        Counts are tokenized once and kept as prefix sums (see
+        ``WindowedReadability``), so the cost per window does not grow
+        with its size.
         
-        for char in word:
-            is_vowel = char in vowels
-            if is_vowel and not prev_char_is_vowel:
-                count += 1
-            prev_char_is_vowel = is_vowel
+        Args:
+            text: Preprocessed input text, or its shared tokenization
+            window_size: Tokens per window
+            stride: Tokens between window starts (``window_size`` if omitted)
             
-        # Adjust for silent e
-        if word.endswith('e'):
-            count -= 1
+        Returns:
+            Dictionary of window boundaries, counts and one array per metric
+        """
+        try:
+            doc = text if isinstance(text, TokenizedDocument) else TokenizedDocument(text)
+            return WindowedReadability(doc, self.syllable_counter).windows(window_size, stride)
             
-        # Ensure at least one syllable
-        count = max(1, count)
-        
-        # Cache result
-        self.syllable_dict[word] = count
-        return count
-        
-    def _flesch_reading_ease(self, syllables: int, words: int, sentences: int) -> float:
-        """Calculate Flesch Reading Ease score."""
-        if not words or not sentences:
-            return 0
-        return 206.835 - 1.015 * (words / sentences) - 84.6 * (syllables / words)
-        
-    def _flesch_kincaid_grade(self, syllables: int, words: int, sentences: int) -> float:
-        """Calculate Flesch-Kincaid Grade Level."""
-        if not words or not sentences:
-            return 0
-        return 0.39 * (words / sentences) + 11.8 * (syllables / words) - 15.59
-        
-    def _gunning_fog(self, words: int, complex_words: int, sentences: int) -> float:
-        """Calculate Gunning Fog Index."""
-        if not words or not sentences:
-            return 0
-        return 0.4 * ((words / sentences) + 100 * (complex_words / words))
+        except Exception as e:
+            logger.error(f"Error calculating windowed readability metrics: {str(e)}")
+            raise
+
+    def analyze_sections(self, text: Union[str, TokenizedDocument], char_starts: Sequence[int],
+                         char_ends: Sequence[int]) -> Dict[str, np.ndarray]:
+        """
+        Calculate readability and lexical metrics of text sections.
         
-    def _smog_index(self, complex_words: int, sentences: int) -> float:
-        """Calculate SMOG Index."""
-        if not sentences:
-            return 0
-        return 1.0430 * math.sqrt(complex_words * (30 / sentences)) + 3.1291
+        Args:
+            text: Preprocessed input text, or its shared tokenization
+            char_starts: Character offset where every section starts
+            char_ends: Character offset where every section ends
+            
+        Returns:
+            Dictionary of section boundaries, counts and one array per metric
+        """
+        try:
+            doc = text if isinstance(text, TokenizedDocument) else TokenizedDocument(text)
+            return WindowedReadability(doc, self.syllable_counter).sections(char_starts, char_ends)
+            
+        except Exception as e:
+            logger.error(f"Error calculating section readability metrics: {str(e)}")
+            raise
+
+    def analyze_statistics(self, stats: ReadabilityStatistics) -> Dict[str, float]:
+        """
+        Calculate readability metrics from precomputed text statistics.
         
-    def _automated_readability_index(self, text: str, words: int, sentences: int) -> float:
-        """Calculate Automated Readability Index."""
-        if not words or not sentences:
-            return 0
-        characters = len(text) - text.count(' ')
-        return 4.71 * (characters / words) + 0.5 * (words / sentences) - 21.43 
\ No newline at end of file
+        Args:
+            stats: Counts record of a text (words, sentences, syllables,
+                polysyllables, long and difficult words, characters)
+            
+        Returns:
+            Dictionary of readability metrics
+        """
+        return readability_scores(**stats.counts())
+            
+    def _count_syllables(self, word: str) -> int:
+        """Count the number of syllables in a word."""
+        return self.syllable_counter.count(word)
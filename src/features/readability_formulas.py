@@ -0,0 +1,161 @@
+from functools import lru_cache
+from typing import Dict, Iterable, Optional, Union
+import numpy as np
+from src.features.hashing import mix64, span_hashes
+from src.features.syllable_lexicon import word_core, word_hashes
+from src.preprocessing.tokenized_document import TokenizedDocument
+
+# Metrics derived from a readability counts record, in output order
+READABILITY_METRICS = (
+    'flesch_reading_ease', 'flesch_kincaid_grade', 'gunning_fog', 'smog_index',
+    'dale_chall_score', 'automated_readability_index', 'coleman_liau_index',
+    'lix', 'rix', 'linsear_write', 'average_syllables_per_word', 'complex_word_ratio'
+)
+
+# Words longer than this many characters are long words for LIX and RIX
+LONG_WORD_LENGTH = 6
+
+Count = Union[int, np.ndarray]
+
+
+class WordSet:
+    """
+    Frozen set of words matched against document tokens by hash.
+
+    Words are stored as a sorted array of 64-bit hashes of their lowercased
+    alphanumeric cores, so membership of every token of a document is one
+    vectorized binary search.
+    """
+
+    def __init__(self, words: Iterable[str]):
+        cores = {word_core(word.lower()) for word in words}
+        cores.discard('')
+        self.hashes = np.unique(word_hashes(sorted(cores)))
+
+    def __len__(self) -> int:
+        return len(self.hashes)
+
+    def contains(self, hashes: np.ndarray) -> np.ndarray:
+        """Mask of the hashes that belong to the set."""
+        if not len(self.hashes):
+            return np.zeros(len(hashes), dtype=bool)
+        positions = np.minimum(np.searchsorted(self.hashes, hashes), len(self.hashes) - 1)
+        return self.hashes[positions] == hashes
+
+    def contains_cores(self, doc: TokenizedDocument, core_starts: np.ndarray,
+                       core_ends: np.ndarray) -> np.ndarray:
+        """
+        Mask of the token cores (see ``TokenizedDocument.token_cores``) in the set.
+        """
+        lowered = doc.lowercase_codes()
+        if lowered is not None:
+            return self.contains(mix64(span_hashes(lowered, core_starts, core_ends)))
+        text = doc.text
+        return self.contains(word_hashes([
+            text[start:end].lower() for start, end in zip(core_starts.tolist(), core_ends.tolist())
+        ]))
+
+
+@lru_cache(maxsize=1)
+def dale_chall_words() -> WordSet:
+    """The Dale-Chall list of about 3000 familiar words, from the ``readability`` package."""
+    from readability.langdata import LANGDATA
+
+    return WordSet(LANGDATA['en']['basicwords'])
+
+
+def _ratio(numerator: Count, denominator: Count) -> np.ndarray:
+    """Elementwise ``numerator / denominator``, 0 where the denominator is 0."""
+    numerator = np.asarray(numerator, dtype=np.float64)
+    denominator = np.asarray(denominator, dtype=np.float64)
+    return np.divide(numerator, denominator, out=np.zeros(np.broadcast(numerator, denominator).shape),
+                     where=denominator > 0)
+
+
+def readability_scores(words: Count, sentences: Count, syllables: Count, polysyllables: Count,
+                       long_words: Count, difficult_words: Count,
+                       characters: Count) -> Dict[str, Union[float, np.ndarray]]:
+    """
+    Compute every readability metric from a counts record.
+
+    All metrics are closed-form functions of these seven counts, so a new
+    metric never needs another pass over the text. The counts may be
+    integers, giving floats, or arrays of the counts of many spans (see
+    ``WindowedReadability``), giving one array per metric. A text without
+    words or sentences scores 0.
+
+    Args:
+        words: Whitespace-delimited tokens
+        sentences: Non-empty sentences
+        syllables: Syllables of all tokens
+        polysyllables: Tokens of three or more syllables
+        long_words: Tokens whose core is longer than ``LONG_WORD_LENGTH``
+        difficult_words: Tokens whose core is not on the Dale-Chall list
+        characters: Non-space characters
+
+    Returns:
+        Dictionary with the metrics in ``READABILITY_METRICS``
+    """
+    scored = (np.asarray(words) > 0) & (np.asarray(sentences) > 0)
+    words_per_sentence = _ratio(words, sentences)
+    syllables_per_word = _ratio(syllables, words)
+    complex_ratio = _ratio(polysyllables, words)
+    characters_per_word = _ratio(characters, words)
+    difficult_percent = 100 * _ratio(difficult_words, words)
+    # Linsear Write: 1 point per easy word, 3 per hard word, per sentence
+    linsear = _ratio(np.asarray(words) + 2 * np.asarray(polysyllables), sentences)
+
+    scores = {
+        'flesch_reading_ease': 206.835 - 1.015 * words_per_sentence - 84.6 * syllables_per_word,
+        'flesch_kincaid_grade': 0.39 * words_per_sentence + 11.8 * syllables_per_word - 15.59,
+        'gunning_fog': 0.4 * (words_per_sentence + 100 * complex_ratio),
+        'dale_chall_score': (0.1579 * difficult_percent + 0.0496 * words_per_sentence
+                             + np.where(difficult_percent > 5, 3.6365, 0.0)),
+        'automated_readability_index': 4.71 * characters_per_word + 0.5 * words_per_sentence - 21.43,
+        'coleman_liau_index': (0.0588 * 100 * characters_per_word
+                               - 0.296 * 100 * _ratio(sentences, words) - 15.8),
+        'lix': words_per_sentence + 100 * _ratio(long_words, words),
+        'rix': _ratio(long_words, sentences),
+        'linsear_write': np.where(linsear > 20, linsear / 2, linsear / 2 - 1),
+    }
+    scores = {name: np.where(scored, values, 0.0) for name, values in scores.items()}
+    # SMOG only needs sentences
+    scores['smog_index'] = np.where(
+        np.asarray(sentences) > 0, 1.0430 * np.sqrt(_ratio(np.asarray(polysyllables) * 30, sentences)) + 3.1291, 0.0
+    )
+    scores['average_syllables_per_word'] = syllables_per_word
+    scores['complex_word_ratio'] = complex_ratio
+
+    if np.ndim(words) == 0:
+        return {name: float(scores[name]) for name in READABILITY_METRICS}
+    return {name: scores[name] for name in READABILITY_METRICS}
+
+
+def token_readability_counts(doc: TokenizedDocument, syllables: np.ndarray,
+                             easy_words: Optional[WordSet] = None) -> Dict[str, np.ndarray]:
+    """
+    Per-token readability counts of a document.
+
+    Args:
+        doc: Tokenized text
+        syllables: Syllable count of every token
+        easy_words: Familiar words for Dale-Chall (``dale_chall_words`` if omitted)
+
+    Returns:
+        Dictionary of int64 arrays with one entry per token: 'syllables',
+        'polysyllables', 'long_words', 'difficult_words' and 'characters'
+    """
+    if easy_words is None:
+        easy_words = dale_chall_words()
+    tokens, core_starts, core_ends = doc.token_cores()
+    long_words = np.zeros(len(syllables), dtype=np.int64)
+    long_words[tokens] = core_ends - core_starts > LONG_WORD_LENGTH
+    difficult_words = np.zeros(len(syllables), dtype=np.int64)
+    difficult_words[tokens] = ~easy_words.contains_cores(doc, core_starts, core_ends)
+    return {
+        'syllables': syllables,
+        'polysyllables': (syllables >= 3).astype(np.int64),
+        'long_words': long_words,
+        'difficult_words': difficult_words,
+        'characters': doc.token_ends - doc.token_starts
+    }
@@ -0,0 +1,225 @@
+import hashlib
+import logging
+import string
+from typing import Dict, Iterable, Iterator, List, Mapping, Optional, Sequence, Tuple
+import numpy as np
+from src.features.readability_formulas import READABILITY_METRICS
+
+logger = logging.getLogger(__name__)
+
+# Version of the default schema; bump it (and register the new layout
+# alongside the old ones) whenever columns are added, removed or reordered
+SCHEMA_VERSION = 1
+
+# Feature groups in result order
+FEATURE_GROUPS = ('lexical', 'syntactic', 'structural', 'readability')
+
+LEXICAL_FEATURES = (
+    'avg_word_length', 'vocabulary_richness', 'type_token_ratio', 'hapax_ratio', 'char_diversity',
+    'word_length_variance', 'unique_words_ratio', 'punctuation_ratio'
+)
+
+# Universal POS tags, as reported by spaCy
+POS_TAGS = (
+    'ADJ', 'ADP', 'ADV', 'AUX', 'CCONJ', 'DET', 'INTJ', 'NOUN', 'NUM', 'PART', 'PRON', 'PROPN',
+    'PUNCT', 'SCONJ', 'SPACE', 'SYM', 'VERB', 'X'
+)
+
+# Dependency labels of the English spaCy pipelines (ClearNLP scheme)
+DEPENDENCY_LABELS = (
+    'ROOT', 'acl', 'acomp', 'advcl', 'advmod', 'agent', 'amod', 'appos', 'attr', 'aux', 'auxpass',
+    'case', 'cc', 'ccomp', 'compound', 'conj', 'csubj', 'csubjpass', 'dative', 'dep', 'det', 'dobj',
+    'expl', 'intj', 'mark', 'meta', 'neg', 'nmod', 'npadvmod', 'nsubj', 'nsubjpass', 'nummod',
+    'oprd', 'parataxis', 'pcomp', 'pobj', 'poss', 'preconj', 'predet', 'prep', 'prt', 'punct',
+    'quantmod', 'relcl', 'xcomp'
+)
+
+SYNTACTIC_FEATURES = (
+    'avg_sentence_length', 'sentence_complexity', 'avg_parse_tree_depth', 'parse_tree_breadth',
+    'syntactic_diversity', 'subordinate_clause_ratio', 'function_word_ratio'
+)
+
+STRUCTURAL_FEATURES = (
+    'avg_paragraph_length', 'paragraph_length_variance', 'paragraph_count', 'text_density',
+    'whitespace_ratio', 'line_break_frequency', 'sentence_length_variance',
+    'avg_sentences_per_paragraph', 'structure_consistency'
+)
+
+
+class FeatureSchema:
+    """
+    Fixed mapping of every feature name to a column of a dense vector.
+
+    The extractors return dictionaries whose keys depend on the text
+    (``freq_<char>``, ``pos_*``, ``dep_*``); a schema closes those families
+    over fixed vocabularies so every document encodes to a float32 row of
+    the same length, and rows of a batch stack into a matrix as they are.
+    Features outside the schema (e.g. frequencies of non-ASCII letters)
+    are left out of the row; features a document lacks are NaN.
+    """
+
+    def __init__(self, groups: Mapping[str, Sequence[str]], version: int):
+        """
+        Args:
+            groups: Feature names of every group, in column order
+            version: Schema version recorded with encoded data
+        """
+        self.version = version
+        self.groups = {group: tuple(names) for group, names in groups.items()}
+        self.columns: Tuple[str, ...] = tuple(name for names in self.groups.values() for name in names)
+        self.index: Dict[str, int] = {name: i for i, name in enumerate(self.columns)}
+        if len(self.index) != len(self.columns):
+            raise ValueError("Feature names must be unique across groups")
+        self.group_slices: Dict[str, slice] = {}
+        start = 0
+        for group, names in self.groups.items():
+            self.group_slices[group] = slice(start, start + len(names))
+            start += len(names)
+
+    def __len__(self) -> int:
+        return len(self.columns)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.index
+
+    @property
+    def fingerprint(self) -> str:
+        """Short digest of the column layout, to detect data encoded with another schema."""
+        return hashlib.sha1('\n'.join(self.columns).encode('utf-8')).hexdigest()[:16]
+
+    def empty(self, rows: Optional[int] = None) -> np.ndarray:
+        """A NaN-filled float32 row, or matrix of ``rows`` rows."""
+        shape = len(self.columns) if rows is None else (rows, len(self.columns))
+        return np.full(shape, np.nan, dtype=np.float32)
+
+    def write(self, features: Mapping[str, float], out: np.ndarray) -> int:
+        """
+        Write a feature dictionary into a row in place.
+
+        Args:
+            features: Features of one group (or several merged)
+            out: Row of length ``len(schema)``, e.g. a row of a matrix from ``empty``
+
+        Returns:
+            Number of features outside the schema that were skipped
+        """
+        index = self.index
+        skipped = 0
+        for name, value in features.items():
+            column = index.get(name)
+            if column is None:
+                skipped += 1
+            else:
+                out[column] = value
+        return skipped
+
+    def encode(self, feature_groups: Mapping[str, Mapping[str, float]],
+               out: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Encode the 'features' dictionary of an analysis result.
+
+        Args:
+            feature_groups: Feature dictionary of every group
+            out: Row to fill (a new row if omitted); it is reset to NaN first
+
+        Returns:
+            The float32 row
+        """
+        if out is None:
+            out = self.empty()
+        else:
+            out.fill(np.nan)
+        for features in feature_groups.values():
+            self.write(features, out)
+        return out
+
+    def encode_batch(self, feature_groups: Iterable[Mapping[str, Mapping[str, float]]]) -> np.ndarray:
+        """Encode many results into one matrix, a row per result."""
+        feature_groups = list(feature_groups)
+        matrix = self.empty(len(feature_groups))
+        for row, groups in zip(matrix, feature_groups):
+            for features in groups.values():
+                self.write(features, row)
+        return matrix
+
+    def view(self, row: np.ndarray) -> 'FeatureVector':
+        """Dictionary view of an encoded row."""
+        return FeatureVector(self, row)
+
+    def decode(self, row: np.ndarray) -> Dict[str, Dict[str, float]]:
+        """The 'features' dictionary of an encoded row, without missing features."""
+        return self.view(row).to_dict()
+
+
+class FeatureVector(Mapping):
+    """
+    Read-only ``feature name -> value`` view of an encoded row.
+
+    Values are read from the row on access, so a view of a row of a larger
+    matrix reflects later writes without copying. Missing (NaN) features
+    are absent from the view.
+    """
+
+    def __init__(self, schema: FeatureSchema, row: np.ndarray):
+        if row.shape != (len(schema),):
+            raise ValueError(f"Expected a row of {len(schema)} features, got shape {row.shape}")
+        self.schema = schema
+        self.row = row
+
+    def __getitem__(self, name: str) -> float:
+        value = self.row[self.schema.index[name]]
+        if np.isnan(value):
+            raise KeyError(name)
+        return float(value)
+
+    def __iter__(self) -> Iterator[str]:
+        columns = self.schema.columns
+        return (columns[i] for i in np.flatnonzero(~np.isnan(self.row)).tolist())
+
+    def __len__(self) -> int:
+        return int(np.count_nonzero(~np.isnan(self.row)))
+
+    def group(self, group: str) -> Dict[str, float]:
+        """Present features of one group."""
+        names = self.schema.groups[group]
+        values = self.row[self.schema.group_slices[group]]
+        return {name: float(value) for name, value in zip(names, values.tolist()) if value == value}
+
+    def to_dict(self) -> Dict[str, Dict[str, float]]:
+        """Present features grouped like the 'features' dictionary of a result."""
+        return {group: self.group(group) for group in self.schema.groups}
+
+
+def _default_schema() -> FeatureSchema:
+    return FeatureSchema({
+        'lexical': LEXICAL_FEATURES + tuple(f'freq_{char}' for char in string.ascii_lowercase),
+        'syntactic': (SYNTACTIC_FEATURES
+                      + tuple(f'pos_{tag.lower()}' for tag in POS_TAGS)
+                      + tuple(f'dep_{label.lower()}' for label in DEPENDENCY_LABELS)),
+        'structural': STRUCTURAL_FEATURES,
+        'readability': READABILITY_METRICS
+    }, SCHEMA_VERSION)
+
+
+_SCHEMAS: Dict[int, FeatureSchema] = {SCHEMA_VERSION: _default_schema()}
+
+
+def register_schema(schema: FeatureSchema) -> None:
+    """Make a schema available to ``feature_schema`` under its version."""
+    existing = _SCHEMAS.get(schema.version)
+    if existing is not None and existing.columns != schema.columns:
+        raise ValueError(f"Feature schema version {schema.version} is already registered")
+    _SCHEMAS[schema.version] = schema
+
+
+def feature_schema(version: int = SCHEMA_VERSION) -> FeatureSchema:
+    """The registered schema of a version (the current one by default)."""
+    try:
+        return _SCHEMAS[version]
+    except KeyError:
+        raise ValueError(f"Unknown feature schema version: {version}") from None
+
+
+def schema_versions() -> List[int]:
+    """Versions of every registered schema."""
+    return sorted(_SCHEMAS)
@@ -0,0 +1,260 @@
+import base64
+import math
+from typing import Any, Dict, Tuple
+import numpy as np
+
+_LEADING_ZERO_STEPS = (32, 16, 8, 4, 2, 1)
+
+
+def _leading_zeros(values: np.ndarray) -> np.ndarray:
+    """Count leading zero bits of uint64 values (64 for zero)."""
+    values = values.copy()
+    zeros = np.zeros(len(values), dtype=np.uint8)
+    for step in _LEADING_ZERO_STEPS:
+        # Values whose top `step` bits are all zero
+        small = values < np.uint64(1 << (64 - step))
+        zeros[small] += step
+        values[small] <<= np.uint64(step)
+    zeros[values == 0] = 64
+    return zeros
+
+
+class HyperLogLog:
+    """
+    HyperLogLog estimate of the number of distinct 64-bit hashes.
+
+    Uses ``2**precision`` one-byte registers, so memory does not grow with
+    the input. The relative standard error of ``estimate`` is about
+    ``1.04 / sqrt(2**precision)``: 0.81% at the default precision of 14
+    (16 KiB). Sketches with the same precision merge by taking the
+    register-wise maximum, which equals the sketch of the combined input.
+    """
+
+    def __init__(self, precision: int = 14):
+        if not 4 <= precision <= 18:
+            raise ValueError(f"HyperLogLog precision must be between 4 and 18, got {precision}")
+        self.precision = precision
+        self.registers = np.zeros(1 << precision, dtype=np.uint8)
+
+    @property
+    def relative_error(self) -> float:
+        """Relative standard error of the distinct count estimate."""
+        return 1.04 / math.sqrt(len(self.registers))
+
+    def add(self, hashes: np.ndarray) -> None:
+        """Add well-mixed uint64 hashes (see ``hashing.mix64``)."""
+        if not len(hashes):
+            return
+        shift = np.uint64(64 - self.precision)
+        index = (hashes >> shift).astype(np.intp)
+        remainder = hashes << np.uint64(self.precision)
+        rank = np.minimum(_leading_zeros(remainder), 64 - self.precision) + 1
+        np.maximum.at(self.registers, index, rank.astype(np.uint8))
+
+    def merge(self, other: 'HyperLogLog') -> 'HyperLogLog':
+        if other.precision != self.precision:
+            raise ValueError("Cannot merge HyperLogLog sketches of different precision")
+        merged = HyperLogLog(self.precision)
+        merged.registers = np.maximum(self.registers, other.registers)
+        return merged
+
+    def estimate(self) -> float:
+        """Estimated number of distinct hashes added."""
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        raw = alpha * m * m / float(np.sum(np.ldexp(1.0, -self.registers.astype(np.int64))))
+        empty = int(np.count_nonzero(self.registers == 0))
+        if raw <= 2.5 * m and empty:
+            # Linear counting is more accurate for small cardinalities
+            return m * math.log(m / empty)
+        return raw
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'precision': self.precision,
+            'registers': base64.b64encode(self.registers.tobytes()).decode('ascii')
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'HyperLogLog':
+        sketch = cls(data['precision'])
+        sketch.registers = np.frombuffer(base64.b64decode(data['registers']), dtype=np.uint8).copy()
+        return sketch
+
+
+class BottomKSample:
+    """
+    Exact occurrence counts of the ``k`` distinct hashes with the smallest values.
+
+    Because the sample is chosen by hash value, it is a uniform random
+    sample of the distinct items, and the same items are chosen in every
+    shard: a hash among the ``k`` smallest of the combined input is among
+    the ``k`` smallest of each shard containing it, so merged counts are
+    exact. Memory is at most ``k`` hash/count pairs.
+    """
+
+    def __init__(self, k: int = 4096):
+        if k < 1:
+            raise ValueError(f"Sample size must be positive, got {k}")
+        self.k = k
+        self.values = np.zeros(0, dtype=np.uint64)
+        self.counts = np.zeros(0, dtype=np.int64)
+        # Whether a distinct item was ever left out; exactly k items seen is still exact
+        self.dropped = False
+
+    @property
+    def is_full(self) -> bool:
+        """Whether items have been dropped, making the sample an estimate."""
+        return self.dropped
+
+    def add(self, hashes: np.ndarray) -> None:
+        """Add one occurrence per hash."""
+        if len(self.values) >= self.k:
+            # Hashes above the current k-th smallest can never enter the sample
+            kept = hashes <= self.values[-1]
+            if not kept.all():
+                self.dropped = True
+                hashes = hashes[kept]
+        if not len(hashes):
+            return
+        values, counts = np.unique(hashes, return_counts=True)
+        self._combine(values, counts.astype(np.int64))
+
+    def merge(self, other: 'BottomKSample') -> 'BottomKSample':
+        if other.k != self.k:
+            raise ValueError("Cannot merge samples of different size")
+        merged = BottomKSample(self.k)
+        merged.values, merged.counts = self.values, self.counts
+        merged.dropped = self.dropped or other.dropped
+        merged._combine(other.values, other.counts)
+        return merged
+
+    def singleton_fraction(self) -> float:
+        """Fraction of sampled distinct items that occurred exactly once."""
+        if not len(self.values):
+            return 0
+        return int(np.count_nonzero(self.counts == 1)) / len(self.values)
+
+    def _combine(self, values: np.ndarray, counts: np.ndarray) -> None:
+        values, inverse = np.unique(np.concatenate((self.values, values)), return_inverse=True)
+        counts = np.bincount(inverse.ravel(), weights=np.concatenate((self.counts, counts)))
+        if len(values) > self.k:
+            self.dropped = True
+        self.values = values[:self.k]
+        self.counts = counts[:self.k].astype(np.int64)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {'k': self.k, 'values': self.values.tolist(), 'counts': self.counts.tolist(),
+                'dropped': self.dropped}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'BottomKSample':
+        sample = cls(data['k'])
+        sample.values = np.array(data['values'], dtype=np.uint64)
+        sample.counts = np.array(data['counts'], dtype=np.int64)
+        sample.dropped = data['dropped']
+        return sample
+
+
+class VocabularySketch:
+    """
+    Constant-memory, mergeable estimate of vocabulary size and hapax count.
+
+    The number of word types comes from a HyperLogLog sketch; the number of
+    hapax legomena is the singleton fraction of a bottom-k sample of the
+    types scaled by that estimate. While fewer than ``sample_size`` types
+    have been seen the sample holds every type, and both counts are exact.
+
+    Error bounds (one standard error) once the sample is full:
+
+    - types: relative error ``1.04 / sqrt(2**precision)``
+    - hapax fraction of the types: absolute error at most
+      ``0.5 / sqrt(sample_size)``
+    - hapax count: the relative errors of both combined in quadrature
+
+    With the defaults (precision 14, 4096 samples) this is about 0.8% on
+    the type count and 0.8 percentage points on the hapax fraction, in
+    roughly 80 KiB per sketch. The token count is always exact.
+    """
+
+    def __init__(self, precision: int = 14, sample_size: int = 4096):
+        self.tokens = 0
+        self.distinct = HyperLogLog(precision)
+        self.sample = BottomKSample(sample_size)
+
+    def add(self, hashes: np.ndarray) -> None:
+        """
+        Add word occurrences.
+
+        Args:
+            hashes: uint64 hash of every token, mixed with ``hashing.mix64``
+        """
+        self.tokens += len(hashes)
+        self.distinct.add(hashes)
+        self.sample.add(hashes)
+
+    def merge(self, other: 'VocabularySketch') -> 'VocabularySketch':
+        merged = VocabularySketch.__new__(VocabularySketch)
+        merged.tokens = self.tokens + other.tokens
+        merged.distinct = self.distinct.merge(other.distinct)
+        merged.sample = self.sample.merge(other.sample)
+        return merged
+
+    @property
+    def is_exact(self) -> bool:
+        """Whether the sample still holds every type, making the counts exact."""
+        return not self.sample.is_full
+
+    def type_count(self) -> float:
+        """Estimated number of distinct words."""
+        if self.is_exact:
+            return len(self.sample.values)
+        return self.distinct.estimate()
+
+    def hapax_count(self) -> float:
+        """Estimated number of words occurring exactly once."""
+        if self.is_exact:
+            return int(np.count_nonzero(self.sample.counts == 1))
+        return self.sample.singleton_fraction() * self.type_count()
+
+    def error_bounds(self) -> Dict[str, float]:
+        """
+        One-standard-error bounds of the current estimates.
+
+        Returns:
+            Relative error of the type count, absolute error of the hapax
+            fraction of the types, and relative error of the hapax count
+            (all 0 while the counts are exact)
+        """
+        if self.is_exact:
+            return {'type_count': 0.0, 'hapax_fraction': 0.0, 'hapax_count': 0.0}
+        fraction = self.sample.singleton_fraction()
+        fraction_error = math.sqrt(fraction * (1 - fraction) / self.sample.k)
+        relative_fraction_error = fraction_error / fraction if fraction else 0.0
+        type_error = self.distinct.relative_error
+        return {
+            'type_count': type_error,
+            'hapax_fraction': fraction_error,
+            'hapax_count': math.hypot(type_error, relative_fraction_error)
+        }
+
+    def ratios(self) -> Tuple[float, float]:
+        """Estimated (type/token ratio, hapax/token ratio)."""
+        if not self.tokens:
+            return 0, 0
+        return self.type_count() / self.tokens, self.hapax_count() / self.tokens
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'tokens': self.tokens,
+            'distinct': self.distinct.to_dict(),
+            'sample': self.sample.to_dict()
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'VocabularySketch':
+        sketch = cls.__new__(cls)
+        sketch.tokens = data['tokens']
+        sketch.distinct = HyperLogLog.from_dict(data['distinct'])
+        sketch.sample = BottomKSample.from_dict(data['sample'])
+        return sketch
@@ -0,0 +1,858 @@
+import math
+import re
+from collections import Counter
+from fractions import Fraction
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+import numpy as np
+from src.features.hashing import lowercase_word_hashes
+from src.features.readability_formulas import WordSet, token_readability_counts
+from src.features.sketches import VocabularySketch
+from src.features.syllable_lexicon import SyllableCounter
+from src.preprocessing.tokenized_document import TokenizedDocument
+
+# Chunks of a document are joined by this separator when their statistics
+# are merged. The app joins cleaned page texts with a single space, so
+# merged statistics describe exactly the text the extractors would see.
+SEPARATOR = ' '
+
+# Bump whenever a change alters what the accumulators record, so persisted
+# page statistics produced by older code are not reused
+STATISTICS_VERSION = "6"
+
+SUBORDINATE_DEPS = {'advcl', 'acl', 'ccomp', 'xcomp'}
+FUNCTION_POS = {'ADP', 'AUX', 'CCONJ', 'DET', 'PART', 'PRON', 'SCONJ'}
+
+# A fragment is the (length, leading whitespace, trailing whitespace) of a
+# piece of text that may continue into a neighbouring chunk. A fragment
+# made only of whitespace has leading == length.
+Fragment = Tuple[int, int, int]
+
+
+def _fragment(text: str) -> Fragment:
+    """Describe a text piece by its length and surrounding whitespace."""
+    length = len(text)
+    return length, length - len(text.lstrip()), length - len(text.rstrip())
+
+
+def _join_fragments(left: Fragment, right: Fragment) -> Fragment:
+    """Describe the concatenation of two fragments."""
+    left_len, left_lead, left_trail = left
+    right_len, right_lead, right_trail = right
+    lead = left_lead if left_lead < left_len else left_len + right_lead
+    trail = right_trail if right_trail < right_len else right_len + left_trail
+    return left_len + right_len, lead, trail
+
+
+def _stripped_length(fragment: Fragment) -> int:
+    """Length of the fragment after ``str.strip()``."""
+    length, lead, trail = fragment
+    return 0 if lead == length else length - lead - trail
+
+
+def split_text(text: str, chunk_size: int) -> List[str]:
+    """
+    Split a text at separators into chunks of about ``chunk_size`` characters.
+
+    Joining the chunks with ``SEPARATOR`` gives back the text, so the merged
+    statistics of the chunks equal the statistics of the whole text. A run
+    without separators longer than ``chunk_size`` stays in one chunk.
+
+    Args:
+        text: Text to split
+        chunk_size: Target chunk length in characters
+
+    Returns:
+        List of chunks in text order
+    """
+    chunks = []
+    start = 0
+    while len(text) - start > chunk_size:
+        cut = text.rfind(SEPARATOR, start + 1, start + chunk_size + 1)
+        if cut == -1:
+            cut = text.find(SEPARATOR, start + chunk_size)
+            if cut == -1:
+                break
+        chunks.append(text[start:cut])
+        start = cut + len(SEPARATOR)
+    chunks.append(text[start:])
+    return chunks
+
+
+class Moments:
+    """
+    Count, sum and sum of squares of a multiset of integers.
+
+    Sums are exact Python integers and the mean and variance are derived
+    from them with correctly rounded arithmetic, so the result does not
+    depend on the order in which values were added or merged.
+    """
+
+    def __init__(self, count: int = 0, total: int = 0, total_squares: int = 0):
+        self.count = count
+        self.total = total
+        self.total_squares = total_squares
+
+    @classmethod
+    def from_values(cls, values: Iterable[int]) -> 'Moments':
+        values = np.asarray(values if isinstance(values, np.ndarray) else list(values), dtype=np.int64)
+        return cls(len(values), int(values.sum()), int((values * values).sum()))
+
+    @classmethod
+    def from_histogram(cls, values: np.ndarray, counts: np.ndarray) -> 'Moments':
+        """Moments of ``values`` each repeated ``counts`` times."""
+        values = np.asarray(values, dtype=np.int64)
+        counts = np.asarray(counts, dtype=np.int64)
+        return cls(int(counts.sum()), int((values * counts).sum()), int((values * values * counts).sum()))
+
+    def merge(self, other: 'Moments') -> 'Moments':
+        return Moments(
+            self.count + other.count,
+            self.total + other.total,
+            self.total_squares + other.total_squares
+        )
+
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0
+
+    def variance(self) -> float:
+        """Population variance, as ``np.var`` computes it."""
+        if not self.count:
+            return 0
+        return float(Fraction(self.count * self.total_squares - self.total * self.total, self.count * self.count))
+
+    def std(self) -> float:
+        return math.sqrt(self.variance())
+
+    def to_list(self) -> List[int]:
+        return [self.count, self.total, self.total_squares]
+
+    @classmethod
+    def from_list(cls, data: List[int]) -> 'Moments':
+        return cls(*data)
+
+
+class SegmentStatistics:
+    """
+    Mergeable statistics of a text split by a separator pattern.
+
+    Tracks the number of separator matches and the moments of the stripped
+    lengths of the non-empty segments, keeping the first and last segments
+    open so they can be joined with the neighbouring chunk on merge.
+    """
+
+    def __init__(self):
+        self.matches = 0
+        self.head: Optional[Fragment] = None
+        self.closed = Moments()
+        self.tail: Optional[Fragment] = None
+
+    @classmethod
+    def from_text(cls, text: str, pattern: re.Pattern) -> 'SegmentStatistics':
+        stats = cls()
+        parts = pattern.split(text)
+        stats.matches = len(parts) - 1
+        stats.head = _fragment(parts[0])
+        if stats.matches:
+            stats.closed = Moments.from_values(len(part.strip()) for part in parts[1:-1] if part.strip())
+            stats.tail = _fragment(parts[-1])
+        return stats
+
+    @classmethod
+    def from_document(cls, doc: TokenizedDocument, separator_starts: np.ndarray,
+                      separator_ends: np.ndarray) -> 'SegmentStatistics':
+        """Build the statistics from separator offsets found by a TokenizedDocument."""
+        stats = cls()
+        starts, ends = doc.segments(separator_starts, separator_ends)
+        leading, trailing = doc.surrounding_whitespace(starts, ends)
+        fragments = list(zip((ends - starts).tolist(), leading.tolist(), trailing.tolist()))
+        stats.matches = len(fragments) - 1
+        stats.head = fragments[0]
+        if stats.matches:
+            stats.closed = Moments.from_values(
+                length for length in map(_stripped_length, fragments[1:-1]) if length
+            )
+            stats.tail = fragments[-1]
+        return stats
+
+    def merge(self, other: 'SegmentStatistics') -> 'SegmentStatistics':
+        """Merge statistics of the text that follows this one after a separator."""
+        if self.head is None:
+            return other.copy()
+        if other.head is None:
+            return self.copy()
+
+        merged = SegmentStatistics()
+        merged.matches = self.matches + other.matches
+        left = _join_fragments(self.tail if self.matches else self.head, _fragment(SEPARATOR))
+        boundary = _join_fragments(left, other.head)
+
+        if not self.matches:
+            merged.head = boundary
+            merged.closed = other.closed
+            merged.tail = other.tail
+            return merged
+
+        merged.head = self.head
+        if not other.matches:
+            merged.closed = self.closed
+            merged.tail = boundary
+            return merged
+
+        middle = [_stripped_length(boundary)] if _stripped_length(boundary) else []
+        merged.closed = self.closed.merge(Moments.from_values(middle)).merge(other.closed)
+        merged.tail = other.tail
+        return merged
+
+    def moments(self) -> Moments:
+        """Moments of the stripped lengths of all non-empty segments."""
+        if self.head is None:
+            return Moments()
+        open_segments = [self.head, self.tail] if self.matches else [self.head]
+        lengths = [length for length in map(_stripped_length, open_segments) if length]
+        return self.closed.merge(Moments.from_values(lengths))
+
+    def segment_count(self) -> int:
+        """Number of segments ``pattern.split`` returns, including empty ones."""
+        return self.matches + 1 if self.head is not None else 0
+
+    def copy(self) -> 'SegmentStatistics':
+        stats = SegmentStatistics()
+        stats.matches = self.matches
+        stats.head = self.head
+        stats.closed = self.closed
+        stats.tail = self.tail
+        return stats
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {'matches': self.matches, 'head': self.head, 'closed': self.closed.to_list(), 'tail': self.tail}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'SegmentStatistics':
+        stats = cls()
+        stats.matches = data['matches']
+        stats.head = tuple(data['head']) if data['head'] is not None else None
+        stats.closed = Moments.from_list(data['closed'])
+        stats.tail = tuple(data['tail']) if data['tail'] is not None else None
+        return stats
+
+
+class LexicalStatistics:
+    """
+    Mergeable sufficient statistics for the lexical feature group.
+
+    In 'exact' vocabulary mode every distinct word is counted. In
+    'approximate' mode the vocabulary is summarized by a constant-memory
+    ``VocabularySketch`` and word lengths by their moments, so corpus-wide
+    aggregation does not grow with the vocabulary.
+    """
+
+    def __init__(self, vocabulary_mode: str = 'exact', sketch_precision: int = 14,
+                 sketch_sample_size: int = 4096):
+        """
+        Args:
+            vocabulary_mode: 'exact' or 'approximate'
+            sketch_precision: HyperLogLog precision of the approximate mode
+            sketch_sample_size: Bottom-k sample size of the approximate mode
+        """
+        self.vocabulary_mode = vocabulary_mode
+        self.sketch_precision = sketch_precision
+        self.sketch_sample_size = sketch_sample_size
+        self.word_counts: Counter = Counter()
+        # Used instead of word_counts in approximate mode
+        self.vocabulary: Optional[VocabularySketch] = None
+        self.word_lengths = Moments()
+        self.char_counts: Counter = Counter()
+        self.length = 0
+        self.empty = True
+
+    @classmethod
+    def from_text(cls, text: str, vocabulary_mode: str = 'exact', sketch_precision: int = 14,
+                  sketch_sample_size: int = 4096) -> 'LexicalStatistics':
+        return cls.from_document(TokenizedDocument(text), vocabulary_mode, sketch_precision, sketch_sample_size)
+
+    @classmethod
+    def from_document(cls, doc: TokenizedDocument, vocabulary_mode: str = 'exact', sketch_precision: int = 14,
+                      sketch_sample_size: int = 4096) -> 'LexicalStatistics':
+        stats = cls(vocabulary_mode, sketch_precision, sketch_sample_size)
+        if vocabulary_mode == 'approximate':
+            hashes, word_lengths = lowercase_word_hashes(doc)
+            stats.vocabulary = VocabularySketch(sketch_precision, sketch_sample_size)
+            stats.vocabulary.add(hashes)
+            stats.word_lengths = Moments.from_values(word_lengths)
+        else:
+            stats.word_counts = Counter(doc.words(lowercase=True))
+        codes, counts = doc.character_counts()
+        stats.char_counts = Counter(dict(zip(map(chr, codes.tolist()), counts.tolist())))
+        stats.length = doc.length
+        stats.empty = False
+        return stats
+
+    def update(self, text: str) -> 'LexicalStatistics':
+        """Add a chunk of text that follows the text seen so far."""
+        merged = self.merge(self.from_text(
+            text, self.vocabulary_mode, self.sketch_precision, self.sketch_sample_size
+        ))
+        self.__dict__.update(merged.__dict__)
+        return self
+
+    def merge(self, other: 'LexicalStatistics') -> 'LexicalStatistics':
+        """Combine with the statistics of the text that follows this one."""
+        if self.empty or other.empty:
+            return self._copy_of(other if self.empty else self)
+        if self.vocabulary_mode != other.vocabulary_mode:
+            raise ValueError("Cannot merge exact and approximate lexical statistics")
+        merged = LexicalStatistics(self.vocabulary_mode, self.sketch_precision, self.sketch_sample_size)
+        if self.vocabulary_mode == 'approximate':
+            merged.vocabulary = self.vocabulary.merge(other.vocabulary)
+            merged.word_lengths = self.word_lengths.merge(other.word_lengths)
+        else:
+            merged.word_counts = self.word_counts + other.word_counts
+        merged.char_counts = self.char_counts + other.char_counts
+        merged.char_counts[SEPARATOR] += len(SEPARATOR)
+        merged.length = self.length + len(SEPARATOR) + other.length
+        merged.empty = False
+        return merged
+
+    def finalize(self) -> Dict[str, float]:
+        """Compute the feature dictionary of ``LexicalFeatureExtractor``."""
+        text_length = self.length
+        if self.vocabulary_mode == 'approximate':
+            word_lengths = self.word_lengths
+            unique_ratio, hapax_ratio = self.vocabulary.ratios()
+        else:
+            total_words = sum(self.word_counts.values())
+            lengths = np.array([len(word) for word in self.word_counts], dtype=np.int64)
+            counts = np.array(list(self.word_counts.values()), dtype=np.int64)
+            word_lengths = Moments.from_histogram(lengths, counts)
+            unique_ratio = len(self.word_counts) / total_words if total_words else 0
+            hapax = sum(1 for count in self.word_counts.values() if count == 1)
+            hapax_ratio = hapax / total_words if total_words else 0
+        punctuation = sum(
+            count for char, count in self.char_counts.items()
+            if not char.isalnum() and not char.isspace()
+        )
+
+        features = {
+            'avg_word_length': word_lengths.mean(),
+            'vocabulary_richness': unique_ratio,
+            'type_token_ratio': unique_ratio,
+            'hapax_ratio': hapax_ratio,
+            'char_diversity': len(self.char_counts) / text_length if text_length else 0,
+            'word_length_variance': word_lengths.variance(),
+            'unique_words_ratio': unique_ratio,
+            'punctuation_ratio': punctuation / text_length if text_length else 0
+        }
+
+        lower_counts: Counter = Counter()
+        for char, count in self.char_counts.items():
+            for lower_char in char.lower():
+                lower_counts[lower_char] += count
+        if text_length:
+            features.update({
+                f'freq_{char}': count / text_length
+                for char, count in lower_counts.items()
+                if char.isalpha()
+            })
+        return features
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'vocabulary_mode': self.vocabulary_mode,
+            'sketch_precision': self.sketch_precision,
+            'sketch_sample_size': self.sketch_sample_size,
+            'word_counts': dict(self.word_counts),
+            'vocabulary': self.vocabulary.to_dict() if self.vocabulary is not None else None,
+            'word_lengths': self.word_lengths.to_list(),
+            'char_counts': dict(self.char_counts),
+            'length': self.length,
+            'empty': self.empty
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'LexicalStatistics':
+        stats = cls(data['vocabulary_mode'], data['sketch_precision'], data['sketch_sample_size'])
+        stats.word_counts = Counter(data['word_counts'])
+        if data['vocabulary'] is not None:
+            stats.vocabulary = VocabularySketch.from_dict(data['vocabulary'])
+        stats.word_lengths = Moments.from_list(data['word_lengths'])
+        stats.char_counts = Counter(data['char_counts'])
+        stats.length = data['length']
+        stats.empty = data['empty']
+        return stats
+
+    @staticmethod
+    def _copy_of(stats: 'LexicalStatistics') -> 'LexicalStatistics':
+        return LexicalStatistics.from_dict(stats.to_dict())
+
+
+class StructuralStatistics:
+    """Mergeable sufficient statistics for the structural feature group."""
+
+    paragraph_pattern = re.compile(r'\n\s*\n')
+
+    def __init__(self):
+        self.length = 0
+        self.whitespace = 0
+        self.newlines = 0
+        # Paragraphs are split on the stripped text, so the surrounding
+        # whitespace is kept aside until the chunk's neighbours are known
+        self.leading_ws = ''
+        self.trailing_ws = ''
+        # The first and last paragraph lengths stay open for merging; the
+        # paragraphs in between only contribute their moments
+        self.paragraph_head: Optional[int] = None
+        self.paragraph_inner = Moments()
+        self.paragraph_tail: Optional[int] = None
+        self.sentences = SegmentStatistics()
+        self.empty = True
+
+    @classmethod
+    def from_text(cls, text: str) -> 'StructuralStatistics':
+        return cls.from_document(TokenizedDocument(text))
+
+    @classmethod
+    def from_document(cls, doc: TokenizedDocument) -> 'StructuralStatistics':
+        stats = cls()
+        text = doc.text
+        stats.length = doc.length
+        stats.whitespace = doc.whitespace_count
+        stats.newlines = doc.newline_count
+        if doc.content_count:
+            (leading,), (trailing,) = doc.surrounding_whitespace([0], [doc.length])
+            stats.leading_ws = text[:leading]
+            stats.trailing_ws = text[doc.length - trailing:]
+            stats._set_paragraphs(doc.paragraph_lengths.tolist())
+        else:
+            stats.leading_ws = text
+        stats.sentences = SegmentStatistics.from_document(
+            doc, doc.terminator_starts, doc.terminator_ends
+        )
+        stats.empty = False
+        return stats
+
+    def update(self, text: str) -> 'StructuralStatistics':
+        """Add a chunk of text that follows the text seen so far."""
+        merged = self.merge(self.from_text(text))
+        self.__dict__.update(merged.__dict__)
+        return self
+
+    def merge(self, other: 'StructuralStatistics') -> 'StructuralStatistics':
+        """Combine with the statistics of the text that follows this one."""
+        if self.empty or other.empty:
+            return self.from_dict((other if self.empty else self).to_dict())
+
+        merged = StructuralStatistics()
+        merged.length = self.length + len(SEPARATOR) + other.length
+        merged.whitespace = self.whitespace + len(SEPARATOR) + other.whitespace
+        merged.newlines = self.newlines + other.newlines
+        merged.sentences = self.sentences.merge(other.sentences)
+        merged.empty = False
+
+        if self.paragraph_head is None:
+            # This chunk is all whitespace and just extends the next one's lead
+            merged.leading_ws = self.leading_ws + SEPARATOR + other.leading_ws
+            merged.trailing_ws = other.trailing_ws
+            merged._copy_paragraphs(other)
+            return merged
+        if other.paragraph_head is None:
+            merged.leading_ws = self.leading_ws
+            merged.trailing_ws = self.trailing_ws + SEPARATOR + other.leading_ws
+            merged._copy_paragraphs(self)
+            return merged
+
+        gap = self.trailing_ws + SEPARATOR + other.leading_ws
+        last = self.paragraph_tail if self.paragraph_tail is not None else self.paragraph_head
+        first = other.paragraph_head
+        brk = self.paragraph_pattern.search(gap)
+        if brk:
+            joined = [last + brk.start(), len(gap) - brk.end() + first]
+        else:
+            joined = [last + len(gap) + first]
+
+        # Paragraphs in text order: [self head], self inner, joined, other inner, [other tail]
+        left = [self.paragraph_head] if self.paragraph_tail is not None else []
+        right = [other.paragraph_tail] if other.paragraph_tail is not None else []
+        edges = left + joined + right
+        merged.leading_ws = self.leading_ws
+        merged.trailing_ws = other.trailing_ws
+        merged.paragraph_head = edges[0]
+        merged.paragraph_tail = edges[-1] if len(edges) > 1 else None
+        merged.paragraph_inner = self.paragraph_inner.merge(other.paragraph_inner).merge(
+            Moments.from_values(edges[1:-1])
+        )
+        return merged
+
+    def paragraph_moments(self) -> Moments:
+        """Moments of all paragraph lengths."""
+        if self.paragraph_head is None:
+            # An all-whitespace text strips to '' which still splits into one paragraph
+            return Moments.from_values([0])
+        edges = [self.paragraph_head]
+        if self.paragraph_tail is not None:
+            edges.append(self.paragraph_tail)
+        return self.paragraph_inner.merge(Moments.from_values(edges))
+
+    def finalize(self) -> Dict[str, float]:
+        """Compute the feature dictionary of ``StructuralFeatureExtractor``."""
+        paragraphs = self.paragraph_moments()
+        sentence_lengths = self.sentences.moments()
+        sentence_count = max(self.sentences.segment_count(), 1)
+        mean_length = paragraphs.mean()
+        std_dev = paragraphs.std()
+
+        return {
+            'avg_paragraph_length': mean_length,
+            'paragraph_length_variance': paragraphs.variance(),
+            'paragraph_count': paragraphs.count,
+            'text_density': (self.length - self.whitespace) / self.length if self.length else 0,
+            'whitespace_ratio': self.whitespace / self.length if self.length else 0,
+            'line_break_frequency': self.newlines / self.length if self.length else 0,
+            'sentence_length_variance': sentence_lengths.variance(),
+            'avg_sentences_per_paragraph': sentence_count / paragraphs.count,
+            'structure_consistency': 1 / (std_dev / mean_length) if mean_length and std_dev else 0
+        }
+
+    def _set_paragraphs(self, lengths: List[int]) -> None:
+        self.paragraph_head = lengths[0]
+        self.paragraph_tail = lengths[-1] if len(lengths) > 1 else None
+        self.paragraph_inner = Moments.from_values(lengths[1:-1])
+
+    def _copy_paragraphs(self, other: 'StructuralStatistics') -> None:
+        self.paragraph_head = other.paragraph_head
+        self.paragraph_inner = other.paragraph_inner
+        self.paragraph_tail = other.paragraph_tail
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'length': self.length,
+            'whitespace': self.whitespace,
+            'newlines': self.newlines,
+            'leading_ws': self.leading_ws,
+            'trailing_ws': self.trailing_ws,
+            'paragraph_head': self.paragraph_head,
+            'paragraph_inner': self.paragraph_inner.to_list(),
+            'paragraph_tail': self.paragraph_tail,
+            'sentences': self.sentences.to_dict(),
+            'empty': self.empty
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'StructuralStatistics':
+        stats = cls()
+        stats.length = data['length']
+        stats.whitespace = data['whitespace']
+        stats.newlines = data['newlines']
+        stats.leading_ws = data['leading_ws']
+        stats.trailing_ws = data['trailing_ws']
+        stats.paragraph_head = data['paragraph_head']
+        stats.paragraph_inner = Moments.from_list(data['paragraph_inner'])
+        stats.paragraph_tail = data['paragraph_tail']
+        stats.sentences = SegmentStatistics.from_dict(data['sentences'])
+        stats.empty = data['empty']
+        return stats
+
+
+class ReadabilityStatistics:
+    """
+    Mergeable sufficient statistics for the readability metrics.
+
+    This is the counts record every readability formula is derived from
+    (see ``readability_scores``); all counts come from one vectorized pass
+    over the tokens.
+    """
+
+    def __init__(self):
+        self.words = 0
+        self.syllables = 0
+        self.complex_words = 0  # Polysyllables: tokens of three or more syllables
+        self.long_words = 0
+        self.difficult_words = 0  # Tokens not on the Dale-Chall list
+        self.characters = 0  # Characters excluding spaces, as used by ARI
+        self.sentences = SegmentStatistics()
+        self.empty = True
+
+    @classmethod
+    def from_text(cls, text: str, count_syllables: Callable[[str], int],
+                  easy_words: Optional[WordSet] = None) -> 'ReadabilityStatistics':
+        return cls.from_document(TokenizedDocument(text), count_syllables, easy_words)
+
+    @staticmethod
+    def token_counts(doc: TokenizedDocument, count_syllables: Callable[[str], int],
+                     easy_words: Optional[WordSet] = None) -> Dict[str, np.ndarray]:
+        """
+        Per-token counts (see ``token_readability_counts``).
+
+        Args:
+            doc: Tokenized text
+            count_syllables: Syllable count of a token; a ``SyllableCounter``
+                counts all tokens at once
+            easy_words: Familiar words for Dale-Chall (the Dale-Chall list if omitted)
+        """
+        if isinstance(count_syllables, SyllableCounter):
+            syllables = count_syllables.count_tokens(doc)
+        else:
+            syllables = np.array([count_syllables(word) for word in doc.tokens()], dtype=np.int64)
+        return token_readability_counts(doc, syllables, easy_words)
+
+    @classmethod
+    def from_document(cls, doc: TokenizedDocument, count_syllables: Callable[[str], int],
+                      easy_words: Optional[WordSet] = None) -> 'ReadabilityStatistics':
+        """
+        Args:
+            doc: Tokenized text
+            count_syllables: Syllable count of a token; a ``SyllableCounter``
+                counts all tokens at once
+            easy_words: Familiar words for Dale-Chall (the Dale-Chall list if omitted)
+        """
+        stats = cls()
+        counts = cls.token_counts(doc, count_syllables, easy_words)
+        stats.words = len(counts['syllables'])
+        stats.syllables = int(counts['syllables'].sum())
+        stats.complex_words = int(counts['polysyllables'].sum())
+        stats.long_words = int(counts['long_words'].sum())
+        stats.difficult_words = int(counts['difficult_words'].sum())
+        stats.characters = doc.length - doc.space_count
+        stats.sentences = SegmentStatistics.from_document(
+            doc, doc.sentence_end_starts, doc.sentence_end_ends
+        )
+        stats.empty = False
+        return stats
+
+    def update(self, text: str, count_syllables: Callable[[str], int]) -> 'ReadabilityStatistics':
+        """Add a chunk of text that follows the text seen so far."""
+        merged = self.merge(self.from_text(text, count_syllables))
+        self.__dict__.update(merged.__dict__)
+        return self
+
+    def merge(self, other: 'ReadabilityStatistics') -> 'ReadabilityStatistics':
+        """Combine with the statistics of the text that follows this one."""
+        if self.empty or other.empty:
+            return self.from_dict((other if self.empty else self).to_dict())
+        merged = ReadabilityStatistics()
+        merged.words = self.words + other.words
+        merged.syllables = self.syllables + other.syllables
+        merged.complex_words = self.complex_words + other.complex_words
+        merged.long_words = self.long_words + other.long_words
+        merged.difficult_words = self.difficult_words + other.difficult_words
+        merged.characters = self.characters + other.characters
+        merged.sentences = self.sentences.merge(other.sentences)
+        merged.empty = False
+        return merged
+
+    def finalize(self, analyzer=None) -> Dict[str, float]:
+        """
+        Compute the metrics of ``ReadabilityAnalyzer``.
+
+        Args:
+            analyzer: Analyzer providing the formulas (a default one is created if omitted)
+        """
+        if analyzer is None:
+            from src.features.readability_features import ReadabilityAnalyzer
+            analyzer = ReadabilityAnalyzer()
+        return analyzer.analyze_statistics(self)
+
+    def sentence_count(self) -> int:
+        """Number of non-empty sentences."""
+        return self.sentences.moments().count
+
+    def counts(self) -> Dict[str, int]:
+        """The counts ``readability_scores`` takes."""
+        return {
+            'words': self.words,
+            'sentences': self.sentence_count(),
+            'syllables': self.syllables,
+            'polysyllables': self.complex_words,
+            'long_words': self.long_words,
+            'difficult_words': self.difficult_words,
+            'characters': self.characters
+        }
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'words': self.words,
+            'syllables': self.syllables,
+            'complex_words': self.complex_words,
+            'long_words': self.long_words,
+            'difficult_words': self.difficult_words,
+            'characters': self.characters,
+            'sentences': self.sentences.to_dict(),
+            'empty': self.empty
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'ReadabilityStatistics':
+        stats = cls()
+        stats.words = data['words']
+        stats.syllables = data['syllables']
+        stats.complex_words = data['complex_words']
+        stats.long_words = data['long_words']
+        stats.difficult_words = data['difficult_words']
+        stats.characters = data['characters']
+        stats.sentences = SegmentStatistics.from_dict(data['sentences'])
+        stats.empty = data['empty']
+        return stats
+
+
+def _label_counts(labels: np.ndarray, strings) -> Counter:
+    """Count label ids as strings, in order of first occurrence like ``Counter``."""
+    ids, first, counts = np.unique(labels, return_index=True, return_counts=True)
+    order = np.argsort(first)
+    return Counter({strings[int(ids[i])]: int(counts[i]) for i in order})
+
+
+class SyntacticStatistics:
+    """
+    Mergeable sufficient statistics for the syntactic feature group.
+
+    Per-sentence values are kept as ``Moments``, so the statistics of a
+    text of any length take constant space apart from the tag, label and
+    pattern counts.
+    """
+
+    def __init__(self):
+        self.tokens = 0
+        self.pos_counts: Counter = Counter()
+        self.dep_counts: Counter = Counter()
+        self.sentence_lengths = Moments()
+        self.verb_counts = Moments()
+        self.tree_depths = Moments()
+        self.root_breadths = Moments()
+        self.patterns = set()
+
+    @classmethod
+    def from_doc(cls, doc, dependencies: bool = True) -> 'SyntacticStatistics':
+        """
+        Collect statistics from a parsed spaCy ``Doc`` or ``Span`` of whole sentences.
+
+        Reads the POS, dependency label, head and sentence start of every
+        token with one ``to_array`` call; sentence statistics are
+        ``reduceat`` sums over the sentence boundaries and tree depths come
+        from pointer jumping along the head chains, so no Python loop runs
+        over tokens and deep trees cannot hit the recursion limit.
+
+        Args:
+            doc: Parsed text
+            dependencies: Collect the dependency-based statistics; False for
+                pipelines without a parser
+        """
+        from spacy.attrs import DEP, HEAD, POS, SENT_START
+        from spacy.symbols import VERB
+
+        stats = cls()
+        # A Span is read from its Doc; heads of whole sentences stay inside it
+        start = getattr(doc, 'start', 0)
+        values = getattr(doc, 'doc', doc).to_array([POS, DEP, HEAD, SENT_START])
+        values = values[start:start + len(doc)].astype(np.int64)
+        n = len(values)
+        stats.tokens = n
+        if not n:
+            return stats
+        pos, dep, head_offsets, sent_start = values.T
+        strings = doc.vocab.strings
+
+        stats.pos_counts = _label_counts(pos, strings)
+        sentence_starts = np.flatnonzero(sent_start == 1)
+        if not len(sentence_starts) or sentence_starts[0] != 0:
+            sentence_starts = np.concatenate(([0], sentence_starts))
+        sentence_lengths = np.diff(np.append(sentence_starts, n))
+        stats.sentence_lengths = Moments.from_values(sentence_lengths)
+        stats.verb_counts = Moments.from_values(np.add.reduceat((pos == VERB).astype(np.int64), sentence_starts))
+        if not dependencies:
+            return stats
+
+        stats.dep_counts = _label_counts(dep, strings)
+        positions = np.arange(n)
+        heads = positions + head_offsets
+        head_pos = pos[heads]
+        pairs = np.unique(np.stack((dep, head_pos), axis=1), axis=0)
+        stats.patterns = set(zip(
+            (strings[int(label)] for label in pairs[:, 0]),
+            (strings[int(tag)] for tag in pairs[:, 1])
+        ))
+
+        # Pointer jumping: after k rounds every token knows its distance to
+        # the ancestor 2**k steps up, so depths need log2(height) rounds
+        distances = (heads != positions).astype(np.int64)
+        pointers = heads
+        for _ in range(n.bit_length()):
+            jumped = pointers[pointers]
+            if np.array_equal(jumped, pointers):
+                break
+            distances = distances + distances[pointers]
+            pointers = jumped
+        stats.tree_depths = Moments.from_values(np.maximum.reduceat(distances + 1, sentence_starts))
+
+        # The root of a sentence is its first token that heads itself
+        is_root = heads == positions
+        sentence_ids = np.repeat(np.arange(len(sentence_starts)), sentence_lengths)
+        root_index = np.full(len(sentence_starts), -1)
+        roots = np.flatnonzero(is_root)
+        root_index[sentence_ids[roots][::-1]] = roots[::-1]
+        children = np.bincount(heads[~is_root], minlength=n)
+        stats.root_breadths = Moments.from_values(np.where(root_index >= 0, children[root_index], 0))
+        return stats
+
+    def update(self, doc) -> 'SyntacticStatistics':
+        """Add a parsed chunk that follows the text seen so far."""
+        merged = self.merge(self.from_doc(doc))
+        self.__dict__.update(merged.__dict__)
+        return self
+
+    def merge(self, other: 'SyntacticStatistics') -> 'SyntacticStatistics':
+        """Combine with the statistics of the text that follows this one."""
+        merged = SyntacticStatistics()
+        merged.tokens = self.tokens + other.tokens
+        merged.pos_counts = self.pos_counts + other.pos_counts
+        merged.dep_counts = self.dep_counts + other.dep_counts
+        merged.sentence_lengths = self.sentence_lengths.merge(other.sentence_lengths)
+        merged.verb_counts = self.verb_counts.merge(other.verb_counts)
+        merged.tree_depths = self.tree_depths.merge(other.tree_depths)
+        merged.root_breadths = self.root_breadths.merge(other.root_breadths)
+        merged.patterns = self.patterns | other.patterns
+        return merged
+
+    def finalize(self) -> Dict[str, float]:
+        """Compute the feature dictionary of ``SyntacticFeatureExtractor``."""
+        tokens = self.tokens
+        features = {
+            'avg_sentence_length': self.sentence_lengths.mean(),
+            'sentence_complexity': self.verb_counts.mean() if tokens else 0,
+            'avg_parse_tree_depth': self.tree_depths.mean(),
+            'parse_tree_breadth': self.root_breadths.mean(),
+            'syntactic_diversity': len(self.patterns) / tokens if tokens else 0,
+            'subordinate_clause_ratio': (
+                sum(self.dep_counts[dep] for dep in SUBORDINATE_DEPS) / tokens if tokens else 0
+            ),
+            'function_word_ratio': (
+                sum(self.pos_counts[pos] for pos in FUNCTION_POS) / tokens if tokens else 0
+            )
+        }
+        if tokens:
+            features.update({f'pos_{pos.lower()}': count / tokens for pos, count in self.pos_counts.items()})
+            features.update({f'dep_{dep.lower()}': count / tokens for dep, count in self.dep_counts.items()})
+        return features
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'tokens': self.tokens,
+            'pos_counts': dict(self.pos_counts),
+            'dep_counts': dict(self.dep_counts),
+            'sentence_lengths': self.sentence_lengths.to_list(),
+            'verb_counts': self.verb_counts.to_list(),
+            'tree_depths': self.tree_depths.to_list(),
+            'root_breadths': self.root_breadths.to_list(),
+            'patterns': sorted(self.patterns)
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'SyntacticStatistics':
+        stats = cls()
+        stats.tokens = data['tokens']
+        stats.pos_counts = Counter(data['pos_counts'])
+        stats.dep_counts = Counter(data['dep_counts'])
+        stats.sentence_lengths = Moments.from_list(data['sentence_lengths'])
+        stats.verb_counts = Moments.from_list(data['verb_counts'])
+        stats.tree_depths = Moments.from_list(data['tree_depths'])
+        stats.root_breadths = Moments.from_list(data['root_breadths'])
+        stats.patterns = set(tuple(pattern) for pattern in data['patterns'])
+        return stats
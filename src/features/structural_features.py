@@ -1,19 +1,17 @@
-from typing import Dict, List
-import re
+from typing import Dict, Optional, Union
 import numpy as np
 import logging
-from collections import Counter
+from src.features.schema import feature_schema
+from src.features.statistics import Moments
+from src.preprocessing.tokenized_document import TokenizedDocument
 
 logger = logging.getLogger(__name__)
 
 class StructuralFeatureExtractor:
     """Extracts structural features from text for stylometric analysis."""
     
-    def __init__(self):
-        self.paragraph_pattern = re.compile(r'\n\s*\n')
-        self.sentence_end_pattern = re.compile(r'[.!?]+')
-        
-    def extract_features(self, text: str) -> Dict[str, float]:
+    def extract_features(self, text: Union[str, TokenizedDocument],
+                         out: Optional[np.ndarray] = None) -> Dict[str, float]:
         """
         Extract structural features from the text.
         
@@ -24,33 +22,39 @@ class StructuralFeatureExtractor:
         - Document structure patterns
         
         Args:
-            text: Preprocessed input text
+            text: Preprocessed input text, or its shared tokenization
+            out: Row of the feature schema (see ``FeatureSchema``) that the
+                features are also written into
             
         Returns:
             Dictionary of structural features
         """
         try:
-            paragraphs = self.paragraph_pattern.split(text.strip())
-            sentences = self.sentence_end_pattern.split(text)
+            doc = text if isinstance(text, TokenizedDocument) else TokenizedDocument(text)
+            paragraphs = Moments.from_values(doc.paragraph_lengths)
+            sentence_starts, sentence_ends = doc.segments(doc.terminator_starts, doc.terminator_ends)
+            sentence_lengths = doc.stripped_lengths(sentence_starts, sentence_ends)
             
             features = {
                 # Paragraph metrics
                 'avg_paragraph_length': self._calculate_avg_paragraph_length(paragraphs),
                 'paragraph_length_variance': self._calculate_paragraph_variance(paragraphs),
-                'paragraph_count': len(paragraphs),
+                'paragraph_count': paragraphs.count,
                 
                 # Text organization
-                'text_density': self._calculate_text_density(text),
-                'whitespace_ratio': self._calculate_whitespace_ratio(text),
-                'line_break_frequency': self._calculate_line_break_frequency(text),
+                'text_density': self._calculate_text_density(doc),
+                'whitespace_ratio': self._calculate_whitespace_ratio(doc),
+                'line_break_frequency': self._calculate_line_break_frequency(doc),
                 
                 # Sentence structure
-                'sentence_length_variance': self._calculate_sentence_variance(sentences),
-                'avg_sentences_per_paragraph': len(sentences) / len(paragraphs) if paragraphs else 0,
+                'sentence_length_variance': self._calculate_sentence_variance(sentence_lengths),
+                'avg_sentences_per_paragraph': len(sentence_lengths) / paragraphs.count,
                 
                 # Document structure
                 'structure_consistency': self._calculate_structure_consistency(paragraphs)
             }
+            if out is not None:
+                feature_schema().write(features, out)
             
             return features
             
@@ -58,56 +62,44 @@ class StructuralFeatureExtractor:
             logger.error(f"Error extracting structural features: {str(e)}")
             raise
             
-    def _calculate_avg_paragraph_length(self, paragraphs: List[str]) -> float:
+    def _calculate_avg_paragraph_length(self, paragraphs: Moments) -> float:
         """Calculate average paragraph length in characters."""
-        if not paragraphs:
-            return 0
-        return np.mean([len(p) for p in paragraphs])
+        return paragraphs.mean()
         
-    def _calculate_paragraph_variance(self, paragraphs: List[str]) -> float:
+    def _calculate_paragraph_variance(self, paragraphs: Moments) -> float:
         """Calculate variance in paragraph lengths."""
-        if not paragraphs:
-            return 0
-        lengths = [len(p) for p in paragraphs]
-        return np.var(lengths)
+        return paragraphs.variance()
         
-    def _calculate_text_density(self, text: str) -> float:
+    def _calculate_text_density(self, doc: TokenizedDocument) -> float:
         """Calculate ratio of non-whitespace characters to total length."""
-        if not text:
+        if not doc.length:
             return 0
-        non_whitespace = len(re.sub(r'\s', '', text))
-        return non_whitespace / len(text)
+        return doc.content_count / doc.length
         
-    def _calculate_whitespace_ratio(self, text: str) -> float:
+    def _calculate_whitespace_ratio(self, doc: TokenizedDocument) -> float:
         """Calculate ratio of whitespace to text."""
-        if not text:
+        if not doc.length:
             return 0
-        whitespace_count = sum(1 for char in text if char.isspace())
-        return whitespace_count / len(text)
+        return doc.whitespace_count / doc.length
         
-    def _calculate_line_break_frequency(self, text: str) -> float:
+    def _calculate_line_break_frequency(self, doc: TokenizedDocument) -> float:
         """Calculate frequency of line breaks."""
-        if not text:
+        if not doc.length:
             return 0
-        line_breaks = text.count('\n')
-        return line_breaks / len(text)
+        return doc.newline_count / doc.length
         
-    def _calculate_sentence_variance(self, sentences: List[str]) -> float:
+    def _calculate_sentence_variance(self, lengths: np.ndarray) -> float:
         """Calculate variance in sentence lengths."""
-        if not sentences:
-            return 0
-        lengths = [len(s.strip()) for s in sentences if s.strip()]
-        return np.var(lengths) if lengths else 0
+        return Moments.from_values(lengths[lengths > 0]).variance()
         
-    def _calculate_structure_consistency(self, paragraphs: List[str]) -> float:
+    def _calculate_structure_consistency(self, paragraphs: Moments) -> float:
         """Calculate consistency of paragraph structures."""
-        if not paragraphs:
+        if not paragraphs.count:
             return 0
         
         # Calculate similarity in paragraph lengths
-        lengths = [len(p) for p in paragraphs]
-        mean_length = np.mean(lengths)
-        std_dev = np.std(lengths)
+        mean_length = paragraphs.mean()
+        std_dev = paragraphs.std()
         
         # Return inverse of coefficient of variation (normalized standard deviation)
         return 1 / (std_dev / mean_length) if mean_length and std_dev else 0 
\ No newline at end of file
@@ -0,0 +1,278 @@
+import logging
+import re
+import struct
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, List, Optional, Set, Tuple
+import numpy as np
+from src.features.hashing import mix64, span_hashes, span_ids
+from src.preprocessing.tokenized_document import TokenizedDocument
+from src.utils.paths import data_dir
+
+logger = logging.getLogger(__name__)
+
+LEXICON_FILENAME = 'syllable_lexicon.bin'
+
+# File layout: header, then ``count`` sorted uint64 word hashes, then
+# ``count`` uint8 syllable counts in the same order
+_MAGIC = b'STILOSYL'
+_FORMAT_VERSION = 1
+_HEADER = struct.Struct('<8sIQ')
+
+_EDGE_PUNCTUATION = re.compile(r'^[\W_]+|[\W_]+$')
+
+# Lexicon paths whose syllable source was already logged
+_REPORTED_SOURCES: Set[str] = set()
+
+
+def default_lexicon_path() -> str:
+    """Lexicon file built by ``stilo bootstrap``, in the user data directory."""
+    return str(data_dir() / LEXICON_FILENAME)
+
+
+def word_core(word: str) -> str:
+    """
+    A word without its leading and trailing non-alphanumeric characters,
+    as ``TokenizedDocument.token_cores``; a word without alphanumeric
+    characters is returned whole.
+    """
+    return _EDGE_PUNCTUATION.sub('', word) or word
+
+
+def word_hashes(words: List[str]) -> np.ndarray:
+    """
+    Mixed hashes of words, equal to the hashes of the same text in a document.
+
+    Args:
+        words: Words as they appear in the lexicon (lowercase)
+
+    Returns:
+        uint64 hash of every word
+    """
+    lengths = np.fromiter(map(len, words), dtype=np.int64, count=len(words))
+    ends = np.cumsum(lengths + 1) - 1
+    codes = TokenizedDocument(' '.join(words)).codes
+    return mix64(span_hashes(codes, ends - lengths, ends))
+
+
+def heuristic_syllables(word: str) -> int:
+    """Estimate the syllables of a word from its vowel groups."""
+    word = word.lower()
+
+    # Count vowel groups
+    count = 0
+    vowels = "aeiouy"
+    prev_char_is_vowel = False
+
+    for char in word:
+        is_vowel = char in vowels
+        if is_vowel and not prev_char_is_vowel:
+            count += 1
+        prev_char_is_vowel = is_vowel
+
+    # Adjust for silent e
+    if word.endswith('e'):
+        count -= 1
+
+    # Ensure at least one syllable
+    return max(1, count)
+
+
+def build_lexicon(entries: Dict[str, int], path: Optional[str] = None) -> int:
+    """
+    Write a syllable lexicon file.
+
+    Words are stored as sorted 64-bit hashes so lookups are a binary search
+    over a memory-mapped array. Words whose hashes collide are dropped
+    (they are counted by the heuristic instead).
+
+    Args:
+        entries: Syllable count of every lowercase word
+        path: Output file (``default_lexicon_path()`` if omitted)
+
+    Returns:
+        Number of words written
+    """
+    words = sorted(entries)
+    hashes = word_hashes(words)
+    syllables = np.minimum(np.array([entries[word] for word in words], dtype=np.int64), 255).astype(np.uint8)
+    order = np.argsort(hashes, kind='stable')
+    hashes, syllables = hashes[order], syllables[order]
+    unique = np.ones(len(hashes), dtype=bool)
+    if len(hashes):
+        collided = hashes[1:] == hashes[:-1]
+        unique[1:] &= ~collided
+        unique[:-1] &= ~collided
+        if collided.any():
+            logger.warning(f"Dropping {int(np.count_nonzero(~unique))} lexicon words with colliding hashes")
+    hashes, syllables = hashes[unique], syllables[unique]
+
+    path = Path(path or default_lexicon_path())
+    path.parent.mkdir(parents=True, exist_ok=True)
+    partial = path.with_suffix(path.suffix + '.tmp')
+    with open(partial, 'wb') as f:
+        f.write(_HEADER.pack(_MAGIC, _FORMAT_VERSION, len(hashes)))
+        f.write(hashes.astype('<u8').tobytes())
+        f.write(syllables.tobytes())
+    partial.replace(path)
+    return len(hashes)
+
+
+def build_cmudict_lexicon(path: Optional[str] = None) -> int:
+    """
+    Build the syllable lexicon from the CMU Pronouncing Dictionary.
+
+    A word's syllables are the stressed phonemes (those ending in a digit)
+    of its first pronunciation. Needs the NLTK ``cmudict`` corpus.
+
+    Args:
+        path: Output file (``default_lexicon_path()`` if omitted)
+
+    Returns:
+        Number of words written
+    """
+    from src.preprocessing.text_cleaner import require_nltk_resource
+
+    require_nltk_resource('cmudict')
+    from nltk.corpus import cmudict
+
+    entries = {
+        word: sum(1 for phoneme in pronunciations[0] if phoneme[-1].isdigit())
+        for word, pronunciations in cmudict.dict().items()
+    }
+    return build_lexicon(entries, path)
+
+
+class SyllableLexicon:
+    """
+    Read-only, memory-mapped word -> syllable count table.
+
+    The file is mapped rather than read, so every worker process shares
+    the same pages of the OS file cache instead of holding its own copy.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = Path(path or default_lexicon_path())
+        with open(self.path, 'rb') as f:
+            magic, version, count = _HEADER.unpack(f.read(_HEADER.size))
+        if magic != _MAGIC or version != _FORMAT_VERSION:
+            raise ValueError(f"Not a syllable lexicon (version {_FORMAT_VERSION}): {self.path}")
+        self.hashes = np.memmap(self.path, dtype='<u8', mode='r', offset=_HEADER.size, shape=(count,))
+        self.syllables = np.memmap(
+            self.path, dtype=np.uint8, mode='r', offset=_HEADER.size + 8 * count, shape=(count,)
+        )
+
+    @classmethod
+    def load(cls, path: Optional[str] = None) -> Optional['SyllableLexicon']:
+        """
+        Open the lexicon, or return None if it has not been built.
+
+        The syllable source in use is logged once per path, since scores
+        counted with and without the lexicon differ.
+        """
+        path = path or default_lexicon_path()
+        lexicon = None
+        if Path(path).exists():
+            try:
+                lexicon = cls(path)
+            except Exception as e:
+                logger.warning(f"Ignoring syllable lexicon {path}: {str(e)}")
+        if path not in _REPORTED_SOURCES:
+            _REPORTED_SOURCES.add(path)
+            if lexicon is not None:
+                logger.info(f"Counting syllables with the lexicon {path} ({len(lexicon)} words)")
+            else:
+                logger.info(f"No syllable lexicon at {path}; counting syllables with the vowel-group "
+                            f"heuristic (run 'stilo bootstrap' to build it)")
+        return lexicon
+
+    def __len__(self) -> int:
+        return len(self.hashes)
+
+    def lookup(self, hashes: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Look up words by hash.
+
+        Args:
+            hashes: Word hashes from ``word_hashes`` or the document equivalent
+
+        Returns:
+            Tuple of (mask of words found, syllable count of every word, 0 if missing)
+        """
+        if not len(self.hashes):
+            return np.zeros(len(hashes), dtype=bool), np.zeros(len(hashes), dtype=np.int64)
+        positions = np.minimum(np.searchsorted(self.hashes, hashes), len(self.hashes) - 1)
+        found = self.hashes[positions] == hashes
+        return found, np.where(found, self.syllables[positions], 0).astype(np.int64)
+
+
+class SyllableCounter:
+    """
+    Syllable counts from a lexicon, with a bounded heuristic fallback.
+
+    Tokens are reduced to their alphanumeric core (leading and trailing
+    punctuation removed, lowercased) and looked up in the lexicon; cores
+    missing from it are counted by ``heuristic_syllables`` behind an LRU cache of at most
+    ``cache_size`` entries, so memory stays flat in long-running workers.
+    Without a lexicon every token is counted by the heuristic.
+    """
+
+    def __init__(self, lexicon: Optional[SyllableLexicon] = None, cache_size: int = 1 << 16):
+        self.lexicon = lexicon
+        self._heuristic = lru_cache(maxsize=cache_size)(heuristic_syllables)
+
+    def __call__(self, word: str) -> int:
+        return self.count(word)
+
+    def count(self, word: str) -> int:
+        """Count the syllables of one token."""
+        if self.lexicon is not None:
+            counts = self.count_tokens(TokenizedDocument(word))
+            if len(counts) == 1:
+                return int(counts[0])
+        return self._heuristic(word_core(word.lower()))
+
+    def count_tokens(self, doc: TokenizedDocument) -> np.ndarray:
+        """
+        Count the syllables of every whitespace-delimited token of a document.
+
+        Lexicon lookups are one vectorized binary search; the heuristic runs
+        once per distinct missing token.
+
+        Returns:
+            int64 syllable count of every token, in text order
+        """
+        tokens, core_starts, core_ends = doc.token_cores()
+        # Both the lexicon and the heuristic see the core; tokens without
+        # one are counted whole
+        starts, ends = doc.token_starts.copy(), doc.token_ends.copy()
+        starts[tokens], ends[tokens] = core_starts, core_ends
+        counts = np.zeros(len(starts), dtype=np.int64)
+        missing = np.ones(len(starts), dtype=bool)
+        lowered = doc.lowercase_codes()
+
+        if self.lexicon is not None and lowered is not None and len(starts):
+            found, syllables = self.lexicon.lookup(mix64(span_hashes(lowered, core_starts, core_ends)))
+            counts[tokens[found]] = syllables[found]
+            missing[tokens[found]] = False
+
+        misses = np.flatnonzero(missing)
+        if not len(misses):
+            return counts
+        text = doc.text
+        groups = span_ids(lowered, starts[misses], ends[misses]) if lowered is not None else None
+        if groups is None:
+            counts[misses] = [self._heuristic(text[start:end].lower())
+                              for start, end in zip(starts[misses].tolist(), ends[misses].tolist())]
+            return counts
+        ids, occurrences = groups
+        # One representative occurrence per distinct token: scattering in
+        # reverse leaves the first occurrence of each id
+        first = np.empty(len(occurrences), dtype=np.int64)
+        first[ids[::-1]] = np.arange(len(ids) - 1, -1, -1)
+        distinct_counts = np.array([
+            self._heuristic(text[start:end].lower())
+            for start, end in zip(starts[misses[first]].tolist(), ends[misses[first]].tolist())
+        ], dtype=np.int64)
+        counts[misses] = distinct_counts[ids]
+        return counts
@@ -1,22 +1,147 @@
-import spacy
-from typing import Dict, List, Tuple
+from itertools import islice
+from typing import Dict, Iterable, Iterator, Optional, Union
 import logging
-from collections import Counter
 import numpy as np
+from src.features.schema import feature_schema
+from src.features.statistics import SyntacticStatistics
+from src.preprocessing.tokenized_document import TokenizedDocument
+from src.utils.cache import ParseCache
 
 logger = logging.getLogger(__name__)
 
+# spaCy components per tier: 'exclude' is never loaded, 'enable' switches on
+# components the model ships disabled. Both tiers keep tok2vec, the tagger
+# and the attribute ruler that maps tags to POS.
+SYNTACTIC_TIERS = {
+    # POS tags and statistical sentence boundaries
+    'fast': {'exclude': ('parser', 'ner', 'lemmatizer'), 'enable': ('senter',)},
+    # Adds the dependency parser, which also sets sentence boundaries
+    'full': {'exclude': ('senter', 'ner', 'lemmatizer'), 'enable': ()}
+}
+
+# Features that need the dependency parser
+DEPENDENCY_FEATURES = {
+    'avg_parse_tree_depth', 'parse_tree_breadth', 'syntactic_diversity', 'subordinate_clause_ratio'
+}
+
+# Preferred places to cut a long text, best first: paragraph breaks, line
+# breaks, sentence ends, then any whitespace
+CHUNK_BOUNDARIES = ('\n\n', '\n', '. ', '! ', '? ', ' ')
+
+
+def bootstrap_spacy_model(model_name: str = 'en_core_web_sm') -> bool:
+    """
+    Download a spaCy model package unless it is already installed.
+
+    Args:
+        model_name: Name of the model package
+
+    Returns:
+        True if the model was downloaded, False if it was already present
+    """
+    import spacy.cli
+    import spacy.util
+
+    if spacy.util.is_package(model_name):
+        return False
+    spacy.cli.download(model_name)
+    return True
+
+
+def split_at_boundaries(text: str, chunk_size: int) -> Iterator[str]:
+    """
+    Cut a text into pieces of at most ``chunk_size`` characters.
+
+    Each piece ends just after the best boundary (see ``CHUNK_BOUNDARIES``)
+    in the second half of its window, or at the window end if there is
+    none. Joining the pieces gives back the text.
+
+    Args:
+        text: Text to split
+        chunk_size: Maximum piece length in characters
+
+    Returns:
+        Iterator of pieces in text order
+    """
+    start = 0
+    while len(text) - start > chunk_size:
+        end = start + chunk_size
+        for boundary in CHUNK_BOUNDARIES:
+            cut = text.rfind(boundary, start + chunk_size // 2, end - len(boundary) + 1)
+            if cut != -1:
+                end = cut + len(boundary)
+                break
+        yield text[start:end]
+        start = end
+    yield text[start:]
+
+
 class SyntacticFeatureExtractor:
     """Extracts syntactic features from text for stylometric analysis."""
     
-    def __init__(self):
-        try:
-            self.nlp = spacy.load('en_core_web_sm')
-        except Exception as e:
-            logger.error("Error loading spaCy model. Please run: python -m spacy download en_core_web_sm")
-            raise
+    MODEL_NAME = 'en_core_web_sm'
+    
+    def __init__(self, tier: str = 'full', chunk_size: int = 100000,
+                 parse_cache: Optional[ParseCache] = None):
+        """
+        Args:
+            tier: 'fast' loads only the tagger and sentence segmenter and
+                returns sentence length, verbs per sentence, POS
+                distributions and function word ratio; 'full' adds the
+                dependency parser and the parse tree, dependency label and
+                subordinate clause features (see ``SYNTACTIC_TIERS``)
+            chunk_size: Texts longer than this many characters are parsed
+                in pieces of about this size (see ``parse_statistics``), so
+                memory does not grow with the document; keep it well below
+                the pipeline's ``max_length``
+            parse_cache: Store of parsed Docs; texts found there are not
+                parsed again and the model is only loaded on a miss
+        """
+        if tier not in SYNTACTIC_TIERS:
+            raise ValueError(f"Unknown syntactic tier: {tier}")
+        self._nlp = None
+        self.tier = tier
+        self.chunk_size = chunk_size
+        self.parse_cache = parse_cache
+        self._pipeline_version = None
+
+    @property
+    def nlp(self):
+        """spaCy pipeline of the tier, imported and loaded on first use."""
+        if self._nlp is None:
+            try:
+                import spacy
+                tier = SYNTACTIC_TIERS[self.tier]
+                self._nlp = spacy.load(self.MODEL_NAME, exclude=list(tier['exclude']))
+                for name in tier['enable']:
+                    self._nlp.enable_pipe(name)
+            except Exception as e:
+                logger.error("Error loading spaCy model. Please run: stilo bootstrap")
+                raise
+        return self._nlp
+
+    @property
+    def pipeline_version(self) -> str:
+        """Model name and version plus the tier, without loading the model."""
+        if self._pipeline_version is None:
+            import spacy.util
+            version = spacy.util.get_package_version(self.MODEL_NAME)
+            self._pipeline_version = f"{self.MODEL_NAME}-{version}:{self.tier}"
+        return self._pipeline_version
+
+    def parse(self, text: str):
+        """Parse a text, using the parse cache if there is one."""
+        if self.parse_cache is None:
+            return self.nlp(text)
+        key = self.parse_cache.make_key(text, self.pipeline_version)
+        doc = self._cache_get(key)
+        if doc is None:
+            doc = self.nlp(text)
+            self._cache_put(key, doc)
+        return doc
             
-    def extract_features(self, text: str) -> Dict[str, float]:
+    def extract_features(self, text: Union[str, TokenizedDocument],
+                         out: Optional[np.ndarray] = None) -> Dict[str, float]:
         """
         Extract syntactic features from the text.
         
@@ -27,118 +152,171 @@ class SyntacticFeatureExtractor:
         - Sentence complexity metrics
         
         Args:
-            text: Preprocessed input text
+            text: Preprocessed input text, or its shared tokenization
+            out: Row of the feature schema (see ``FeatureSchema``) that the
+                features are also written into
             
         Returns:
             Dictionary of syntactic features
         """
         try:
-            doc = self.nlp(text)
-            
-            features = {
-                # Sentence structure metrics
-                'avg_sentence_length': self._calculate_avg_sentence_length(doc),
-                'sentence_complexity': self._calculate_sentence_complexity(doc),
-                
-                # Parse tree metrics
-                'avg_parse_tree_depth': self._calculate_parse_tree_depth(doc),
-                'parse_tree_breadth': self._calculate_parse_tree_breadth(doc),
-                
-                # Syntactic diversity
-                'syntactic_diversity': self._calculate_syntactic_diversity(doc),
-                
-                # Clause metrics
-                'subordinate_clause_ratio': self._calculate_subordinate_ratio(doc),
-                
-                # Function word usage
-                'function_word_ratio': self._calculate_function_word_ratio(doc)
-            }
-            
-            # Add POS tag distributions
-            pos_distributions = self._calculate_pos_distributions(doc)
-            features.update(pos_distributions)
-            
-            # Add dependency relation patterns
-            dep_patterns = self._calculate_dependency_patterns(doc)
-            features.update(dep_patterns)
-            
+            if isinstance(text, TokenizedDocument):
+                text = text.text
+            if len(text) > self.chunk_size:
+                features = self.features_from_statistics(self.parse_statistics(text))
+            else:
+                features = self.features_from_doc(self.parse(text))
+            if out is not None:
+                feature_schema().write(features, out)
             return features
             
         except Exception as e:
             logger.error(f"Error extracting syntactic features: {str(e)}")
             raise
-            
-    def _calculate_avg_sentence_length(self, doc) -> float:
-        """Calculate average sentence length in tokens."""
-        sentences = list(doc.sents)
-        if not sentences:
-            return 0
-        return np.mean([len(sent) for sent in sentences])
+
+    def parse_batch(self, texts: Iterable[Union[str, TokenizedDocument]],
+                    batch_size: Optional[int] = None, n_process: int = 1) -> Iterator:
+        """
+        Parse many texts with ``nlp.pipe``.
         
-    def _calculate_sentence_complexity(self, doc) -> float:
-        """Calculate sentence complexity based on clause structure."""
-        if not len(doc):
-            return 0
-        verb_counts = [len([token for token in sent if token.pos_ == "VERB"]) 
-                      for sent in doc.sents]
-        return np.mean(verb_counts) if verb_counts else 0
+        Texts are streamed through the pipeline in batches, which amortizes
+        the per-call overhead and lets spaCy fan batches out to worker
+        processes. Docs are yielded in input order. With a parse cache,
+        texts are looked up ``batch_size`` at a time and only that group's
+        misses go through the pipe before its Docs are yielded, so no more
+        than one group of Docs is held at once.
         
-    def _calculate_parse_tree_depth(self, doc) -> float:
-        """Calculate average depth of parse trees."""
-        def get_depth(token):
-            return max([get_depth(child) for child in token.children] or [0]) + 1
+        Args:
+            texts: Preprocessed input texts, or their shared tokenizations
+            batch_size: Texts per batch (spaCy's default if omitted)
+            n_process: Worker processes; -1 uses all CPUs
             
-        depths = [get_depth(sent.root) for sent in doc.sents]
-        return np.mean(depths) if depths else 0
+        Returns:
+            Iterator of spaCy Docs
+        """
+        texts = (text.text if isinstance(text, TokenizedDocument) else text for text in texts)
+        if self.parse_cache is None:
+            return self.nlp.pipe(texts, batch_size=batch_size, n_process=n_process)
         
-    def _calculate_parse_tree_breadth(self, doc) -> float:
-        """Calculate average branching factor of parse trees."""
-        breadths = [len(list(sent.root.children)) for sent in doc.sents]
-        return np.mean(breadths) if breadths else 0
+        return self._parse_cached(texts, batch_size, n_process)
+
+    def _parse_cached(self, texts: Iterator[str], batch_size: Optional[int],
+                      n_process: int) -> Iterator:
+        """Parse texts group by group, piping only the parse cache misses."""
+        group_size = batch_size or 1000  # spaCy's default batch size
+        while True:
+            group = list(islice(texts, group_size))
+            if not group:
+                return
+            keys = [self.parse_cache.make_key(text, self.pipeline_version) for text in group]
+            docs = [self._cache_get(key) for key in keys]
+            missing = [index for index, doc in enumerate(docs) if doc is None]
+            if missing:
+                parsed = self.nlp.pipe(
+                    (group[index] for index in missing), batch_size=batch_size, n_process=n_process
+                )
+                for index, doc in zip(missing, parsed):
+                    self._cache_put(keys[index], doc)
+                    docs[index] = doc
+            yield from docs
+
+    def _cache_get(self, key: str):
+        """Look up a parse, treating an unusable cache as a miss."""
+        try:
+            return self.parse_cache.get(key)
+        except Exception as e:
+            logger.warning(f"Parse cache unavailable: {str(e)}")
+            return None
+
+    def _cache_put(self, key: str, doc) -> None:
+        """Store a parse, logging rather than failing if the cache is unusable."""
+        try:
+            self.parse_cache.put(key, doc)
+        except Exception as e:
+            logger.warning(f"Could not store parse in cache: {str(e)}")
+
+    def extract_features_batch(self, texts: Iterable[Union[str, TokenizedDocument]],
+                               batch_size: Optional[int] = None,
+                               n_process: int = 1) -> Iterator[Dict[str, float]]:
+        """
+        Extract syntactic features from many texts (see ``parse_batch``).
         
-    def _calculate_pos_distributions(self, doc) -> Dict[str, float]:
-        """Calculate distribution of POS tags."""
-        if not len(doc):
-            return {}
-            
-        pos_counts = Counter(token.pos_ for token in doc)
-        total_tokens = len(doc)
+        Returns:
+            Iterator of feature dictionaries, in input order
+        """
+        texts = [text.text if isinstance(text, TokenizedDocument) else text for text in texts]
+        try:
+            # Long texts are parsed in chunks; the rest share one pipe stream
+            parsed = self.parse_batch(
+                (text for text in texts if len(text) <= self.chunk_size), batch_size, n_process
+            )
+            for text in texts:
+                if len(text) > self.chunk_size:
+                    yield self.features_from_statistics(self.parse_statistics(text))
+                else:
+                    yield self.features_from_doc(next(parsed))
+                
+        except Exception as e:
+            logger.error(f"Error extracting syntactic features: {str(e)}")
+            raise
+
+    def parse_statistics(self, text: str) -> SyntacticStatistics:
+        """
+        Parse a text of any length in chunks and aggregate its statistics.
         
-        return {
-            f'pos_{pos.lower()}': count/total_tokens 
-            for pos, count in pos_counts.items()
-        }
+        The text is cut at paragraph, sentence or word boundaries into
+        pieces of about ``chunk_size`` characters that are parsed one after
+        another. The last sentence the parser finds in a piece may be cut
+        off, so it is carried over and parsed again at the start of the
+        next piece; only sentences with right context are counted. Counts,
+        sentence lengths and tree depths are summed as
+        ``SyntacticStatistics``, which gives the same features as one parse
+        of the whole text wherever the parser splits sentences the same way.
+        Peak memory is set by the chunk size, not the text length.
         
-    def _calculate_dependency_patterns(self, doc) -> Dict[str, float]:
-        """Calculate frequency of dependency relation patterns."""
-        if not len(doc):
-            return {}
+        Args:
+            text: Preprocessed input text
             
-        dep_counts = Counter(token.dep_ for token in doc)
-        total_deps = len(doc)
-        
+        Returns:
+            Merged statistics of the whole text
+        """
+        dependencies = self.has_dependencies
+        stats = SyntacticStatistics()
+        carry = ''
+        for piece in split_at_boundaries(text, self.chunk_size):
+            buffer = carry + piece
+            doc = self.parse(buffer)
+            sentences = list(doc.sents)
+            if len(sentences) > 1 and len(buffer) <= 2 * self.chunk_size:
+                last = sentences[-1]
+                stats = stats.merge(SyntacticStatistics.from_doc(doc[:last.start], dependencies))
+                carry = buffer[last.start_char:]
+            elif len(buffer) <= 2 * self.chunk_size:
+                # A single sentence so far; wait for the next piece
+                carry = buffer
+            else:
+                # A sentence longer than the carry limit is cut here
+                stats = stats.merge(SyntacticStatistics.from_doc(doc, dependencies))
+                carry = ''
+        if carry:
+            stats = stats.merge(SyntacticStatistics.from_doc(self.parse(carry), dependencies))
+        return stats
+
+    @property
+    def has_dependencies(self) -> bool:
+        """Whether the tier runs the dependency parser."""
+        return 'parser' not in SYNTACTIC_TIERS[self.tier]['exclude']
+
+    def features_from_doc(self, doc) -> Dict[str, float]:
+        """Compute the syntactic features of the tier from a parsed spaCy Doc."""
+        return self.features_from_statistics(SyntacticStatistics.from_doc(doc, self.has_dependencies))
+
+    def features_from_statistics(self, stats: SyntacticStatistics) -> Dict[str, float]:
+        """Compute the syntactic features of the tier from merged statistics."""
+        features = stats.finalize()
+        if self.has_dependencies:
+            return features
         return {
-            f'dep_{dep.lower()}': count/total_deps 
-            for dep, count in dep_counts.items()
+            name: value for name, value in features.items()
+            if name not in DEPENDENCY_FEATURES and not name.startswith('dep_')
         }
-        
-    def _calculate_syntactic_diversity(self, doc) -> float:
-        """Calculate syntactic diversity using unique dependency patterns."""
-        if not len(doc):
-            return 0
-        unique_patterns = set((token.dep_, token.head.pos_) for token in doc)
-        return len(unique_patterns) / len(doc)
-        
-    def _calculate_subordinate_ratio(self, doc) -> float:
-        """Calculate ratio of subordinate clauses."""
-        if not len(doc):
-            return 0
-        subordinate_count = sum(1 for token in doc if token.dep_ in {'advcl', 'acl', 'ccomp', 'xcomp'})
-        return subordinate_count / len(doc)
-        
-    def _calculate_function_word_ratio(self, doc) -> float:
-        """Calculate ratio of function words to content words."""
-        if not len(doc):
-            return 0
-        function_words = sum(1 for token in doc if token.pos_ in {'ADP', 'AUX', 'CCONJ', 'DET', 'PART', 'PRON', 'SCONJ'})
-        return function_words / len(doc) 
\ No newline at end of file
@@ -0,0 +1,221 @@
+from typing import Callable, Dict, Optional
+import numpy as np
+from src.features.hashing import span_ids
+from src.features.readability_formulas import WordSet, _ratio, readability_scores
+from src.features.statistics import ReadabilityStatistics
+from src.preprocessing.tokenized_document import TokenizedDocument
+
+# Lexical features that are scored per span, as ``LexicalFeatureExtractor`` computes them
+LEXICAL_WINDOW_METRICS = ('avg_word_length', 'word_length_variance', 'type_token_ratio')
+
+
+class WindowedReadability:
+    """
+    Readability and lexical metrics of any span of a document.
+
+    The per-token counts of the readability counts record (syllables,
+    polysyllables, long and difficult words, characters, sentence ends) and
+    the words and word characters of every token are computed once and
+    stored as prefix sums, so the counts of a span are differences of two
+    array entries and the metrics of thousands of windows are a few
+    vectorized array operations.
+
+    Distinct words are not additive; they are counted from the previous
+    occurrence of every word, which takes one vectorized pass over the
+    words for all spans when span starts and ends are both sorted (sliding
+    windows, sections in text order).
+
+    Spans are ranges of whitespace-delimited tokens. A span's sentences are
+    the sentence ends inside it plus one for a trailing partial sentence,
+    and its characters are the characters of its tokens, so a span covering
+    the whole document gives the ``ReadabilityAnalyzer`` metrics of the
+    document (ARI counting tabs and newlines aside).
+    """
+
+    def __init__(self, doc: TokenizedDocument, count_syllables: Callable[[str], int],
+                 easy_words: Optional[WordSet] = None):
+        """
+        Args:
+            doc: Tokenized text
+            count_syllables: Syllable count of a token; a ``SyllableCounter``
+                counts all tokens at once
+            easy_words: Familiar words for Dale-Chall (the Dale-Chall list if omitted)
+        """
+        self.doc = doc
+        starts = doc.token_starts
+        counts = ReadabilityStatistics.token_counts(doc, count_syllables, easy_words)
+
+        # A sentence separator is a terminator run followed by whitespace, so
+        # it ends a token; it ends a sentence if its segment has any content
+        separators = doc.sentence_end_starts
+        segment_lengths = doc.stripped_lengths(*doc.segments(separators, doc.sentence_end_ends))
+        separator_tokens = np.searchsorted(starts, separators, side='right') - 1
+        self._has_separator = np.zeros(len(starts), dtype=bool)
+        self._has_separator[separator_tokens] = True
+        sentence_ends = np.zeros(len(starts), dtype=np.int64)
+        sentence_ends[separator_tokens] = segment_lengths[:-1] > 0
+
+        self._prefixes = {name: self._prefix(values) for name, values in counts.items()}
+        self._prefixes['sentences'] = self._prefix(sentence_ends)
+
+        # Words (``\w+`` runs) lie inside a single token
+        word_tokens = np.searchsorted(starts, doc.word_starts, side='right') - 1
+        lengths = doc.word_lengths
+        self._word_prefix = self._prefix(np.bincount(word_tokens, minlength=len(starts)))
+        self._length_prefixes = {
+            'word_characters': self._prefix(self._token_sums(word_tokens, lengths)),
+            'word_characters_squared': self._prefix(self._token_sums(word_tokens, lengths * lengths))
+        }
+        self._previous = self._previous_occurrences(self._word_ids(doc))
+
+    @staticmethod
+    def _prefix(values: np.ndarray) -> np.ndarray:
+        """Prefix sums with a leading 0, so ``p[b] - p[a]`` sums ``values[a:b]``."""
+        prefix = np.zeros(len(values) + 1, dtype=np.int64)
+        np.cumsum(values, out=prefix[1:])
+        return prefix
+
+    def _token_sums(self, word_tokens: np.ndarray, values: np.ndarray) -> np.ndarray:
+        """Sum of a per-word value over the words of every token."""
+        sums = np.zeros(len(self.doc.token_starts), dtype=np.int64)
+        np.add.at(sums, word_tokens, values)
+        return sums
+
+    @staticmethod
+    def _word_ids(doc: TokenizedDocument) -> np.ndarray:
+        """Id of every word, equal ids meaning equal lowercased words."""
+        lowered = doc.lowercase_codes()
+        if lowered is not None:
+            ids = span_ids(lowered, doc.word_starts, doc.word_ends)
+            if ids is not None:
+                return ids[0]
+        # Lowercasing changes the text length, or a hash collision
+        _, ids = np.unique([word.lower() for word in doc.words()], return_inverse=True)
+        return ids.ravel()
+
+    @staticmethod
+    def _previous_occurrences(ids: np.ndarray) -> np.ndarray:
+        """Index of the previous occurrence of every word, -1 for first occurrences."""
+        order = np.argsort(ids, kind='stable')
+        previous = np.full(len(ids), -1, dtype=np.int64)
+        repeated = ids[order[1:]] == ids[order[:-1]]
+        previous[order[1:][repeated]] = order[:-1][repeated]
+        return previous
+
+    def _type_counts(self, starts: np.ndarray, ends: np.ndarray) -> np.ndarray:
+        """
+        Distinct words of word ranges ``[starts[i], ends[i])``.
+
+        Word ``j`` is new in a range if the range holds it but not its
+        previous occurrence. When starts and ends are sorted, the ranges
+        where that holds are consecutive, so every word adds 1 to a run of
+        ranges through a difference array.
+        """
+        previous = self._previous
+        if not (np.all(np.diff(starts) >= 0) and np.all(np.diff(ends) >= 0)):
+            return np.array([np.count_nonzero(previous[start:end] < start)
+                             for start, end in zip(starts.tolist(), ends.tolist())], dtype=np.int64)
+        words = np.arange(len(previous))
+        first = np.maximum(np.searchsorted(ends, words, side='right'),
+                           np.searchsorted(starts, previous, side='right'))
+        last = np.searchsorted(starts, words, side='right')
+        counted = first < last
+        changes = (np.bincount(first[counted], minlength=len(starts) + 1)
+                   - np.bincount(last[counted], minlength=len(starts) + 1))
+        return np.cumsum(changes[:-1])
+
+    @property
+    def token_count(self) -> int:
+        return len(self.doc.token_starts)
+
+    def windows(self, window_size: int, stride: Optional[int] = None) -> Dict[str, np.ndarray]:
+        """
+        Metrics of sliding windows of ``window_size`` tokens.
+
+        Windows start every ``stride`` tokens (``window_size`` if omitted, so
+        windows do not overlap); if the stride does not line up with the end
+        of the text, a shorter last window covers the remaining tokens. A
+        document shorter than one window gives a single window.
+
+        Returns:
+            See ``spans``
+        """
+        if window_size < 1:
+            raise ValueError("window_size must be positive")
+        stride = window_size if stride is None else stride
+        if stride < 1:
+            raise ValueError("stride must be positive")
+        n = self.token_count
+        if not n:
+            return self.spans(np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64))
+        starts = np.arange(0, max(n - window_size, 0) + 1, stride, dtype=np.int64)
+        if starts[-1] + window_size < n and starts[-1] + stride < n:
+            # A shorter last window covers the tokens the stride skipped
+            starts = np.append(starts, starts[-1] + stride)
+        return self.spans(starts, np.minimum(starts + window_size, n))
+
+    def sections(self, char_starts: np.ndarray, char_ends: np.ndarray) -> Dict[str, np.ndarray]:
+        """
+        Metrics of text sections given as character offsets (pages,
+        paragraphs, chapters). A section holds the tokens starting inside it.
+
+        Returns:
+            See ``spans``
+        """
+        starts = np.searchsorted(self.doc.token_starts, np.asarray(char_starts, dtype=np.int64))
+        ends = np.searchsorted(self.doc.token_starts, np.asarray(char_ends, dtype=np.int64))
+        return self.spans(starts, np.maximum(starts, ends))
+
+    def spans(self, starts: np.ndarray, ends: np.ndarray) -> Dict[str, np.ndarray]:
+        """
+        Metrics of token spans ``[starts[i], ends[i])``.
+
+        Args:
+            starts: First token of every span
+            ends: Token after the last token of every span
+
+        Returns:
+            Dictionary with the span boundaries as token indices
+            ('start_token', 'end_token') and character offsets
+            ('start_char', 'end_char'), the counts ``readability_scores``
+            takes, the span's ``\\w+`` words ('lexical_words') and their
+            distinct lowercased forms ('word_types'), and one float array
+            per metric in ``READABILITY_METRICS`` and
+            ``LEXICAL_WINDOW_METRICS``; empty spans score 0
+        """
+        starts = np.asarray(starts, dtype=np.int64)
+        ends = np.asarray(ends, dtype=np.int64)
+        counts = {name: prefix[ends] - prefix[starts] for name, prefix in self._prefixes.items()}
+        counts['words'] = ends - starts
+        # A span not ending at a sentence end holds one more, partial, sentence
+        non_empty = counts['words'] > 0
+        counts['sentences'][non_empty] += ~self._has_separator[ends[non_empty] - 1]
+
+        token_starts, token_ends = self.doc.token_starts, self.doc.token_ends
+        start_chars = np.zeros(len(starts), dtype=np.int64)
+        end_chars = np.zeros(len(starts), dtype=np.int64)
+        start_chars[non_empty] = token_starts[starts[non_empty]]
+        end_chars[non_empty] = token_ends[ends[non_empty] - 1]
+
+        spans = {'start_token': starts, 'end_token': ends, 'start_char': start_chars, 'end_char': end_chars}
+        spans.update(counts)
+        spans.update(readability_scores(**counts))
+        spans.update(self._lexical_metrics(starts, ends))
+        return spans
+
+    def _lexical_metrics(self, starts: np.ndarray, ends: np.ndarray) -> Dict[str, np.ndarray]:
+        """Word counts and ``LEXICAL_WINDOW_METRICS`` of token spans."""
+        word_starts, word_ends = self._word_prefix[starts], self._word_prefix[ends]
+        words = word_ends - word_starts
+        totals = {name: prefix[ends] - prefix[starts] for name, prefix in self._length_prefixes.items()}
+        types = self._type_counts(word_starts, word_ends)
+        characters = totals['word_characters']
+        return {
+            'lexical_words': words,
+            'word_types': types,
+            'avg_word_length': _ratio(characters, words),
+            # Population variance from exact integer sums, like ``Moments.variance``
+            'word_length_variance': _ratio(words * totals['word_characters_squared'] - characters * characters,
+                                           words * words),
+            'type_token_ratio': _ratio(types, words)
+        }
@@ -1,10 +1,11 @@
 import logging.config
+import argparse
+import sys
 import yaml
 from pathlib import Path
 import json
 from datetime import datetime
-from typing import Dict, Any
-from src.stylometric_analysis_app import StylometricAnalysisApp
+from typing import Dict, Any, Iterator, List, Optional
 
 def setup_logging():
     """Setup logging configuration"""
@@ -16,36 +17,316 @@ def setup_logging():
     else:
         logging.basicConfig(level=logging.INFO)
 
-def main():
+def bootstrap(argv: List[str]) -> None:
+    """Download the NLTK data and spaCy model once, so later runs work offline"""
+    logger = logging.getLogger(__name__)
+    parser = argparse.ArgumentParser(
+        prog='stilo bootstrap',
+        description='Download the language resources needed for analysis'
+    )
+    parser.add_argument('--nltk-dir', help='Target nltk_data directory (NLTK default if omitted)')
+    parser.add_argument('--skip-spacy', action='store_true',
+                      help='Do not download the spaCy model')
+    args = parser.parse_args(argv)
+
+    try:
+        from src.preprocessing.text_cleaner import bootstrap_nltk_resources
+        downloaded = bootstrap_nltk_resources(args.nltk_dir)
+        logger.info(f"NLTK resources downloaded: {', '.join(downloaded) or 'none needed'}")
+
+        if args.nltk_dir:
+            import nltk
+            nltk.data.path.insert(0, args.nltk_dir)
+        from src.features.syllable_lexicon import build_cmudict_lexicon, default_lexicon_path
+        lexicon_path = default_lexicon_path()
+        words = build_cmudict_lexicon(lexicon_path)
+        logger.info(f"Syllable lexicon built: {lexicon_path} ({words} words)")
+
+        if not args.skip_spacy:
+            from src.features.syntactic_features import SyntacticFeatureExtractor, bootstrap_spacy_model
+            model_name = SyntacticFeatureExtractor.MODEL_NAME
+            if bootstrap_spacy_model(model_name):
+                logger.info(f"spaCy model downloaded: {model_name}")
+            else:
+                logger.info(f"spaCy model already installed: {model_name}")
+    except Exception as e:
+        logger.exception("Bootstrap failed")
+        raise SystemExit(1)
+
+def corpus_model(argv: List[str]) -> None:
+    """Fit the corpus style model from saved analysis results"""
+    logger = logging.getLogger(__name__)
+    from src.models.corpus_model import DEFAULT_MODEL_PATH
+
+    parser = argparse.ArgumentParser(
+        prog='stilo corpus-model',
+        description='Fit the corpus style model from JSON analysis results, streaming them in batches'
+    )
+    parser.add_argument('results', nargs='+', help='JSON result files, or folders of them')
+    parser.add_argument('--model', default=DEFAULT_MODEL_PATH, help='Model file to write')
+    parser.add_argument('--update', action='store_true',
+                      help='Add the results to an existing model instead of fitting a new one')
+    parser.add_argument('--components', type=int, default=2, help='Dimensions of the style projection')
+    parser.add_argument('--clusters', type=int, default=8, help='Number of style clusters')
+    parser.add_argument('--batch-size', type=int, default=1024, help='Documents per fitting step')
+    args = parser.parse_args(argv)
+
+    try:
+        from src.models.corpus_model import CorpusStyleModel
+
+        paths = result_paths(args.results)
+        if args.update:
+            model = CorpusStyleModel.load(args.model)
+            for batch in result_batches(paths, model):
+                model.partial_fit(batch)
+            model.flush()
+        else:
+            model = CorpusStyleModel(n_components=args.components, n_clusters=args.clusters,
+                                     batch_size=args.batch_size)
+            model.fit(lambda: result_batches(paths, model))
+        model.save(args.model)
+        logger.info(f"Corpus style model saved to: {args.model} ({model.documents} documents)")
+    except Exception as e:
+        logger.exception("Fitting the corpus style model failed")
+        raise SystemExit(1)
+
+def result_batches(paths: List[Path], model) -> Iterator:
+    """Feature matrices of saved analysis results, ``model.batch_size`` documents at a time"""
+    import numpy as np
+
+    rows = []
+    for _, results in iter_results(paths):
+        rows.append(model.feature_row(results['features']))
+        if len(rows) == model.batch_size:
+            yield np.vstack(rows)
+            rows = []
+    if rows:
+        yield np.vstack(rows)
+
+def index(argv: List[str]) -> None:
+    """Maintain and query the style similarity index"""
+    logger = logging.getLogger(__name__)
+    from src.models.similarity_index import DEFAULT_INDEX_PATH
+
+    parser = argparse.ArgumentParser(
+        prog='stilo index',
+        description='Find the documents closest in style, from saved JSON analysis results'
+    )
+    parser.add_argument('--index', default=DEFAULT_INDEX_PATH, help='Index file')
+    actions = parser.add_subparsers(dest='action', required=True)
+    add_parser = actions.add_parser('add', help='Add analysis results to the index (created if missing)')
+    add_parser.add_argument('results', nargs='+', help='JSON result files, or folders of them')
+    add_parser.add_argument('--method', choices=['auto', 'exact', 'lsh'], default='auto',
+                          help='Exact tree, LSH, or exact up to 50000 documents (new index only)')
+    remove_parser = actions.add_parser('remove', help='Remove documents by id')
+    remove_parser.add_argument('ids', nargs='+', help='Document ids (PDF file names)')
+    query_parser = actions.add_parser('query', help='List the documents closest in style')
+    query_parser.add_argument('target', help='JSON result file, or the id of an indexed document')
+    query_parser.add_argument('-k', type=int, default=10, help='Number of neighbours')
+    args = parser.parse_args(argv)
+
+    try:
+        from src.models.similarity_index import StyleSimilarityIndex
+
+        exists = Path(args.index).exists()
+        if args.action == 'add':
+            style_index = StyleSimilarityIndex.load(args.index) if exists else StyleSimilarityIndex(method=args.method)
+            added = 0
+            for path, results in iter_results(result_paths(args.results)):
+                style_index.add_results(result_id(path, results), results['features'])
+                added += 1
+            style_index.save(args.index)
+            logger.info(f"Added {added} documents to {args.index} ({len(style_index)} indexed)")
+            return
+
+        if not exists:
+            raise FileNotFoundError(f"No style index at {args.index}; run 'stilo index add' first")
+        style_index = StyleSimilarityIndex.load(args.index)
+        if args.action == 'remove':
+            removed = style_index.remove(args.ids)
+            style_index.save(args.index)
+            logger.info(f"Removed {removed} documents from {args.index} ({len(style_index)} indexed)")
+            return
+
+        if args.target in style_index:
+            neighbours = style_index.query_id(args.target, args.k)
+        else:
+            path, results = next(iter_results([Path(args.target)]), (None, None))
+            if results is None:
+                raise ValueError(f"Not an indexed id or a readable analysis result: {args.target}")
+            neighbours = style_index.query(results['features'], args.k, exclude=result_id(path, results))
+        for doc_id, distance in neighbours:
+            print(f"{distance:10.4f}  {doc_id}")
+    except Exception as e:
+        logger.exception("Style index command failed")
+        raise SystemExit(1)
+
+def store(argv: List[str]) -> None:
+    """Import saved analysis results into the columnar feature store"""
+    logger = logging.getLogger(__name__)
+    from src.utils.feature_store import DEFAULT_STORE_PATH
+
+    parser = argparse.ArgumentParser(
+        prog='stilo store',
+        description='Append JSON analysis results to the columnar feature store, in batches'
+    )
+    parser.add_argument('results', nargs='+', help='JSON result files, or folders of them')
+    parser.add_argument('--store', default=DEFAULT_STORE_PATH, help='Store directory (created if missing)')
+    parser.add_argument('--batch-size', type=int, default=1024, help='Documents per atomic append')
+    args = parser.parse_args(argv)
+
+    try:
+        from src.utils.feature_store import FeatureStore
+
+        feature_store = FeatureStore(args.store)
+        ids, batch = [], []
+        for path, results in iter_results(result_paths(args.results)):
+            ids.append(result_id(path, results))
+            batch.append(results)
+            if len(batch) == args.batch_size:
+                feature_store.append_results(batch, ids)
+                ids, batch = [], []
+        feature_store.append_results(batch, ids)
+        logger.info(f"Feature store {args.store} holds {len(feature_store)} rows "
+                    f"({len(feature_store.index)} documents)")
+        feature_store.close()
+    except Exception as e:
+        logger.exception("Importing into the feature store failed")
+        raise SystemExit(1)
+
+def iter_results(paths: List[Path]) -> Iterator:
+    """(path, results) of the saved analysis results that have features, one file at a time"""
+    logger = logging.getLogger(__name__)
+    for path in paths:
+        try:
+            with open(path, encoding='utf-8') as f:
+                results = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Skipping {path}: {str(e)}")
+            continue
+        if 'error' in results.get('metadata', {}) or 'features' not in results:
+            continue
+        yield path, results
+
+def result_paths(arguments: List[str]) -> List[Path]:
+    """JSON result files named on the command line, expanding folders"""
+    paths = []
+    for path in map(Path, arguments):
+        paths.extend(sorted(path.glob('*.json')) if path.is_dir() else [path])
+    return paths
+
+def result_id(path: Path, results: Dict[str, Any]) -> str:
+    """Document id of an analysis result: the PDF file name, else the result file stem"""
+    return results.get('metadata', {}).get('filename') or path.stem
+
+# Subcommands; any other first argument is treated as a PDF path
+COMMANDS = {
+    'bootstrap': bootstrap,
+    'corpus-model': corpus_model,
+    'index': index,
+    'store': store
+}
+
+def main(argv: Optional[List[str]] = None):
     setup_logging()
+    argv = sys.argv[1:] if argv is None else argv
+    if argv and argv[0] in COMMANDS:
+        return COMMANDS[argv[0]](argv[1:])
+    analyze(argv)
+
+def analyze(argv: List[str]) -> None:
+    """Analyze a PDF document, or every PDF document in a folder"""
     logger = logging.getLogger(__name__)
     
     try:
-        import argparse
-        parser = argparse.ArgumentParser(description='Analyze PDF document style')
-        parser.add_argument('pdf_path', help='Path to PDF file')
-        parser.add_argument('--output', help='Output file path base (without extension)')
+        parser = argparse.ArgumentParser(
+            prog='stilo',
+            description='Analyze PDF document style',
+            epilog=f"Other commands: {', '.join(COMMANDS)} (see 'stilo <command> --help')"
+        )
+        parser.add_argument('pdf_path', help='Path to PDF file, or a folder of PDF files')
+        parser.add_argument('--output', help='Output file path base (without extension), or output folder for a folder of PDFs')
         parser.add_argument('--format', 
                           choices=['json', 'csv'],
                           help='Output format (json or csv). If not specified, generates both')
-        args = parser.parse_args()
+        parser.add_argument('--incremental', action='store_true',
+                          help='Reuse cached statistics of pages unchanged since an earlier revision')
+        parser.add_argument('--workers', type=int, default=1,
+                          help='Processes used to extract features from chunks of long documents')
+        parser.add_argument('--approximate-vocabulary', action='store_true',
+                          help='Estimate vocabulary ratios with constant-memory sketches')
+        parser.add_argument('--batch-size', type=int, default=8,
+                          help='Documents per spaCy batch when parsing a folder or changed pages')
+        parser.add_argument('--parse-processes', type=int, default=1,
+                          help='spaCy worker processes for batched parsing (-1 for all CPUs)')
+        parser.add_argument('--parse-cache', action='store_true',
+                          help='Store spaCy parses in the user cache directory and reuse them')
+        parser.add_argument('--syntactic-tier', choices=['fast', 'full'], default='full',
+                          help='fast: POS tags and sentences only; full: adds the dependency parser')
+        parser.add_argument('--corpus-model', metavar='PATH',
+                          help="Add each document's style cluster from a model built by 'stilo corpus-model'")
+        parser.add_argument('--store', metavar='PATH',
+                          help='Also append the results to a columnar feature store (created if missing)')
+        parser.add_argument('--window-size', type=int, metavar='TOKENS',
+                          help='Add readability and lexical metrics of sliding windows and of every page')
+        parser.add_argument('--window-stride', type=int, metavar='TOKENS',
+                          help='Tokens between window starts (the window size if omitted)')
+        args = parser.parse_args(argv)
+
+        # Imported here so --help and other commands skip the heavy dependencies
+        from src.stylometric_analysis_app import StylometricAnalysisApp
+        from src.utils.cache import ParseCache
+        from src.models.corpus_model import CorpusStyleModel
 
         # Initialize and run analysis
-        app = StylometricAnalysisApp()
-        logger.info(f"Processing document: {args.pdf_path}")
+        app = StylometricAnalysisApp(
+            incremental=args.incremental,
+            workers=args.workers,
+            vocabulary_mode='approximate' if args.approximate_vocabulary else 'exact',
+            parse_batch_size=args.batch_size,
+            parse_processes=args.parse_processes,
+            syntactic_tier=args.syntactic_tier,
+            parse_cache=ParseCache() if args.parse_cache else None,
+            corpus_model=CorpusStyleModel.load(args.corpus_model) if args.corpus_model else None,
+            window_size=args.window_size,
+            window_stride=args.window_stride
+        )
         
         # Handle output path
         output_dir = Path('results')
         output_dir.mkdir(exist_ok=True)
         timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
         
+        feature_store = None
+        if args.store:
+            from src.utils.feature_store import FeatureStore
+            feature_store = FeatureStore(args.store)
+        
+        if Path(args.pdf_path).is_dir():
+            analyze_folder(app, Path(args.pdf_path), args, Path(args.output) if args.output else output_dir,
+                           timestamp, feature_store)
+            return
+        
+        logger.info(f"Processing document: {args.pdf_path}")
         if args.format:
             # Single format output
             extension = '.json' if args.format == 'json' else '.csv'
             output_path = args.output if args.output else str(output_dir / f"analysis_{timestamp}{extension}")
             
             # Get results
-            results = app.analyze_document(args.pdf_path, args.format, output_path)
+            if feature_store is not None and args.format == 'csv':
+                # The store needs the result dictionary, so the CSV is written here
+                results = app.analyze_document(args.pdf_path, 'json')
+                if isinstance(results, dict):
+                    store_results(feature_store, [results])
+                    app.data_formatter.to_csv(results, output_path)
+                    results = f"Results saved to CSV: {output_path}"
+                else:
+                    results = json.loads(results)  # error result
+            else:
+                results = app.analyze_document(args.pdf_path, args.format, output_path)
+                if feature_store is not None:
+                    store_results(feature_store, [results])
             
             # Save results
             if isinstance(results, str):
@@ -60,6 +341,8 @@ def main():
             
             # Get and save JSON results
             json_results = app.analyze_document(args.pdf_path, 'json')
+            if feature_store is not None:
+                store_results(feature_store, [json_results])
             json_path = f"{base_path}.json"
             with open(json_path, 'w', encoding='utf-8') as f:
                 json.dump(json_results, f, indent=2)
@@ -74,5 +357,41 @@ def main():
         logger.exception("Critical error in application")
         raise SystemExit(1)
 
+def analyze_folder(app, folder: Path, args: argparse.Namespace, output_dir: Path, timestamp: str,
+                   feature_store=None) -> None:
+    """Analyze every PDF in a folder, parsing the documents in batches"""
+    logger = logging.getLogger(__name__)
+    pdf_paths = sorted(str(path) for path in folder.glob('*.pdf'))
+    if not pdf_paths:
+        logger.warning(f"No PDF files found in {folder}")
+        return
+    logger.info(f"Processing {len(pdf_paths)} documents in: {folder}")
+    output_dir.mkdir(parents=True, exist_ok=True)
+    
+    all_results = app.analyze_documents(pdf_paths)
+    if feature_store is not None:
+        store_results(feature_store, all_results)
+    for pdf_path, results in zip(pdf_paths, all_results):
+        base_path = output_dir / f"{Path(pdf_path).stem}_analysis_{timestamp}"
+        if args.format != 'csv':
+            json_path = f"{base_path}.json"
+            with open(json_path, 'w', encoding='utf-8') as f:
+                json.dump(results, f, indent=2)
+            logger.info(f"JSON results saved to: {json_path}")
+        if args.format != 'json':
+            csv_path = f"{base_path}.csv"
+            app.data_formatter.to_csv(results, csv_path)
+            logger.info(f"CSV results saved to: {csv_path}")
+
+def store_results(feature_store, results: List[Dict[str, Any]]) -> None:
+    """Append analysis results to the feature store as one batch"""
+    logger = logging.getLogger(__name__)
+    try:
+        # Failed analyses come back as JSON strings
+        appended = feature_store.append_results(result for result in results if isinstance(result, dict))
+        logger.info(f"Appended {appended} documents to feature store: {feature_store.path}")
+    except Exception as e:
+        logger.error(f"Could not append to feature store: {str(e)}")
+
 if __name__ == "__main__":
     main()
\ No newline at end of file
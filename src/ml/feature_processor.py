@@ -1,7 +1,8 @@
 import pandas as pd
 from sklearn.preprocessing import StandardScaler, LabelEncoder
-from typing import Tuple, Dict, Any
+from typing import Tuple, Dict, Any, Iterable, Optional
 import numpy as np
+from src.features.schema import FeatureSchema, feature_schema
 
 class FeatureProcessor:
     """Processes stylometric features for ML training."""
@@ -39,6 +40,19 @@ class FeatureProcessor:
         
         return X_scaled, y 
     
+    def feature_matrix(self, results: Iterable[Dict[str, Any]],
+                       schema: Optional[FeatureSchema] = None) -> pd.DataFrame:
+        """
+        Raw features of many analysis results with a fixed column layout.
+        
+        Every result is encoded with the feature schema, so the frame has
+        the same float32 columns whatever features each document produced;
+        missing features are NaN.
+        """
+        schema = schema or feature_schema()
+        matrix = schema.encode_batch(result['features'] for result in results)
+        return pd.DataFrame(matrix, columns=list(schema.columns), copy=False)
+    
     def prepare_features_for_prediction(self, analysis_results: Dict[str, Any]) -> np.ndarray:
         """Prepare features for prediction from analysis results."""
         # Extract relevant features
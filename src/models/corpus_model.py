@@ -0,0 +1,210 @@
+import logging
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MODEL_PATH = 'models/corpus_style_model.joblib'
+
+# Bump when the persisted layout changes, so stale model files are rejected
+MODEL_VERSION = 1
+
+# Scale-free document features the corpus model is fitted on, by group
+STYLE_COLUMNS = (
+    'avg_word_length', 'type_token_ratio', 'hapax_ratio', 'word_length_variance', 'punctuation_ratio',
+    'avg_sentence_length', 'sentence_complexity', 'syntactic_diversity', 'subordinate_clause_ratio',
+    'function_word_ratio',
+    'sentence_length_variance', 'avg_sentences_per_paragraph', 'structure_consistency', 'text_density',
+    'flesch_reading_ease', 'gunning_fog', 'smog_index', 'dale_chall_score', 'automated_readability_index'
+)
+
+
+class CorpusStyleModel:
+    """
+    Style model of a whole corpus, fitted from streamed feature batches.
+
+    Features are standardized with a ``StandardScaler``, reduced with an
+    ``IncrementalPCA`` and clustered with ``MiniBatchKMeans`` on the
+    projections. All three are fitted with ``partial_fit``, so the corpus
+    never has to fit in memory, and assigning a new document is a fixed
+    number of small matrix operations whatever the corpus size.
+
+    Missing features (NaN, e.g. dependency features of the fast syntactic
+    tier) are replaced by the corpus mean.
+    """
+
+    def __init__(self, columns: Sequence[str] = STYLE_COLUMNS, n_components: int = 2,
+                 n_clusters: int = 8, batch_size: int = 1024, random_state: Optional[int] = 0):
+        """
+        Args:
+            columns: Feature name of every matrix column
+            n_components: Dimensions of the style projection
+            n_clusters: Number of style clusters
+            batch_size: Rows buffered before each ``partial_fit`` step; the
+                estimators need at least ``max(n_components, n_clusters)``
+                rows per step
+            random_state: Seed of the cluster initialization
+        """
+        if batch_size < max(n_components, n_clusters):
+            raise ValueError("batch_size must be at least max(n_components, n_clusters)")
+        from sklearn.cluster import MiniBatchKMeans
+        from sklearn.decomposition import IncrementalPCA
+        from sklearn.preprocessing import StandardScaler
+
+        self.columns = tuple(columns)
+        self.batch_size = batch_size
+        self.scaler = StandardScaler()
+        self.pca = IncrementalPCA(n_components=n_components)
+        self.kmeans = MiniBatchKMeans(n_clusters=n_clusters, random_state=random_state, n_init=3)
+        self.documents = 0
+        self._pending: List[np.ndarray] = []
+
+    @property
+    def is_fitted(self) -> bool:
+        return hasattr(self.kmeans, 'cluster_centers_')
+
+    def partial_fit(self, features: np.ndarray) -> 'CorpusStyleModel':
+        """
+        Add a batch of documents to the model.
+
+        Rows are buffered until ``batch_size`` of them are available; each
+        full batch updates the scaler, then the projection and the clusters
+        with the scaler's running estimates. Early batches are therefore
+        scaled with less precise means than later ones; ``fit`` avoids this
+        with one pass per estimator.
+
+        Args:
+            features: Matrix of shape (documents, len(columns))
+        """
+        self._pending.append(self._check(features))
+        if sum(len(rows) for rows in self._pending) >= self.batch_size:
+            self._fit_pending()
+        return self
+
+    def flush(self) -> 'CorpusStyleModel':
+        """Fit the buffered rows, if there are enough for a ``partial_fit`` step."""
+        if sum(len(rows) for rows in self._pending) >= self._min_rows:
+            self._fit_pending()
+        return self
+
+    def fit(self, batches: Callable[[], Iterable[np.ndarray]]) -> 'CorpusStyleModel':
+        """
+        Fit the model in three streaming passes over the corpus: the
+        scaler, then the projection of the standardized features, then the
+        clusters of the projections.
+
+        Args:
+            batches: Function returning a fresh iterator of feature matrices
+                each time it is called
+        """
+        for batch in self._rebatch(batches()):
+            self.scaler.partial_fit(batch)
+        for batch in self._rebatch(batches()):
+            self.pca.partial_fit(self._standardize(batch))
+        for batch in self._rebatch(batches()):
+            self.kmeans.partial_fit(self.pca.transform(self._standardize(batch)))
+            self.documents += len(batch)
+        return self
+
+    def project(self, features: np.ndarray) -> np.ndarray:
+        """Coordinates of documents in the style projection, shape (documents, n_components)."""
+        return self.pca.transform(self._standardize(self._check(features)))
+
+    def predict(self, features: np.ndarray) -> np.ndarray:
+        """Style cluster of every document."""
+        return self.kmeans.predict(self.project(features))
+
+    def assign(self, feature_groups: Dict[str, Dict[str, float]]) -> Dict[str, Any]:
+        """
+        Place one analyzed document in the corpus model.
+
+        Args:
+            feature_groups: The 'features' dictionary of an analysis result
+
+        Returns:
+            Dictionary with the style 'cluster', the 'projection'
+            coordinates and the 'distance' to the cluster center
+        """
+        row = self.feature_row(feature_groups)[np.newaxis, :]
+        projection = self.project(row)
+        cluster = int(self.kmeans.predict(projection)[0])
+        distance = float(np.linalg.norm(projection[0] - self.kmeans.cluster_centers_[cluster]))
+        return {
+            'cluster': cluster,
+            'projection': [round(float(value), 4) for value in projection[0]],
+            'distance': round(distance, 4)
+        }
+
+    def feature_row(self, feature_groups: Dict[str, Dict[str, float]]) -> np.ndarray:
+        """Feature row of an analysis result, NaN for missing features."""
+        merged = {}
+        for group in feature_groups.values():
+            merged.update(group)
+        return np.array([merged.get(name, np.nan) for name in self.columns], dtype=np.float64)
+
+    def save(self, path: str = DEFAULT_MODEL_PATH) -> None:
+        """Persist the model with joblib, writing to a temporary file first."""
+        import joblib
+
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        partial = path.with_suffix(path.suffix + '.tmp')
+        joblib.dump({'version': MODEL_VERSION, 'model': self}, partial)
+        partial.replace(path)
+
+    @classmethod
+    def load(cls, path: str = DEFAULT_MODEL_PATH) -> 'CorpusStyleModel':
+        """Load a model written by ``save``."""
+        import joblib
+
+        data = joblib.load(path)
+        if not isinstance(data, dict) or data.get('version') != MODEL_VERSION:
+            raise ValueError(f"Not a corpus style model (version {MODEL_VERSION}): {path}")
+        return data['model']
+
+    @property
+    def _min_rows(self) -> int:
+        return max(self.pca.n_components, self.kmeans.n_clusters)
+
+    def _check(self, features: np.ndarray) -> np.ndarray:
+        features = np.asarray(features, dtype=np.float64)
+        if features.ndim != 2 or features.shape[1] != len(self.columns):
+            raise ValueError(f"Expected a matrix with {len(self.columns)} columns, got shape {features.shape}")
+        return features
+
+    def _standardize(self, features: np.ndarray) -> np.ndarray:
+        # The scaler ignores NaN while fitting and keeps it when transforming;
+        # a standardized 0 is the corpus mean
+        return np.nan_to_num(self.scaler.transform(features))
+
+    def _fit_pending(self) -> None:
+        batch = np.vstack(self._pending)
+        self._pending = []
+        self.scaler.partial_fit(batch)
+        standardized = self._standardize(batch)
+        self.kmeans.partial_fit(self.pca.partial_fit(standardized).transform(standardized))
+        self.documents += len(batch)
+
+    def _rebatch(self, batches: Iterable[np.ndarray]) -> Iterable[np.ndarray]:
+        """
+        Regroup streamed matrices into batches of at least ``batch_size``
+        rows; a short remainder is added to the last batch.
+        """
+        full, pending, rows = None, [], 0
+        for batch in batches:
+            pending.append(self._check(batch))
+            rows += len(pending[-1])
+            if rows >= self.batch_size:
+                if full is not None:
+                    yield full
+                full, pending, rows = np.vstack(pending), [], 0
+        if full is not None:
+            pending.insert(0, full)
+        if not pending:
+            return
+        batch = np.vstack(pending)
+        if len(batch) >= self._min_rows:
+            yield batch
+        else:
+            logger.warning(f"Skipping {len(batch)} rows: fewer than {self._min_rows} documents")
@@ -0,0 +1,285 @@
+import logging
+import math
+import warnings
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple, Union
+import numpy as np
+from src.models.corpus_model import STYLE_COLUMNS
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_INDEX_PATH = 'models/style_index.joblib'
+
+# Bump when the persisted layout changes, so stale index files are rejected
+INDEX_VERSION = 1
+
+# Above this many documents 'auto' switches from an exact tree to LSH
+EXACT_LIMIT = 50000
+
+# Rows added or removed since the last build are handled by a linear scan
+# and filtering; past this share of the built rows (within the bounds
+# below) the index is rebuilt
+REBUILD_FRACTION = 0.1
+MIN_STALE_ROWS = 256
+MAX_STALE_ROWS = 4096
+
+
+class StyleSimilarityIndex:
+    """
+    Nearest-neighbour index of documents by style.
+
+    Documents are rows of standardized feature vectors (see
+    ``STYLE_COLUMNS``); neighbours are ranked by Euclidean distance. Up to
+    ``EXACT_LIMIT`` documents the index is an exact KD tree (few
+    features) or ball tree; above it, random hyperplane LSH: each of
+    ``n_tables`` hash tables keys a document by the signs of its
+    projections on random hyperplanes, and a query reranks the documents
+    sharing a bucket with it in any table.
+
+    Trees and hash tables are static, so documents added since the last
+    build are scanned linearly and removed ones are filtered out until
+    they exceed ``REBUILD_FRACTION`` of the index, which then rebuilds on
+    the next query. The standardization is also refreshed on rebuild.
+    """
+
+    def __init__(self, columns: Sequence[str] = STYLE_COLUMNS, method: str = 'auto',
+                 n_tables: int = 8, bucket_size: int = 32, random_state: int = 0):
+        """
+        Args:
+            columns: Feature name of every vector component
+            method: 'exact', 'lsh' or 'auto' (exact up to ``EXACT_LIMIT`` documents)
+            n_tables: LSH hash tables; more tables find more true neighbours
+                at the cost of more candidates per query
+            bucket_size: Average documents per LSH bucket, which sets the
+                number of hyperplanes per table
+            random_state: Seed of the LSH hyperplanes
+        """
+        if method not in ('auto', 'exact', 'lsh'):
+            raise ValueError(f"Unknown index method: {method}")
+        self.columns = tuple(columns)
+        self.method = method
+        self.n_tables = n_tables
+        self.bucket_size = bucket_size
+        self.random_state = random_state
+        self.ids: List[str] = []
+        self._rows: Dict[str, int] = {}
+        self._vectors = np.zeros((0, len(self.columns)), dtype=np.float64)
+        self._size = 0
+        self._active = np.zeros(0, dtype=bool)
+        self._reset_build()
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __contains__(self, doc_id: str) -> bool:
+        return doc_id in self._rows
+
+    def add(self, doc_ids: Union[str, Sequence[str]], features: np.ndarray) -> None:
+        """
+        Add or replace documents.
+
+        Args:
+            doc_ids: Document identifier, or one per row
+            features: Feature vector, or matrix with one row per document;
+                NaN marks a missing feature
+        """
+        if isinstance(doc_ids, str):
+            doc_ids = [doc_ids]
+        features = np.atleast_2d(np.asarray(features, dtype=np.float64))
+        if features.shape != (len(doc_ids), len(self.columns)):
+            raise ValueError(f"Expected {len(doc_ids)} rows of {len(self.columns)} features, "
+                             f"got shape {features.shape}")
+        self.remove([doc_id for doc_id in doc_ids if doc_id in self._rows])
+        self._reserve(len(doc_ids))
+        rows = np.arange(self._size, self._size + len(doc_ids))
+        self._vectors[rows] = features
+        self._active[rows] = True
+        self._size += len(doc_ids)
+        for doc_id, row in zip(doc_ids, rows.tolist()):
+            self.ids.append(doc_id)
+            self._rows[doc_id] = row
+
+    def add_results(self, doc_id: str, feature_groups: Dict[str, Dict[str, float]]) -> None:
+        """Add a document from the 'features' dictionary of an analysis result."""
+        self.add(doc_id, self.feature_row(feature_groups))
+
+    def remove(self, doc_ids: Iterable[str]) -> int:
+        """
+        Remove documents; unknown identifiers are ignored.
+
+        Returns:
+            Number of documents removed
+        """
+        removed = 0
+        for doc_id in doc_ids:
+            row = self._rows.pop(doc_id, None)
+            if row is not None:
+                self._active[row] = False
+                removed += 1
+        return removed
+
+    def query(self, features: Union[np.ndarray, Dict[str, Dict[str, float]]],
+              k: int = 10, exclude: Optional[str] = None) -> List[Tuple[str, float]]:
+        """
+        Find the documents closest in style.
+
+        Args:
+            features: Feature vector, or the 'features' dictionary of an analysis result
+            k: Number of neighbours
+            exclude: Identifier to leave out of the results (the query document)
+
+        Returns:
+            List of (document id, distance) pairs, closest first
+        """
+        if isinstance(features, dict):
+            features = self.feature_row(features)
+        features = np.asarray(features, dtype=np.float64).reshape(1, -1)
+        if features.shape[1] != len(self.columns):
+            raise ValueError(f"Expected {len(self.columns)} features, got {features.shape[1]}")
+        if not len(self):
+            return []
+        if self._needs_rebuild():
+            self.rebuild()
+        point = self._standardize(features)
+        wanted = k + (exclude is not None and exclude in self._rows)
+
+        candidates = self._candidates(point, wanted)
+        delta = np.arange(self._built, self._size)
+        rows = np.concatenate((candidates, delta[self._active[delta]]))
+        rows = rows[self._active[rows]]
+        if len(rows) < wanted:
+            # Too few LSH candidates: scan everything
+            rows = np.flatnonzero(self._active[:self._size])
+        distances = np.linalg.norm(self._standardize(self._vectors[rows]) - point, axis=1)
+        order = np.argsort(distances, kind='stable')
+        results = []
+        for row, distance in zip(rows[order].tolist(), distances[order].tolist()):
+            doc_id = self.ids[row]
+            if doc_id != exclude:
+                results.append((doc_id, distance))
+                if len(results) == k:
+                    break
+        return results
+
+    def query_id(self, doc_id: str, k: int = 10) -> List[Tuple[str, float]]:
+        """Find the documents closest in style to an indexed document."""
+        return self.query(self._vectors[self._rows[doc_id]], k, exclude=doc_id)
+
+    def rebuild(self) -> None:
+        """
+        Compact removed documents, refresh the standardization and rebuild
+        the tree or hash tables over every document.
+        """
+        active = np.flatnonzero(self._active[:self._size])
+        self._vectors = self._vectors[active].copy()
+        self.ids = [self.ids[row] for row in active.tolist()]
+        self._rows = {doc_id: row for row, doc_id in enumerate(self.ids)}
+        self._size = len(active)
+        self._active = np.ones(self._size, dtype=bool)
+        self._reset_build()
+        if not self._size:
+            return
+
+        with warnings.catch_warnings():
+            # Features missing from every document have a NaN mean
+            warnings.simplefilter('ignore', RuntimeWarning)
+            self._mean = np.nan_to_num(np.nanmean(self._vectors, axis=0))
+            scale = np.nan_to_num(np.nanstd(self._vectors, axis=0))
+        self._scale = np.where(scale > 0, scale, 1.0)
+        points = self._standardize(self._vectors)
+        if self._uses_lsh():
+            n_bits = max(1, min(62, int(math.log2(max(self._size / self.bucket_size, 1))) + 1))
+            rng = np.random.default_rng(self.random_state)
+            self._planes = rng.normal(size=(self.n_tables, len(self.columns), n_bits))
+            keys = self._lsh_keys(points)
+            self._lsh_order = np.argsort(keys, axis=0, kind='stable')
+            self._lsh_keys_sorted = np.take_along_axis(keys, self._lsh_order, axis=0)
+        else:
+            from sklearn.neighbors import BallTree, KDTree
+
+            tree_class = KDTree if len(self.columns) <= 15 else BallTree
+            self._tree = tree_class(points)
+        self._built = self._size
+
+    def feature_row(self, feature_groups: Dict[str, Dict[str, float]]) -> np.ndarray:
+        """Feature vector of an analysis result, NaN for missing features."""
+        merged = {}
+        for group in feature_groups.values():
+            merged.update(group)
+        return np.array([merged.get(name, np.nan) for name in self.columns], dtype=np.float64)
+
+    def save(self, path: str = DEFAULT_INDEX_PATH) -> None:
+        """Persist the index with joblib, writing to a temporary file first."""
+        import joblib
+
+        if self._needs_rebuild():
+            self.rebuild()
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        partial = path.with_suffix(path.suffix + '.tmp')
+        joblib.dump({'version': INDEX_VERSION, 'index': self}, partial)
+        partial.replace(path)
+
+    @classmethod
+    def load(cls, path: str = DEFAULT_INDEX_PATH) -> 'StyleSimilarityIndex':
+        """Load an index written by ``save``."""
+        import joblib
+
+        data = joblib.load(path)
+        if not isinstance(data, dict) or data.get('version') != INDEX_VERSION:
+            raise ValueError(f"Not a style similarity index (version {INDEX_VERSION}): {path}")
+        return data['index']
+
+    def _reset_build(self) -> None:
+        self._built = 0
+        self._mean = None
+        self._scale = None
+        self._tree = None
+        self._planes = None
+        self._lsh_order = None
+        self._lsh_keys_sorted = None
+
+    def _reserve(self, count: int) -> None:
+        """Grow the vector storage geometrically so appends are amortized O(1)."""
+        needed = self._size + count
+        if needed <= len(self._vectors):
+            return
+        capacity = max(needed, 2 * len(self._vectors), 64)
+        vectors = np.zeros((capacity, len(self.columns)), dtype=np.float64)
+        vectors[:self._size] = self._vectors[:self._size]
+        active = np.zeros(capacity, dtype=bool)
+        active[:self._size] = self._active[:self._size]
+        self._vectors, self._active = vectors, active
+
+    def _uses_lsh(self) -> bool:
+        return self.method == 'lsh' or (self.method == 'auto' and self._size > EXACT_LIMIT)
+
+    def _needs_rebuild(self) -> bool:
+        if not self._built:
+            return True
+        stale = (self._size - self._built) + (self._built - np.count_nonzero(self._active[:self._built]))
+        limit = min(max(REBUILD_FRACTION * self._built, MIN_STALE_ROWS), MAX_STALE_ROWS)
+        return stale > limit or self._uses_lsh() != (self._planes is not None)
+
+    def _standardize(self, features: np.ndarray) -> np.ndarray:
+        return np.nan_to_num((features - self._mean) / self._scale)
+
+    def _lsh_keys(self, points: np.ndarray) -> np.ndarray:
+        """Bucket key of every point in every table, shape (points, tables)."""
+        bits = np.einsum('nd,tdb->ntb', points, self._planes) > 0
+        weights = 1 << np.arange(bits.shape[2], dtype=np.int64)
+        return (bits * weights).sum(axis=2)
+
+    def _candidates(self, point: np.ndarray, k: int) -> np.ndarray:
+        """Built rows that may be among the ``k`` nearest neighbours of a point."""
+        if self._tree is not None:
+            removed = self._built - int(np.count_nonzero(self._active[:self._built]))
+            _, rows = self._tree.query(point, k=min(k + removed, self._built))
+            return rows[0]
+        keys = self._lsh_keys(point)[0]
+        rows = []
+        for table, key in enumerate(keys.tolist()):
+            column = self._lsh_keys_sorted[:, table]
+            start, end = np.searchsorted(column, key), np.searchsorted(column, key, side='right')
+            rows.append(self._lsh_order[start:end, table])
+        return np.unique(np.concatenate(rows))
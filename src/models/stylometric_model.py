@@ -1,21 +1,76 @@
 import numpy as np
-from typing import Dict, List, Any
+from bisect import bisect_left, bisect_right
+from typing import Dict, List, Any, Sequence
 import logging
-from sklearn.preprocessing import StandardScaler
-from sklearn.decomposition import PCA
-from sklearn.cluster import KMeans
-import pandas as pd
 
 logger = logging.getLogger(__name__)
 
+# Feature columns ``analyze_batch`` reads, in their default matrix order
+SCORING_COLUMNS = (
+    'vocabulary_richness', 'type_token_ratio', 'sentence_complexity',
+    'structure_consistency', 'flesch_reading_ease', 'gunning_fog'
+)
+
+# Score bands, as (thresholds, labels from lowest to highest band). Levels
+# start a band at its threshold (score < 0.3 is Low); the other bands start
+# just above it (score > 0.8 is the top band).
+LEVEL_BANDS = ((0.3, 0.7), ('Low', 'Medium', 'High'))
+VOCABULARY_USAGE_BANDS = ((0.3, 0.7), ('Basic', 'Moderate', 'Advanced'))
+SENTENCE_STRUCTURE_BANDS = ((0.3, 0.7), ('Simple', 'Varied', 'Complex'))
+TEXT_ORGANIZATION_BANDS = ((0.3, 0.7), ('Loosely Structured', 'Moderately Structured', 'Well Structured'))
+READABILITY_BANDS = ((0.2, 0.4, 0.6, 0.8), (
+    'Very Difficult to Read', 'Difficult to Read', 'Moderately Readable', 'Easy to Read', 'Very Easy to Read'
+))
+VOCABULARY_BANDS = ((0.2, 0.4, 0.6, 0.8), (
+    'Limited', 'Basic', 'Balanced', 'Sophisticated', 'Advanced and Diverse'
+))
+STRUCTURE_BANDS = ((0.2, 0.4, 0.6, 0.8), (
+    'Poorly Structured', 'Somewhat Disorganized', 'Moderately Structured',
+    'Clear and Organized', 'Well Structured and Balanced'
+))
+
+# Style classes, checked in order; complexity and consistency must be above
+# (>) or below (<) the given bounds. Anything else is 'Balanced'.
+STYLE_CLASSES = (
+    ('Academic', ('>', 0.7), ('>', 0.7)),
+    ('Simple and Structured', ('<', 0.3), ('>', 0.7)),
+    ('Complex and Variable', ('>', 0.7), ('<', 0.3)),
+)
+DEFAULT_STYLE = 'Balanced'
+
+# Label arrays of the categorical ``analyze_batch`` outputs
+CATEGORIES = {
+    'complexity_level': LEVEL_BANDS[1],
+    'consistency_level': LEVEL_BANDS[1],
+    'classification': tuple(name for name, _, _ in STYLE_CLASSES) + (DEFAULT_STYLE,),
+    'vocabulary_usage': VOCABULARY_USAGE_BANDS[1],
+    'sentence_structure': SENTENCE_STRUCTURE_BANDS[1],
+    'text_organization': TEXT_ORGANIZATION_BANDS[1],
+    'readability_interpretation': READABILITY_BANDS[1],
+    'vocabulary_interpretation': VOCABULARY_BANDS[1],
+    'structure_interpretation': STRUCTURE_BANDS[1],
+}
+
+
+def _band(score: float, bands, closed_below: bool = False) -> str:
+    """Label of the band a score falls in."""
+    thresholds, labels = bands
+    index = bisect_right(thresholds, score) if closed_below else bisect_left(thresholds, score)
+    return labels[index]
+
+
+def _band_codes(scores: np.ndarray, bands, closed_below: bool = False) -> np.ndarray:
+    """Vectorized ``_band``, as indices into the band labels."""
+    return np.digitize(scores, bands[0], right=not closed_below).astype(np.int8)
+
+
+def _compare(values, bound):
+    operator, threshold = bound
+    return values > threshold if operator == '>' else values < threshold
+
 class StylometricAnalyzer:
     """Analyzes stylometric features to identify writing patterns and style characteristics."""
     
-    def __init__(self):
-        self.scaler = StandardScaler()
-        self.pca = PCA(n_components=1)
-        self.kmeans = KMeans(n_clusters=3, random_state=42)
-        
     def analyze(
         self,
         lexical_features: Dict[str, float],
@@ -98,40 +153,125 @@ class StylometricAnalyzer:
             logger.error(f"Error in stylometric analysis: {str(e)}")
             return self._generate_error_response()
 
+    def analyze_batch(self, features: np.ndarray,
+                      columns: Sequence[str] = SCORING_COLUMNS) -> Dict[str, np.ndarray]:
+        """
+        Score many documents at once from a feature matrix.
+        
+        Computes the same scores, levels, classifications and
+        interpretations as ``analyze``, with array operations over all rows
+        instead of per-document dicts: bands are ``np.digitize`` over the
+        thresholds in ``*_BANDS`` and style classes an ``np.select`` over
+        ``STYLE_CLASSES``. Missing (NaN) features count as 0, like missing
+        keys in ``analyze``.
+        
+        Args:
+            features: Matrix of shape (documents, columns)
+            columns: Feature name of every matrix column; must include all
+                ``SCORING_COLUMNS`` and may hold others, which are ignored
+            
+        Returns:
+            Dictionary of per-document arrays: unrounded float scores
+            ('complexity_score', 'consistency_score', 'readability_score',
+            'vocabulary_score', 'structure_score') and int8 label codes
+            for every key of ``CATEGORIES`` (see ``labels``)
+        """
+        features = np.asarray(features, dtype=np.float64)
+        if features.ndim != 2 or features.shape[1] != len(columns):
+            raise ValueError(f"Expected a matrix with {len(columns)} columns, got shape {features.shape}")
+        missing = [name for name in SCORING_COLUMNS if name not in columns]
+        if missing:
+            raise ValueError(f"Feature matrix lacks scoring columns: {missing}")
+        column = {name: np.nan_to_num(features[:, list(columns).index(name)]) for name in SCORING_COLUMNS}
+        
+        richness = column['vocabulary_richness']
+        sentence_complexity = column['sentence_complexity']
+        consistency_score = column['structure_consistency']
+        complexity_score = richness * 0.4 + sentence_complexity * 0.4 + column['gunning_fog'] / 20 * 0.2
+        
+        norm_flesch = np.clip(column['flesch_reading_ease'], 0, 100) / 100
+        norm_fog = np.clip(20 - column['gunning_fog'], 0, 14) / 14
+        readability_score = (norm_flesch + norm_fog) / 2
+        vocabulary_score = (richness + column['type_token_ratio']) / 2
+        structure_score = (consistency_score + (1 - sentence_complexity / 100)) / 2
+        
+        classification = np.select(
+            [_compare(complexity_score, complexity) & _compare(consistency_score, consistency)
+             for _, complexity, consistency in STYLE_CLASSES],
+            np.arange(len(STYLE_CLASSES)),
+            default=len(STYLE_CLASSES)
+        ).astype(np.int8)
+        
+        return {
+            'complexity_score': complexity_score,
+            'consistency_score': consistency_score,
+            'readability_score': readability_score,
+            'vocabulary_score': vocabulary_score,
+            'structure_score': structure_score,
+            'complexity_level': _band_codes(complexity_score, LEVEL_BANDS, closed_below=True),
+            'consistency_level': _band_codes(consistency_score, LEVEL_BANDS, closed_below=True),
+            'classification': classification,
+            'vocabulary_usage': _band_codes(richness, VOCABULARY_USAGE_BANDS),
+            'sentence_structure': _band_codes(sentence_complexity, SENTENCE_STRUCTURE_BANDS),
+            'text_organization': _band_codes(consistency_score, TEXT_ORGANIZATION_BANDS),
+            'readability_interpretation': _band_codes(readability_score, READABILITY_BANDS),
+            'vocabulary_interpretation': _band_codes(vocabulary_score, VOCABULARY_BANDS),
+            'structure_interpretation': _band_codes(structure_score, STRUCTURE_BANDS)
+        }
+    
+    @staticmethod
+    def labels(name: str, codes: np.ndarray) -> np.ndarray:
+        """
+        Decode label codes returned by ``analyze_batch``.
+        
+        Args:
+            name: Output name, a key of ``CATEGORIES``
+            codes: Label codes
+            
+        Returns:
+            Array of label strings
+        """
+        return np.asarray(CATEGORIES[name])[codes]
+    
+    @staticmethod
+    def feature_row(*feature_groups: Dict[str, float],
+                    columns: Sequence[str] = SCORING_COLUMNS) -> np.ndarray:
+        """
+        Build a feature matrix row from feature dictionaries.
+        
+        Args:
+            feature_groups: Lexical, syntactic, structural and readability
+                feature dictionaries (any subset, in any order)
+            columns: Column order of the row
+            
+        Returns:
+            Row with NaN for features missing from every group
+        """
+        merged = {}
+        for group in feature_groups:
+            merged.update(group)
+        return np.array([merged.get(name, np.nan) for name in columns], dtype=np.float64)
+
     def _get_level(self, score: float) -> str:
-        if score < 0.3: return "Low"
-        if score < 0.7: return "Medium"
-        return "High"
+        return _band(score, LEVEL_BANDS, closed_below=True)
 
     def _classify_style(self, complexity: float, consistency: float) -> str:
-        if complexity > 0.7 and consistency > 0.7:
-            return "Academic"
-        if complexity < 0.3 and consistency > 0.7:
-            return "Simple and Structured"
-        if complexity > 0.7 and consistency < 0.3:
-            return "Complex and Variable"
-        return "Balanced"
+        for name, complexity_bound, consistency_bound in STYLE_CLASSES:
+            if _compare(complexity, complexity_bound) and _compare(consistency, consistency_bound):
+                return name
+        return DEFAULT_STYLE
         
     def _analyze_vocabulary(self, lexical_features: Dict[str, float]) -> str:
         """Categorize vocabulary usage patterns."""
-        richness = lexical_features.get('vocabulary_richness', 0)
-        if richness > 0.7: return "Advanced"
-        if richness > 0.3: return "Moderate"
-        return "Basic"
+        return _band(lexical_features.get('vocabulary_richness', 0), VOCABULARY_USAGE_BANDS)
         
     def _analyze_sentences(self, syntactic_features: Dict[str, float]) -> str:
         """Categorize sentence structure patterns."""
-        complexity = syntactic_features.get('sentence_complexity', 0)
-        if complexity > 0.7: return "Complex"
-        if complexity > 0.3: return "Varied"
-        return "Simple"
+        return _band(syntactic_features.get('sentence_complexity', 0), SENTENCE_STRUCTURE_BANDS)
         
     def _analyze_organization(self, structural_features: Dict[str, float]) -> str:
         """Categorize text organization patterns."""
-        consistency = structural_features.get('structure_consistency', 0)
-        if consistency > 0.7: return "Well Structured"
-        if consistency > 0.3: return "Moderately Structured"
-        return "Loosely Structured"
+        return _band(structural_features.get('structure_consistency', 0), TEXT_ORGANIZATION_BANDS)
 
     def _calculate_readability_score(self, metrics: Dict[str, float]) -> float:
         """Calculate normalized readability score."""
@@ -156,25 +296,13 @@ class StylometricAnalyzer:
         return (consistency + (1 - complexity)) / 2
 
     def _interpret_readability(self, score: float) -> str:
-        if score > 0.8: return "Very Easy to Read"
-        if score > 0.6: return "Easy to Read"
-        if score > 0.4: return "Moderately Readable"
-        if score > 0.2: return "Difficult to Read"
-        return "Very Difficult to Read"
+        return _band(score, READABILITY_BANDS)
 
     def _interpret_vocabulary(self, score: float) -> str:
-        if score > 0.8: return "Advanced and Diverse"
-        if score > 0.6: return "Sophisticated"
-        if score > 0.4: return "Balanced"
-        if score > 0.2: return "Basic"
-        return "Limited"
+        return _band(score, VOCABULARY_BANDS)
 
     def _interpret_structure(self, score: float) -> str:
-        if score > 0.8: return "Well Structured and Balanced"
-        if score > 0.6: return "Clear and Organized"
-        if score > 0.4: return "Moderately Structured"
-        if score > 0.2: return "Somewhat Disorganized"
-        return "Poorly Structured"
+        return _band(score, STRUCTURE_BANDS)
 
     def _generate_recommendations(self, readability: float, vocabulary: float, 
                                 structure: float, complexity: float, consistency: float) -> List[str]:
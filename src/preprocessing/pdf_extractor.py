@@ -1,50 +1,402 @@
-import pdfplumber
 import logging
-from typing import Optional, List
+import hashlib
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Iterator, Optional, List, Sequence, Tuple
 from pathlib import Path
 
 logger = logging.getLogger(__name__)
 
+STRATEGIES = ('layout', 'fast')
+
+# Glyphs pdfminer/PyPDF2 emit when a font has no usable Unicode mapping
+_BROKEN_GLYPH_PATTERN = re.compile(r'\(cid:\d+\)|\ufffd')
+
+
+def _looks_broken(text: str, min_chars: int, max_broken_ratio: float = 0.01,
+                  min_space_ratio: float = 0.05) -> bool:
+    """
+    Decide whether text from the fast backend is unusable.
+
+    The text is considered broken when it is empty or shorter than
+    ``min_chars`` non-whitespace characters, contains too many unmapped
+    glyphs, or has so little whitespace that words have been run together.
+    """
+    if not text:
+        return True
+    content_chars = len(text) - sum(1 for char in text if char.isspace())
+    if content_chars < min_chars:
+        return True
+    broken = sum(len(match) for match in _BROKEN_GLYPH_PATTERN.findall(text))
+    if broken / len(text) > max_broken_ratio:
+        return True
+    return (len(text) - content_chars) / len(text) < min_space_ratio
+
+
+def _has_text_layer(page) -> bool:
+    """Check whether a PyPDF2 page declares fonts or form XObjects that may draw text."""
+    resources = page.get('/Resources')
+    if resources is None:
+        return False
+    resources = resources.get_object()
+    if '/Font' in resources:
+        return True
+    xobjects = resources.get('/XObject')
+    if xobjects is None:
+        return False
+    return any(
+        xobject.get_object().get('/Subtype') == '/Form'
+        for xobject in xobjects.get_object().values()
+    )
+
+
+def _iter_layout_pages(pdf_path: str, page_numbers: Optional[Sequence[int]] = None,
+                       pdf=None) -> Iterator[Tuple[int, str, Dict[str, Any]]]:
+    """
+    Extract pages with pdfplumber's layout-aware extraction.
+
+    Each page's parsed layout objects are released as soon as its text
+    has been extracted.
+
+    Args:
+        pdf_path: Path to the PDF file
+        page_numbers: 1-based page numbers to extract (all pages if omitted)
+        pdf: The file already opened with pdfplumber (opened and closed
+            here if omitted)
+
+    Yields:
+        Tuples of (page_number, text, report) with 1-based page numbers
+    """
+    if pdf is None:
+        import pdfplumber
+
+        pages = list(page_numbers) if page_numbers is not None else None
+        with pdfplumber.open(pdf_path, pages=pages) as pdf:
+            yield from _extract_layout_pages(pdf.pages)
+        return
+    pages = pdf.pages
+    yield from _extract_layout_pages(
+        pages if page_numbers is None else [pages[page_number - 1] for page_number in page_numbers]
+    )
+
+
+def _extract_layout_pages(pages) -> Iterator[Tuple[int, str, Dict[str, Any]]]:
+    """Extract already opened pdfplumber pages, releasing each once its text is read."""
+    for page in pages:
+        text = page.extract_text() or ''
+        page.close()  # Drop cached chars, layout and text map
+        yield page.page_number, text, {
+            'page': page.page_number, 'tier': 'layout', 'chars': len(text)
+        }
+
+
+def _iter_fast_pages(pdf_path: str, page_numbers: Optional[Sequence[int]] = None,
+                     min_chars: int = 20, reader=None) -> Iterator[Tuple[int, str, Dict[str, Any]]]:
+    """
+    Extract pages with PyPDF2, triaging each page first.
+
+    Pages without a text layer are skipped outright. Pages whose fast
+    result looks broken are re-extracted with pdfplumber.
+
+    Args:
+        pdf_path: Path to the PDF file
+        page_numbers: 1-based page numbers to extract (all pages if omitted)
+        min_chars: Minimum non-whitespace characters for a usable fast result
+        reader: The file already opened with PyPDF2 (opened here if omitted)
+
+    Yields:
+        Tuples of (page_number, text, report) with 1-based page numbers
+    """
+    if reader is None:
+        from PyPDF2 import PdfReader
+        reader = PdfReader(pdf_path)
+    if page_numbers is None:
+        page_numbers = range(1, len(reader.pages) + 1)
+    layout_pdf = None
+    try:
+        for page_number in page_numbers:
+            index = page_number - 1
+            page = reader.pages[index]
+            report = {'page': page_number, 'has_text_layer': _has_text_layer(page)}
+
+            if not report['has_text_layer']:
+                report.update(tier='empty', chars=0)
+                yield page_number, '', report
+                continue
+
+            try:
+                text = page.extract_text() or ''
+            except Exception as e:
+                logger.debug(f"Fast extraction failed on page {page_number}: {str(e)}")
+                text = ''
+            report['fast_chars'] = len(text)
+
+            if _looks_broken(text, min_chars):
+                if layout_pdf is None:
+                    import pdfplumber
+                    layout_pdf = pdfplumber.open(pdf_path)
+                layout_page = layout_pdf.pages[index]
+                text = layout_page.extract_text() or ''
+                layout_page.close()
+                report['tier'] = 'layout'
+            else:
+                report['tier'] = 'fast'
+
+            report['chars'] = len(text)
+            yield page_number, text, report
+    finally:
+        if layout_pdf is not None:
+            layout_pdf.close()
+
+
+def _extract_page_range(pdf_path: str, start: int, end: int, strategy: str = 'layout',
+                        min_chars: int = 20) -> List[Tuple[str, Dict[str, Any]]]:
+    """
+    Extract the text of pages ``start`` to ``end`` (0-based, end exclusive).
+
+    Runs inside a worker process, so it opens the file independently and
+    only builds the pages it was asked for.
+    """
+    page_numbers = range(start + 1, end + 1)
+    if strategy == 'fast':
+        pages = _iter_fast_pages(pdf_path, page_numbers, min_chars)
+    else:
+        pages = _iter_layout_pages(pdf_path, page_numbers)
+    return [(text, report) for _, text, report in pages]
+
+
 class PDFExtractor:
     """Handles the extraction of text from PDF documents."""
-    
-    def __init__(self):
+
+    # Bump whenever a change alters the extracted text, so cached
+    # extractions produced by older code are not reused
+    VERSION = "3"
+
+    def __init__(self, max_workers: Optional[int] = None, chunk_size: int = 8,
+                 parallel_threshold: int = 32, strategy: str = 'layout',
+                 min_fast_chars: int = 20):
+        """
+        Args:
+            max_workers: Number of worker processes for parallel extraction
+                (defaults to the CPU count; 1 disables parallel extraction)
+            chunk_size: Number of consecutive pages handed to each worker task
+            parallel_threshold: Minimum page count before extraction is
+                fanned out to the process pool
+            strategy: 'layout' extracts every page with pdfplumber; 'fast'
+                triages each page and extracts with PyPDF2, falling back to
+                pdfplumber only for pages whose fast text looks broken
+            min_fast_chars: Minimum non-whitespace characters a fast
+                extraction must yield on a page with a text layer
+        """
+        if strategy not in STRATEGIES:
+            raise ValueError(f"Unknown extraction strategy: {strategy}")
         self.supported_languages = ['en']  # Add more languages as needed
-        self._pages = []  # Store pages for later use
-        
+        self.max_workers = max_workers if max_workers is not None else (os.cpu_count() or 1)
+        self.chunk_size = max(1, chunk_size)
+        self.parallel_threshold = parallel_threshold
+        self.strategy = strategy
+        self.min_fast_chars = min_fast_chars
+        self._page_count = 0  # Page count of the last processed PDF
+        self._report = []  # Per-page extraction report of the last processed PDF
+
+    @property
+    def cache_version(self) -> str:
+        """Version string identifying the text this extractor produces."""
+        return f"{self.VERSION}-{self.strategy}"
+
     def extract_text(self, pdf_path: str) -> str:
         """
         Extract text content from a PDF file.
-        
+
+        Long documents are split into page ranges that are extracted in
+        parallel and reassembled in page order; short documents are read
+        serially.
+
         Args:
             pdf_path: Path to the PDF file
-            
+
         Returns:
             Extracted text as a string
         """
+        return self.join_pages(self.extract_pages(pdf_path))
+
+    def extract_pages(self, pdf_path: str) -> List[str]:
+        """
+        Extract the text of every page of a PDF file.
+
+        Args:
+            pdf_path: Path to the PDF file
+
+        Returns:
+            List of page texts in page order (empty string for pages without text)
+        """
         if not Path(pdf_path).exists():
             raise FileNotFoundError(f"PDF file not found: {pdf_path}")
-            
+
         try:
-            extracted_text = []
-            with pdfplumber.open(pdf_path) as pdf:
-                self._pages = pdf.pages  # Store pages
-                for page in pdf.pages:
-                    text = page.extract_text()
-                    if text:
-                        extracted_text.append(text)
-            
-            return '\n'.join(extracted_text)
-            
+            if self.max_workers <= 1:
+                return [text for _, text in self.iter_pages(pdf_path)]
+
+            # Count the pages and, for short documents, extract them from one open file
+            document = self._open(str(pdf_path))
+            try:
+                page_count = len(document.pages)
+                if not self._should_parallelize(page_count):
+                    return [text for _, text in self.iter_pages(pdf_path, document=document)]
+            finally:
+                if hasattr(document, 'close'):
+                    document.close()
+            return self._extract_parallel(str(pdf_path), page_count)
+
         except Exception as e:
             logger.error(f"Error extracting text from PDF: {str(e)}")
             raise
 
-    def get_page_count(self) -> List[str]:
+    @staticmethod
+    def join_pages(pages: List[str]) -> str:
+        """Join page texts into a single document string, skipping empty pages."""
+        return '\n'.join(text for text in pages if text)
+
+    def iter_pages(self, pdf_path: str, page_numbers: Optional[Sequence[int]] = None,
+                   document=None) -> Iterator[Tuple[int, str]]:
         """
-        Get the list of pages from the last processed PDF.
-        
+        Stream the text of a PDF one page at a time.
+
+        Each page's parsed layout objects are released as soon as its text
+        has been extracted, so memory use does not grow with the page count.
+        When the whole document is streamed, the page count is available
+        from ``get_page_count`` once the generator has been exhausted.
+
+        Args:
+            pdf_path: Path to the PDF file
+            page_numbers: 1-based page numbers to extract (all pages if omitted)
+            document: The file already opened by this extractor's backend
+                (PyPDF2 for the fast strategy, pdfplumber otherwise), reused
+                instead of opening it again; the caller closes it
+
+        Yields:
+            Tuples of (page_number, text) with 1-based page numbers
+        """
+        if not Path(pdf_path).exists():
+            raise FileNotFoundError(f"PDF file not found: {pdf_path}")
+
+        try:
+            if self.strategy == 'fast':
+                pages = _iter_fast_pages(str(pdf_path), page_numbers, self.min_fast_chars, document)
+            else:
+                pages = _iter_layout_pages(str(pdf_path), page_numbers, document)
+
+            self._report = []
+            for page_number, text, report in pages:
+                self._report.append(report)
+                yield page_number, text
+            if page_numbers is None:
+                self._page_count = len(self._report)
+
+        except Exception as e:
+            logger.error(f"Error extracting text from PDF: {str(e)}")
+            raise
+
+    def page_fingerprints(self, pdf_path: str) -> List[str]:
+        """
+        Fingerprint every page of a PDF without extracting its text.
+
+        A fingerprint hashes the page's decoded content stream together with
+        the fonts it references, so it changes whenever the text drawn on
+        the page can change, but survives re-saving the document.
+
+        Args:
+            pdf_path: Path to the PDF file
+
+        Returns:
+            List of hex digests in page order
+        """
+        from PyPDF2 import PdfReader
+
+        if not Path(pdf_path).exists():
+            raise FileNotFoundError(f"PDF file not found: {pdf_path}")
+
+        fingerprints = []
+        for page in PdfReader(str(pdf_path)).pages:
+            digest = hashlib.sha256()
+            contents = page.get_contents()
+            if contents is not None:
+                digest.update(contents.get_data())
+            resources = page.get('/Resources')
+            fonts = resources.get_object().get('/Font') if resources is not None else None
+            if fonts is not None:
+                for name, font in sorted(fonts.get_object().items()):
+                    base_font = font.get_object().get('/BaseFont', '')
+                    digest.update(f"\0{name}={base_font}".encode('utf-8'))
+            fingerprints.append(digest.hexdigest())
+        return fingerprints
+
+    def _open(self, pdf_path: str):
+        """Open a PDF with the backend of the extraction strategy."""
+        if self.strategy == 'fast':
+            from PyPDF2 import PdfReader
+            return PdfReader(pdf_path)
+        import pdfplumber
+        return pdfplumber.open(pdf_path)
+
+    def _should_parallelize(self, page_count: int) -> bool:
+        """Decide whether a document is long enough to use the process pool."""
+        return (
+            self.max_workers > 1
+            and page_count >= self.parallel_threshold
+            and page_count > self.chunk_size
+        )
+
+    def _extract_parallel(self, pdf_path: str, page_count: int) -> List[str]:
+        """
+        Extract page texts using a process pool.
+
+        Args:
+            pdf_path: Path to the PDF file
+            page_count: Total number of pages in the document
+
+        Returns:
+            List of page texts in page order
+        """
+        starts = list(range(0, page_count, self.chunk_size))
+        ends = [min(start + self.chunk_size, page_count) for start in starts]
+        workers = min(self.max_workers, len(starts))
+        count = len(starts)
+
+        logger.debug(f"Extracting {page_count} pages with {workers} workers")
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            # map() yields results in submission order, so pages stay ordered
+            chunks = executor.map(
+                _extract_page_range, [pdf_path] * count, starts, ends,
+                [self.strategy] * count, [self.min_fast_chars] * count
+            )
+            results = [result for chunk in chunks for result in chunk]
+
+        self._report = [report for _, report in results]
+        self._page_count = page_count
+        return [text for text, _ in results]
+
+    def get_page_count(self) -> int:
+        """
+        Get the number of pages in the last processed PDF.
+
+        Returns:
+            Page count
+        """
+        return self._page_count
+
+    def get_extraction_report(self) -> List[Dict[str, Any]]:
+        """
+        Get the per-page extraction report of the last processed PDF.
+
+        Each entry records the page number, the tier that produced its text
+        ('fast', 'layout' or 'empty' for pages without a text layer) and the
+        number of characters extracted. The fast strategy also records
+        whether a text layer was found and how many characters PyPDF2
+        returned before any fallback.
+
         Returns:
-            List of pages
+            List of per-page report dictionaries in page order
         """
-        return self._pages
\ No newline at end of file
+        return self._report
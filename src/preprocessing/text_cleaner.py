@@ -1,24 +1,97 @@
 import re
-import nltk
-from typing import List
+from typing import Dict, List, Optional, Set
 import logging
 
 logger = logging.getLogger(__name__)
 
+# NLTK resources used by the cleaner, mapped to their paths in nltk_data.
+# They are never fetched implicitly; run ``stilo bootstrap`` once per machine.
+NLTK_RESOURCES: Dict[str, str] = {
+    'punkt': 'tokenizers/punkt',
+    'punkt_tab': 'tokenizers/punkt_tab',
+    'stopwords': 'corpora/stopwords',
+    'averaged_perceptron_tagger': 'taggers/averaged_perceptron_tagger',
+    'cmudict': 'corpora/cmudict'
+}
+
+
+def _required_resources() -> List[str]:
+    """Resources needed by the installed NLTK version."""
+    import nltk
+
+    names = ['punkt', 'stopwords', 'averaged_perceptron_tagger', 'cmudict']
+    if hasattr(nltk.tokenize, 'PunktTokenizer'):
+        # NLTK 3.8.2+ loads the sentence tokenizer from the punkt_tab tables
+        names.insert(1, 'punkt_tab')
+    return names
+
+
+def require_nltk_resource(name: str) -> None:
+    """
+    Check that an NLTK resource is installed locally, without network access.
+
+    Args:
+        name: Key of ``NLTK_RESOURCES``
+
+    Raises:
+        LookupError: If the resource has not been downloaded
+    """
+    import nltk
+
+    try:
+        nltk.data.find(NLTK_RESOURCES[name])
+    except LookupError:
+        raise LookupError(
+            f"NLTK resource '{name}' is not installed. Run 'stilo bootstrap' once "
+            f"on a machine with network access (or copy its nltk_data directory)."
+        ) from None
+
+
+def bootstrap_nltk_resources(download_dir: Optional[str] = None) -> List[str]:
+    """
+    Download the NLTK resources that are not installed yet.
+
+    Args:
+        download_dir: Target nltk_data directory (NLTK's default if omitted)
+
+    Returns:
+        Names of the resources that were downloaded
+    """
+    import nltk
+
+    downloaded = []
+    for name in _required_resources():
+        try:
+            require_nltk_resource(name)
+        except LookupError:
+            if not nltk.download(name, download_dir=download_dir, quiet=True, raise_on_error=True):
+                raise RuntimeError(f"Could not download NLTK resource '{name}'")
+            downloaded.append(name)
+    return downloaded
+
+
 class TextCleaner:
     """Handles text preprocessing and cleaning operations."""
     
     def __init__(self):
-        # Download required NLTK data
-        try:
-            nltk.download('punkt')
-            nltk.download('stopwords')
-            nltk.download('averaged_perceptron_tagger')
-        except Exception as e:
-            logger.error(f"Error downloading NLTK data: {str(e)}")
-            raise
-            
-        self.stopwords = set(nltk.corpus.stopwords.words('english'))
+        # NLTK data is loaded on first use, so cleaning works offline
+        self._stopwords: Optional[Set[str]] = None
+
+    @property
+    def stopwords(self) -> Set[str]:
+        """English stopwords, loaded from the local NLTK data on first access."""
+        if self._stopwords is None:
+            require_nltk_resource('stopwords')
+            from nltk.corpus import stopwords
+            self._stopwords = set(stopwords.words('english'))
+        return self._stopwords
+
+    @staticmethod
+    def _require_tokenizer() -> None:
+        """Check that the punkt tokenizer data is installed."""
+        for name in _required_resources():
+            if name.startswith('punkt'):
+                require_nltk_resource(name)
         
     def clean(self, text: str) -> str:
         """
@@ -51,6 +124,9 @@ class TextCleaner:
         Returns:
             List of sentences
         """
+        import nltk
+
+        self._require_tokenizer()
         return nltk.sent_tokenize(text)
         
     def get_words(self, text: str) -> List[str]:
@@ -63,4 +139,7 @@ class TextCleaner:
         Returns:
             List of words
         """
+        import nltk
+
+        self._require_tokenizer()
         return nltk.word_tokenize(text) 
\ No newline at end of file
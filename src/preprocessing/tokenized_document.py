@@ -0,0 +1,289 @@
+import logging
+import re
+from typing import List, Optional, Tuple
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Character class bit flags
+WORD = 1         # Matches the regex class \w
+SPACE = 2        # str.isspace(), also the regex class \s
+NEWLINE = 4      # '\n'
+TERMINATOR = 8   # Sentence-ending punctuation: . ! ?
+ALNUM = 16       # str.isalnum()
+
+
+def _char_flags(char: str) -> int:
+    """Compute the class flags of a single character."""
+    flags = 0
+    if char.isalnum() or char == '_':
+        flags |= WORD
+    if char.isspace():
+        flags |= SPACE
+    if char == '\n':
+        flags |= NEWLINE
+    if char in '.!?':
+        flags |= TERMINATOR
+    if char.isalnum():
+        flags |= ALNUM
+    return flags
+
+
+_WORD_PATTERN = re.compile(r'\w+')
+
+_ASCII_FLAGS = np.array([_char_flags(chr(code)) for code in range(128)], dtype=np.uint8)
+
+_ASCII_LOWER = np.arange(128, dtype=np.uint8)
+_ASCII_LOWER[ord('A'):ord('Z') + 1] += ord('a') - ord('A')
+
+
+def _runs(mask: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Start and end offsets of every run of True values in a boolean mask."""
+    edges = np.diff(mask.astype(np.int8), prepend=np.int8(0), append=np.int8(0))
+    return np.flatnonzero(edges == 1), np.flatnonzero(edges == -1)
+
+
+class TokenizedDocument:
+    """
+    A text tokenized once and shared by every feature extractor.
+
+    All boundaries are computed in one vectorized pass over the text's code
+    points and stored as integer offset arrays: word spans (regex ``\\w+``),
+    whitespace-delimited token spans (``str.split``), sentence separators
+    and paragraph breaks, plus character class counts. Extractors slice the
+    original string only where they need the actual words.
+    """
+
+    def __init__(self, text: str):
+        self.text = text
+        self.codes = self._code_points(text)
+        self.flags = self._classify(self.codes)
+        flags = self.flags
+
+        is_space = (flags & SPACE).astype(bool)
+        is_terminator = (flags & TERMINATOR).astype(bool)
+
+        # Character class counts
+        self.length = len(text)
+        self.whitespace_count = int(np.count_nonzero(is_space))
+        self.newline_count = int(np.count_nonzero(flags & NEWLINE))
+        self.space_count = int(np.count_nonzero(self.codes == ord(' ')))
+        self.alnum_count = int(np.count_nonzero(flags & ALNUM))
+        self.punctuation_count = self.length - self.alnum_count - self.whitespace_count
+
+        # Token boundaries
+        self.word_starts, self.word_ends = _runs((flags & WORD).astype(bool))
+        self.token_starts, self.token_ends = _runs(~is_space)
+        self._content = np.flatnonzero(~is_space)
+
+        # Sentence separators: every run of terminators, and the runs that are
+        # followed by whitespace or the end of the text
+        self.terminator_starts, self.terminator_ends = _runs(is_terminator)
+        followed_by_space = np.ones(len(self.terminator_ends), dtype=bool)
+        inner = self.terminator_ends < self.length
+        followed_by_space[inner] = is_space[self.terminator_ends[inner]]
+        self.sentence_end_starts = self.terminator_starts[followed_by_space]
+        self.sentence_end_ends = self.terminator_ends[followed_by_space]
+
+        self.paragraph_lengths = self._paragraph_lengths(is_space)
+
+    @staticmethod
+    def _code_points(text: str) -> np.ndarray:
+        """View the text as an array of code points."""
+        if text.isascii():
+            return np.frombuffer(text.encode('ascii'), dtype=np.uint8)
+        return np.frombuffer(text.encode('utf-32-le'), dtype=np.uint32)
+
+    @staticmethod
+    def _classify(codes: np.ndarray) -> np.ndarray:
+        """Map code points to class flags, with a lookup table for ASCII."""
+        if codes.dtype == np.uint8:
+            return _ASCII_FLAGS[codes]
+        flags = np.empty(len(codes), dtype=np.uint8)
+        ascii_mask = codes < 128
+        flags[ascii_mask] = _ASCII_FLAGS[codes[ascii_mask]]
+        others = codes[~ascii_mask]
+        if len(others):
+            unique, inverse = np.unique(others, return_inverse=True)
+            unique_flags = np.array([_char_flags(chr(code)) for code in unique], dtype=np.uint8)
+            flags[~ascii_mask] = unique_flags[inverse]
+        return flags
+
+    def _paragraph_lengths(self, is_space: np.ndarray) -> np.ndarray:
+        """
+        Lengths of the paragraphs ``re.split(r'\\n\\s*\\n', text.strip())`` returns.
+
+        A paragraph break spans from the first to the last newline of a
+        whitespace run containing at least two newlines.
+        """
+        if not len(self._content):
+            return np.zeros(1, dtype=np.int64)
+        core_start, core_end = self._content[0], self._content[-1] + 1
+
+        run_starts, run_ends = _runs(is_space)
+        inside = (run_starts > core_start) & (run_ends < core_end)
+        run_starts, run_ends = run_starts[inside], run_ends[inside]
+
+        newlines = np.flatnonzero(self.flags & NEWLINE)
+        first = np.searchsorted(newlines, run_starts)
+        last = np.searchsorted(newlines, run_ends)
+        is_break = last - first >= 2
+        break_starts = newlines[first[is_break]]
+        break_ends = newlines[last[is_break] - 1] + 1
+
+        starts = np.concatenate(([core_start], break_ends))
+        ends = np.concatenate((break_starts, [core_end]))
+        return (ends - starts).astype(np.int64)
+
+    def segments(self, separator_starts: np.ndarray,
+                 separator_ends: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Boundaries of the segments ``re.split`` would produce for the given separators.
+
+        Returns:
+            Arrays of segment start and end offsets
+        """
+        starts = np.concatenate(([0], separator_ends))
+        ends = np.concatenate((separator_starts, [self.length]))
+        return starts, ends
+
+    def surrounding_whitespace(self, starts: np.ndarray,
+                               ends: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Leading and trailing whitespace of text spans.
+
+        Args:
+            starts: Span start offsets
+            ends: Span end offsets
+
+        Returns:
+            Arrays of leading and trailing whitespace lengths; both equal the
+            span length for whitespace-only spans
+        """
+        starts = np.asarray(starts, dtype=np.int64)
+        ends = np.asarray(ends, dtype=np.int64)
+        first = np.searchsorted(self._content, starts)
+        last = np.searchsorted(self._content, ends)
+        leading = ends - starts
+        trailing = leading.copy()
+        non_empty = last > first
+        leading[non_empty] = self._content[first[non_empty]] - starts[non_empty]
+        trailing[non_empty] = ends[non_empty] - self._content[last[non_empty] - 1] - 1
+        return leading, trailing
+
+    def stripped_lengths(self, starts: np.ndarray, ends: np.ndarray) -> np.ndarray:
+        """
+        Lengths of text spans after ``str.strip()``.
+
+        Args:
+            starts: Span start offsets
+            ends: Span end offsets
+
+        Returns:
+            Stripped length of every span (0 for whitespace-only spans)
+        """
+        leading, trailing = self.surrounding_whitespace(starts, ends)
+        lengths = np.asarray(ends, dtype=np.int64) - np.asarray(starts, dtype=np.int64)
+        return np.where(leading < lengths, lengths - leading - trailing, 0)
+
+    def words(self, lowercase: bool = False) -> List[str]:
+        """
+        Words as matched by the regex ``\\b\\w+\\b``.
+
+        Args:
+            lowercase: Lowercase the words
+
+        Returns:
+            List of words in text order
+        """
+        text = self.text
+        words = [text[start:end] for start, end in zip(self.word_starts.tolist(), self.word_ends.tolist())]
+        if not lowercase:
+            return words
+        if self.codes.dtype == np.uint8:
+            return [word.lower() for word in words]
+        # Lowercasing can insert combining marks (U+0130 becomes 'i' plus a
+        # dot), which split a word the way matching the lowered text would
+        lowered = []
+        for word in words:
+            lower = word.lower()
+            if len(lower) == len(word):
+                lowered.append(lower)
+            else:
+                lowered.extend(_WORD_PATTERN.findall(lower))
+        return lowered
+
+    def tokens(self) -> List[str]:
+        """Whitespace-delimited tokens, as returned by ``str.split()``."""
+        text = self.text
+        return [text[start:end] for start, end in zip(self.token_starts.tolist(), self.token_ends.tolist())]
+
+    def token_cores(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Alphanumeric cores of the tokens: each token without its leading
+        and trailing non-alphanumeric characters ("(don't!)" -> "don't").
+
+        Returns:
+            Tuple of (indices of the tokens that have a core, core start
+            offsets, core end offsets)
+        """
+        starts, ends = self.token_starts, self.token_ends
+        alnum = np.flatnonzero(self.flags & ALNUM)
+        first = np.searchsorted(alnum, starts)
+        after = np.searchsorted(alnum, ends)
+        has_core = first < after
+        return np.flatnonzero(has_core), alnum[first[has_core]], alnum[after[has_core] - 1] + 1
+
+    def lowercase_codes(self) -> Optional[np.ndarray]:
+        """
+        Code points of ``text.lower()``, aligned with ``codes``.
+
+        Returns:
+            Lowercased code points, or None if lowercasing changes the length
+            of the text (U+0130 lowercases to two code points)
+        """
+        codes = self.codes
+        if codes.dtype == np.uint8:
+            return _ASCII_LOWER[codes]
+        lowered = codes.copy()
+        ascii_mask = codes < 128
+        lowered[ascii_mask] = _ASCII_LOWER[codes[ascii_mask]]
+        others = codes[~ascii_mask]
+        if len(others):
+            unique, inverse = np.unique(others, return_inverse=True)
+            lower_chars = [chr(code).lower() for code in unique.tolist()]
+            if any(len(char) != 1 for char in lower_chars):
+                return None
+            lower_codes = np.array([ord(char) for char in lower_chars], dtype=np.uint32)
+            lowered[~ascii_mask] = lower_codes[inverse.ravel()]
+        return lowered
+
+    def character_counts(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Distinct code points of the text and how often each occurs.
+
+        ASCII code points are counted with a single ``np.bincount``; other
+        code points, if any, with ``np.unique``.
+
+        Returns:
+            Tuple of (code points in ascending order, counts)
+        """
+        codes = self.codes
+        ascii_codes = codes if codes.dtype == np.uint8 else codes[codes < 128]
+        ascii_counts = np.bincount(ascii_codes, minlength=128)
+        present = np.flatnonzero(ascii_counts)
+        if codes.dtype == np.uint8:
+            return present, ascii_counts[present]
+        others, other_counts = np.unique(codes[codes >= 128], return_counts=True)
+        return (np.concatenate((present, others.astype(np.int64))),
+                np.concatenate((ascii_counts[present], other_counts)))
+
+    @property
+    def word_lengths(self) -> np.ndarray:
+        """Length of every word in characters."""
+        return self.word_ends - self.word_starts
+
+    @property
+    def content_count(self) -> int:
+        """Number of non-whitespace characters."""
+        return len(self._content)
@@ -1,114 +1,124 @@
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Dict, Any, Union
+from typing import Dict, Any, List, Optional, Tuple, Union
 from src.utils.data_exporter import DataExporter
 from src.preprocessing.pdf_extractor import PDFExtractor
 from src.preprocessing.text_cleaner import TextCleaner
+from src.preprocessing.tokenized_document import TokenizedDocument
 from src.features.lexical_features import LexicalFeatureExtractor
 from src.features.syntactic_features import SyntacticFeatureExtractor
 from src.features.structural_features import StructuralFeatureExtractor
 from src.features.readability_features import ReadabilityAnalyzer
+from src.features.windowed_readability import WindowedReadability
+from src.models.corpus_model import CorpusStyleModel
 from src.models.stylometric_model import StylometricAnalyzer
 from src.utils.json_formatter import JSONFormatter
 from src.utils.data_formatter import DataFormatter
+from src.utils.cache import ExtractionCache, PageStatisticsCache, ParseCache
+from src.features.statistics import (
+    STATISTICS_VERSION,
+    LexicalStatistics,
+    StructuralStatistics,
+    ReadabilityStatistics,
+    SyntacticStatistics,
+    split_text
+)
 import json
 from datetime import datetime
 import logging
-from tqdm import tqdm
-from rich.console import Console
 
 logger = logging.getLogger(__name__)
 
+
+def _chunk_statistics(chunk: str, vocabulary_mode: str = 'exact', sketch_precision: int = 14,
+                      sketch_sample_size: int = 4096
+                      ) -> Tuple[LexicalStatistics, StructuralStatistics, ReadabilityStatistics]:
+    """Compute the mergeable statistics of one text chunk (runs in a worker process)."""
+    doc = TokenizedDocument(chunk)
+    return (
+        LexicalStatistics.from_document(doc, vocabulary_mode, sketch_precision, sketch_sample_size),
+        StructuralStatistics.from_document(doc),
+        ReadabilityStatistics.from_document(doc, ReadabilityAnalyzer().syllable_counter)
+    )
+
+
 class StylometricAnalysisApp:
-    def __init__(self):
+    def __init__(self, extraction_cache: Optional[ExtractionCache] = None,
+                 incremental: bool = False, page_cache: Optional[PageStatisticsCache] = None,
+                 workers: int = 1, chunk_size: int = 1 << 20, vocabulary_mode: str = 'exact',
+                 parse_batch_size: int = 8, parse_processes: int = 1,
+                 syntactic_tier: str = 'full', parse_cache: Optional[ParseCache] = None,
+                 corpus_model: Optional[CorpusStyleModel] = None,
+                 window_size: Optional[int] = None, window_stride: Optional[int] = None):
+        """
+        Args:
+            extraction_cache: Cache of extracted page texts (a default on-disk cache if omitted)
+            incremental: Analyze documents page by page, reusing the persisted
+                statistics of pages that did not change since an earlier revision
+            page_cache: Store of per-page statistics used in incremental mode
+                (a default on-disk store if omitted; none outside incremental mode)
+            workers: Number of processes computing lexical, structural and
+                readability statistics of text chunks (1 disables chunking)
+            chunk_size: Approximate chunk length in characters
+            vocabulary_mode: 'exact' or 'approximate' (constant-memory sketches
+                for the type and hapax ratios, see ``VocabularySketch``)
+            parse_batch_size: Documents per ``nlp.pipe`` batch when several
+                texts are parsed together (folders, changed pages)
+            parse_processes: spaCy worker processes for batched parsing
+            syntactic_tier: 'fast' (tagger and sentence segmenter only) or
+                'full' (adds the dependency parser), see ``SYNTACTIC_TIERS``
+            parse_cache: Store of spaCy parses; recomputing features of a
+                text parsed before skips the model (no parse cache if omitted)
+            corpus_model: Fitted corpus style model; each document's style
+                cluster and projection are added to its analysis
+            window_size: Tokens per sliding window; if set, readability and
+                lexical metrics of every window and every page are added
+                to the results (see ``WindowedReadability``)
+            window_stride: Tokens between window starts (``window_size`` if omitted)
+        """
+        self.workers = max(1, workers)
+        self.chunk_size = chunk_size
         self.pdf_extractor = PDFExtractor()
+        self.extraction_cache = extraction_cache if extraction_cache is not None else ExtractionCache()
+        self.incremental = incremental
+        if page_cache is None and incremental:
+            page_cache = PageStatisticsCache()
+        self.page_cache = page_cache
         self.text_cleaner = TextCleaner()
-        self.lexical_extractor = LexicalFeatureExtractor()
-        self.syntactic_extractor = SyntacticFeatureExtractor()
+        self.vocabulary_mode = vocabulary_mode
+        self.parse_batch_size = parse_batch_size
+        self.parse_processes = parse_processes
+        self.lexical_extractor = LexicalFeatureExtractor(vocabulary_mode=vocabulary_mode)
+        self.syntactic_extractor = SyntacticFeatureExtractor(tier=syntactic_tier, parse_cache=parse_cache)
         self.structural_extractor = StructuralFeatureExtractor()
         self.readability_analyzer = ReadabilityAnalyzer()
         self.stylometric_analyzer = StylometricAnalyzer()
+        self.corpus_model = corpus_model
+        self.window_size = window_size
+        self.window_stride = window_stride
         self.json_formatter = JSONFormatter()
-        self.console = Console()
         self.data_formatter = DataFormatter()
+        self._console = None
+
+    @property
+    def console(self):
+        """Rich console for progress output, created on first use."""
+        if self._console is None:
+            from rich.console import Console
+            self._console = Console()
+        return self._console
 
     def analyze_document(self, pdf_path: str, output_format: str = 'json', output_path: str = None) -> Union[Dict[str, Any], str]:
         try:
             with self.console.status("[bold green]Analyzing document...") as status:
-                # Extract text from PDF
-                status.update("[bold blue]Extracting text...")
-                raw_text = self.pdf_extractor.extract_text(pdf_path)
-                status.update("[bold green]Text extracted successfully")
-                
-                # Get document info
-                doc_info = {
-                    "filename": Path(pdf_path).name,
-                    "file_size": Path(pdf_path).stat().st_size,
-                    "page_count": len(self.pdf_extractor.get_pages()) if hasattr(self.pdf_extractor, 'get_pages') else 1
-                }
-                status.update("[bold blue]Document info collected")
+                if self.incremental:
+                    status.update("[bold blue]Analyzing changed pages...")
+                    pages, features = self._extract_features_incremental(pdf_path)
+                    status.update("[bold green]Page statistics merged")
+                else:
+                    pages, features = self._extract_features(pdf_path, status)
                 
-                # Clean and preprocess text
-                cleaned_text = self.text_cleaner.clean(raw_text)
-                status.update("[bold green]Text cleaned")
-                
-                # Extract features with error handling
-                try:
-                    lexical_features = self.lexical_extractor.extract_features(cleaned_text)
-                    status.update("[bold green]Lexical features extracted")
-                except Exception as e:
-                    logger.error(f"Error extracting lexical features: {str(e)}")
-                    lexical_features = {"vocabulary_richness": 0.0, "type_token_ratio": 0.0}
-                
-                try:
-                    syntactic_features = self.syntactic_extractor.extract_features(cleaned_text)
-                    status.update("[bold green]Syntactic features extracted")
-                except Exception as e:
-                    logger.error(f"Error extracting syntactic features: {str(e)}")
-                    syntactic_features = {"sentence_complexity": 0.0, "syntactic_diversity": 0.0}
-                
-                try:
-                    structural_features = self.structural_extractor.extract_features(cleaned_text)
-                    status.update("[bold green]Structural features extracted")
-                except Exception as e:
-                    logger.error(f"Error extracting structural features: {str(e)}")
-                    structural_features = {"structure_consistency": 0.0}
-                
-                try:
-                    readability_metrics = self.readability_analyzer.analyze(cleaned_text)
-                    status.update("[bold green]Readability metrics calculated")
-                except Exception as e:
-                    logger.error(f"Error calculating readability metrics: {str(e)}")
-                    readability_metrics = {"flesch_reading_ease": 0.0, "gunning_fog": 0.0}
-                
-                # Perform stylometric analysis
-                try:
-                    stylometric_results = self.stylometric_analyzer.analyze(
-                        lexical_features,
-                        syntactic_features,
-                        structural_features,
-                        readability_metrics
-                    )
-                    status.update("[bold green]Stylometric analysis completed")
-                except Exception as e:
-                    logger.error(f"Error in stylometric analysis: {str(e)}")
-                    raise  # Re-raise to be caught by outer try-except
-                
-                # Combine all results
-                results = {
-                    'metadata': {
-                        'filename': doc_info['filename'],
-                        'file_size': doc_info['file_size'],
-                        'page_count': doc_info['page_count'],
-                        'timestamp': datetime.now().isoformat()
-                    },
-                    'analysis': stylometric_results['analysis'],
-                    'features': {
-                        'lexical': lexical_features,
-                        'syntactic': syntactic_features,
-                        'structural': structural_features,
-                        'readability': readability_metrics
-                    }
-                }
+                results = self._build_results(pdf_path, pages, features, status)
                 
                 # Handle different output formats
                 if output_format == 'csv' and output_path:
@@ -119,31 +129,7 @@ class StylometricAnalysisApp:
                 
         except Exception as e:
             logger.error(f"Error analyzing document: {str(e)}")
-            error_result = {
-                "metadata": {
-                    "error": str(e),
-                    "timestamp": datetime.now().isoformat(),
-                    "filename": Path(pdf_path).name if pdf_path else "unknown"
-                },
-                "analysis": {
-                    "style_metrics": {
-                        "complexity": {"score": 0.0, "level": "Unknown"},
-                        "consistency": {"score": 0.0, "level": "Unknown"},
-                        "classification": "Unknown"
-                    },
-                    "writing_patterns": {
-                        "vocabulary_usage": "Unknown",
-                        "sentence_structure": "Unknown",
-                        "text_organization": "Unknown"
-                    }
-                },
-                "features": {
-                    "lexical": {},
-                    "syntactic": {},
-                    "structural": {},
-                    "readability": {}
-                }
-            }
+            error_result = self._error_result(pdf_path, e)
             
             if output_format == 'json':
                 return json.dumps(error_result)
@@ -151,6 +137,416 @@ class StylometricAnalysisApp:
                 return json.dumps(error_result, indent=2)
             return error_result
 
+    def analyze_documents(self, pdf_paths: List[str]) -> List[Dict[str, Any]]:
+        """
+        Analyze several documents, parsing them together.
+        
+        All texts are extracted and cleaned first, then parsed in batches
+        with ``nlp.pipe`` (``parse_batch_size`` documents per batch over
+        ``parse_processes`` processes) instead of one ``nlp`` call each.
+        In incremental mode each document is analyzed page by page, and
+        its changed pages are parsed in batches.
+        
+        Args:
+            pdf_paths: Paths of the PDF files
+            
+        Returns:
+            One result dictionary per path, in input order; documents that
+            fail get an error result as in ``analyze_document``
+        """
+        with self.console.status("[bold green]Analyzing documents...") as status:
+            texts = {}
+            errors = {}
+            if not self.incremental:
+                status.update(f"[bold blue]Extracting text from {len(pdf_paths)} documents...")
+                for index, pdf_path in enumerate(pdf_paths):
+                    try:
+                        pages = self._cleaned_pages(pdf_path)
+                        texts[index] = pages, self._join_cleaned_pages(pages)
+                    except Exception as e:
+                        logger.error(f"Error extracting text from {pdf_path}: {str(e)}")
+                        errors[index] = e
+                
+                status.update("[bold blue]Parsing documents...")
+                syntactic = self._syntactic_features_batch([text for _, text in texts.values()])
+                parsed = dict(zip(texts, syntactic))
+            
+            results = []
+            for index, pdf_path in enumerate(pdf_paths):
+                status.update(f"[bold blue]Analyzing {Path(pdf_path).name}...")
+                try:
+                    if index in errors:
+                        raise errors[index]
+                    if self.incremental:
+                        pages, features = self._extract_features_incremental(pdf_path)
+                    else:
+                        pages, cleaned_text = texts[index]
+                        features = self._text_features(cleaned_text, status, parsed[index])
+                    results.append(self._build_results(pdf_path, pages, features, status))
+                except Exception as e:
+                    logger.error(f"Error analyzing document: {str(e)}")
+                    results.append(self._error_result(pdf_path, e))
+            return results
+
+    def _build_results(self, pdf_path: str, pages: List[str],
+                       features: Dict[str, Dict[str, Any]], status) -> Dict[str, Any]:
+        """
+        Run the stylometric analysis and assemble the result dictionary.
+
+        Args:
+            pdf_path: Path of the analyzed PDF
+            pages: Cleaned text of every page, as the features were computed from
+            features: The four feature groups
+            status: Progress display
+        """
+        # Get document info
+        doc_info = {
+            "filename": Path(pdf_path).name,
+            "file_size": Path(pdf_path).stat().st_size,
+            "page_count": len(pages)
+        }
+        status.update("[bold blue]Document info collected")
+        
+        # Perform stylometric analysis
+        try:
+            stylometric_results = self.stylometric_analyzer.analyze(
+                features['lexical'],
+                features['syntactic'],
+                features['structural'],
+                features['readability']
+            )
+            status.update("[bold green]Stylometric analysis completed")
+        except Exception as e:
+            logger.error(f"Error in stylometric analysis: {str(e)}")
+            raise  # Re-raise to be caught by the caller
+        
+        if self.corpus_model is not None and self.corpus_model.is_fitted:
+            try:
+                stylometric_results['analysis']['corpus_style'] = self.corpus_model.assign(features)
+            except Exception as e:
+                logger.error(f"Error assigning corpus style: {str(e)}")
+        
+        # Combine all results
+        results = {
+            'metadata': {
+                'filename': doc_info['filename'],
+                'file_size': doc_info['file_size'],
+                'page_count': doc_info['page_count'],
+                'syntactic_tier': self.syntactic_extractor.tier,
+                'timestamp': datetime.now().isoformat()
+            },
+            'analysis': stylometric_results['analysis'],
+            'features': features
+        }
+        if self.window_size:
+            status.update("[bold blue]Scoring windows and pages...")
+            results['windowed'] = self._windowed_metrics(pages)
+        return results
+
+    def _windowed_metrics(self, pages: List[str]) -> Dict[str, Any]:
+        """
+        Readability and lexical metrics of sliding windows and of every page.
+
+        The windows cover the same text the document features were computed
+        from, so a window spanning the whole document reproduces them.
+
+        Args:
+            pages: Cleaned text of every page
+        """
+        page_starts = []
+        page_ends = []
+        offset = 0
+        for page in pages:
+            if page and offset:
+                offset += 1  # The space joining it to the previous page
+            page_starts.append(offset)
+            offset += len(page)
+            page_ends.append(offset)
+
+        windowed = WindowedReadability(TokenizedDocument(self._join_cleaned_pages(pages)),
+                                       self.readability_analyzer.syllable_counter)
+        windows = windowed.windows(self.window_size, self.window_stride)
+        sections = windowed.sections(page_starts, page_ends)
+        return {
+            'window_size': self.window_size,
+            'window_stride': self.window_stride or self.window_size,
+            'windows': {name: values.tolist() for name, values in windows.items()},
+            'pages': {name: values.tolist() for name, values in sections.items()}
+        }
+
+    def _error_result(self, pdf_path: str, error: Exception) -> Dict[str, Any]:
+        """Result dictionary of a document whose analysis failed."""
+        return {
+            "metadata": {
+                "error": str(error),
+                "timestamp": datetime.now().isoformat(),
+                "filename": Path(pdf_path).name if pdf_path else "unknown"
+            },
+            "analysis": {
+                "style_metrics": {
+                    "complexity": {"score": 0.0, "level": "Unknown"},
+                    "consistency": {"score": 0.0, "level": "Unknown"},
+                    "classification": "Unknown"
+                },
+                "writing_patterns": {
+                    "vocabulary_usage": "Unknown",
+                    "sentence_structure": "Unknown",
+                    "text_organization": "Unknown"
+                }
+            },
+            "features": {
+                "lexical": {},
+                "syntactic": {},
+                "structural": {},
+                "readability": {}
+            }
+        }
+
+    def _extract_features(self, pdf_path: str, status) -> Tuple[List[str], Dict[str, Dict[str, Any]]]:
+        """Extract all four feature groups from the full document text."""
+        # Extract text from PDF
+        status.update("[bold blue]Extracting text...")
+        pages = self._cleaned_pages(pdf_path)
+        status.update("[bold green]Text extracted and cleaned")
+        return pages, self._text_features(self._join_cleaned_pages(pages), status)
+
+    def _cleaned_pages(self, pdf_path: str) -> List[str]:
+        """Cleaned text of every page of a document."""
+        return [self.text_cleaner.clean(page) for page in self._extract_pages(pdf_path)]
+
+    @staticmethod
+    def _join_cleaned_pages(pages: List[str]) -> str:
+        """
+        Join cleaned page texts into the cleaned document text.
+
+        Cleaning collapses all whitespace into single spaces, so joining the
+        non-empty cleaned pages with a space gives the same text as cleaning
+        the joined raw pages, while page boundaries stay known.
+        """
+        return ' '.join(page for page in pages if page)
+
+    def _syntactic_features_batch(self, texts: List[str]) -> List[Dict[str, float]]:
+        """Syntactic features of several texts parsed with ``nlp.pipe``."""
+        try:
+            return list(self.syntactic_extractor.extract_features_batch(
+                texts, batch_size=self.parse_batch_size, n_process=self.parse_processes
+            ))
+        except Exception as e:
+            logger.error(f"Error extracting syntactic features: {str(e)}")
+            return [{"sentence_complexity": 0.0, "syntactic_diversity": 0.0} for _ in texts]
+
+    def _text_features(self, cleaned_text: str, status,
+                       syntactic_features: Optional[Dict[str, float]] = None
+                       ) -> Dict[str, Dict[str, Any]]:
+        """
+        Extract the four feature groups of a cleaned text.
+        
+        Args:
+            cleaned_text: Cleaned full document text
+            status: Progress display
+            syntactic_features: Features from a batched parse, if the text
+                was already parsed
+        """
+        if self.workers > 1 and len(cleaned_text) > self.chunk_size:
+            # Map-reduce the chunkable feature groups over a process pool
+            status.update("[bold blue]Extracting features from text chunks...")
+            reduced = self._map_reduce_features(cleaned_text)
+            doc = cleaned_text
+        else:
+            # Tokenize once and share the result with every extractor
+            reduced = None
+            doc = TokenizedDocument(cleaned_text)
+        
+        # Extract features with error handling
+        try:
+            lexical_features = reduced['lexical'] if reduced else self.lexical_extractor.extract_features(doc)
+            status.update("[bold green]Lexical features extracted")
+        except Exception as e:
+            logger.error(f"Error extracting lexical features: {str(e)}")
+            lexical_features = {"vocabulary_richness": 0.0, "type_token_ratio": 0.0}
+        
+        if syntactic_features is None:
+            try:
+                syntactic_features = self.syntactic_extractor.extract_features(doc)
+                status.update("[bold green]Syntactic features extracted")
+            except Exception as e:
+                logger.error(f"Error extracting syntactic features: {str(e)}")
+                syntactic_features = {"sentence_complexity": 0.0, "syntactic_diversity": 0.0}
+        
+        try:
+            structural_features = reduced['structural'] if reduced else self.structural_extractor.extract_features(doc)
+            status.update("[bold green]Structural features extracted")
+        except Exception as e:
+            logger.error(f"Error extracting structural features: {str(e)}")
+            structural_features = {"structure_consistency": 0.0}
+        
+        try:
+            readability_metrics = reduced['readability'] if reduced else self.readability_analyzer.analyze(doc)
+            status.update("[bold green]Readability metrics calculated")
+        except Exception as e:
+            logger.error(f"Error calculating readability metrics: {str(e)}")
+            readability_metrics = {"flesch_reading_ease": 0.0, "gunning_fog": 0.0}
+        
+        return {
+            'lexical': lexical_features,
+            'syntactic': syntactic_features,
+            'structural': structural_features,
+            'readability': readability_metrics
+        }
+
+    def _map_reduce_features(self, text: str) -> Dict[str, Dict[str, Any]]:
+        """
+        Compute lexical, structural and readability features chunk by chunk.
+
+        The text is split at separators, each chunk's statistics are computed
+        in a worker process, and the results are merged in text order, which
+        reproduces the single-pass features exactly. Syntactic features are
+        not chunked because parsing chunks separately changes sentence
+        boundaries.
+        """
+        chunks = split_text(text, self.chunk_size)
+        lexical = self._lexical_statistics()
+        structural = StructuralStatistics()
+        readability = ReadabilityStatistics()
+
+        logger.debug(f"Extracting features from {len(chunks)} chunks with {self.workers} workers")
+        with ProcessPoolExecutor(max_workers=min(self.workers, len(chunks))) as executor:
+            # map() yields results in submission order, so merges stay in text order
+            for chunk_lexical, chunk_structural, chunk_readability in executor.map(
+                _chunk_statistics, chunks, [self.vocabulary_mode] * len(chunks),
+                [self.lexical_extractor.sketch_precision] * len(chunks),
+                [self.lexical_extractor.sketch_sample_size] * len(chunks)
+            ):
+                lexical = lexical.merge(chunk_lexical)
+                structural = structural.merge(chunk_structural)
+                readability = readability.merge(chunk_readability)
+
+        return {
+            'lexical': lexical.finalize(),
+            'structural': structural.finalize(),
+            'readability': readability.finalize(self.readability_analyzer)
+        }
+
+    def _extract_features_incremental(self, pdf_path: str) -> Tuple[List[str], Dict[str, Dict[str, Any]]]:
+        """
+        Extract all four feature groups by merging per-page statistics.
+
+        Pages are identified by fingerprint; only pages missing from the page
+        cache are extracted, cleaned and parsed. Because cleaned pages are
+        joined by a single space, the merged lexical, structural and
+        readability features equal those of the whole document. Syntactic
+        statistics come from per-page parses, so sentences never span a
+        page boundary. Cached entries keep the cleaned page text, which is
+        returned with the features.
+        """
+        fingerprints = self.pdf_extractor.page_fingerprints(pdf_path)
+        version = '|'.join([
+            STATISTICS_VERSION,
+            self.vocabulary_mode,
+            str(self.lexical_extractor.sketch_precision),
+            str(self.lexical_extractor.sketch_sample_size),
+            self.pdf_extractor.cache_version,
+            self.syntactic_extractor.MODEL_NAME,
+            self.syntactic_extractor.tier
+        ])
+        keys = [self.page_cache.make_key(fingerprint, version) for fingerprint in fingerprints]
+        page_stats = [self.page_cache.get(key) for key in keys]
+
+        missing = [number for number, stats in enumerate(page_stats, start=1) if stats is None]
+        if missing:
+            logger.info(f"Analyzing {len(missing)} of {len(keys)} pages of {Path(pdf_path).name}")
+            pages = [
+                (page_number, self.text_cleaner.clean(raw_text))
+                for page_number, raw_text in self.pdf_extractor.iter_pages(pdf_path, missing)
+            ]
+            parsed = self.syntactic_extractor.parse_batch(
+                (text for _, text in pages if text),
+                batch_size=self.parse_batch_size, n_process=self.parse_processes
+            )
+            for page_number, cleaned_text in pages:
+                stats = self._page_statistics(cleaned_text, next(parsed) if cleaned_text else None)
+                self.page_cache.put(keys[page_number - 1], stats)
+                page_stats[page_number - 1] = stats
+
+        lexical = self._lexical_statistics()
+        structural = StructuralStatistics()
+        readability = ReadabilityStatistics()
+        syntactic = SyntacticStatistics()
+        for stats in page_stats:
+            if stats['empty']:
+                continue
+            lexical = lexical.merge(LexicalStatistics.from_dict(stats['lexical']))
+            structural = structural.merge(StructuralStatistics.from_dict(stats['structural']))
+            readability = readability.merge(ReadabilityStatistics.from_dict(stats['readability']))
+            syntactic = syntactic.merge(SyntacticStatistics.from_dict(stats['syntactic']))
+
+        pages = ['' if stats['empty'] else stats['text'] for stats in page_stats]
+        return pages, {
+            'lexical': lexical.finalize(),
+            'syntactic': self.syntactic_extractor.features_from_statistics(syntactic),
+            'structural': structural.finalize(),
+            'readability': readability.finalize(self.readability_analyzer)
+        }
+
+    def _lexical_statistics(self) -> LexicalStatistics:
+        """Empty lexical statistics with the settings of the lexical extractor."""
+        return LexicalStatistics(
+            self.vocabulary_mode, self.lexical_extractor.sketch_precision,
+            self.lexical_extractor.sketch_sample_size
+        )
+
+    def _page_statistics(self, cleaned_text: str, parsed=None) -> Dict[str, Any]:
+        """
+        Compute the serializable statistics of one cleaned page.
+        
+        Args:
+            cleaned_text: Cleaned page text
+            parsed: spaCy Doc of the page from a batched parse (parsed here if omitted)
+        """
+        if not cleaned_text:
+            # Empty pages vanish when cleaned pages are joined
+            return {'empty': True}
+        doc = TokenizedDocument(cleaned_text)
+        return {
+            'empty': False,
+            'text': cleaned_text,
+            'lexical': LexicalStatistics.from_document(
+                doc, self.vocabulary_mode, self.lexical_extractor.sketch_precision,
+                self.lexical_extractor.sketch_sample_size
+            ).to_dict(),
+            'structural': StructuralStatistics.from_document(doc).to_dict(),
+            'readability': ReadabilityStatistics.from_document(
+                doc, self.readability_analyzer.syllable_counter
+            ).to_dict(),
+            'syntactic': SyntacticStatistics.from_doc(
+                parsed if parsed is not None else self.syntactic_extractor.parse(cleaned_text),
+                self.syntactic_extractor.has_dependencies
+            ).to_dict()
+        }
+
+    def _extract_pages(self, pdf_path: str) -> List[str]:
+        """Get page texts from the extraction cache, extracting and caching them on a miss."""
+        if not Path(pdf_path).exists():
+            raise FileNotFoundError(f"PDF file not found: {pdf_path}")
+
+        try:
+            key = self.extraction_cache.make_key(pdf_path, self.pdf_extractor.cache_version)
+            pages = self.extraction_cache.get(key)
+        except Exception as e:
+            logger.warning(f"Extraction cache unavailable: {str(e)}")
+            return self.pdf_extractor.extract_pages(pdf_path)
+
+        if pages is not None:
+            logger.debug(f"Extraction cache hit for {Path(pdf_path).name}")
+            return pages
+
+        pages = self.pdf_extractor.extract_pages(pdf_path)
+        try:
+            self.extraction_cache.put(key, pages)
+        except Exception as e:
+            logger.warning(f"Could not store extraction in cache: {str(e)}")
+        return pages
+
     def analyze_and_predict(self, pdf_path: str) -> Dict[str, Any]:
         # Get basic analysis
         analysis_results = self.analyze_document(pdf_path)
@@ -1,8 +1,344 @@
 from functools import lru_cache
 from pathlib import Path
+from typing import Any, Dict, List, Optional
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+import zlib
+from src.utils.paths import cache_dir
+
+logger = logging.getLogger(__name__)
 
 class AnalysisCache:
     @lru_cache(maxsize=100)
     def get_document_analysis(self, file_path: str, file_hash: str):
         """Cache analysis results based on file path and hash"""
-        pass 
\ No newline at end of file
+        pass
+
+
+def file_content_hash(file_path: str, block_size: int = 1 << 20) -> str:
+    """
+    Compute the SHA-256 digest of a file's contents.
+
+    Args:
+        file_path: Path to the file
+        block_size: Number of bytes read per iteration
+
+    Returns:
+        Hex digest of the file contents
+    """
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for block in iter(lambda: f.read(block_size), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class SQLiteCache:
+    """
+    Size-bounded key/value store of compressed blobs in a SQLite database.
+
+    When the stored size exceeds ``max_size_bytes`` the least recently used
+    entries are evicted. Subclasses define how values are serialized.
+    """
+
+    def __init__(self, cache_path: str, max_size_bytes: int):
+        self.cache_path = Path(cache_path)
+        self.max_size_bytes = max_size_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._conn = None
+        self._lock = threading.Lock()
+
+    def get_bytes(self, key: str) -> Optional[bytes]:
+        """
+        Look up a raw entry.
+
+        Args:
+            key: Entry key
+
+        Returns:
+            Decompressed entry data, or None on a cache miss
+        """
+        with self._lock:
+            conn = self._connect()
+            row = conn.execute("SELECT data FROM entries WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            conn.execute("UPDATE entries SET last_access = ? WHERE key = ?", (time.time(), key))
+            conn.commit()
+            self.hits += 1
+        return zlib.decompress(row[0])
+
+    def put_bytes(self, key: str, value: bytes) -> None:
+        """
+        Store a raw entry and evict old entries if the cache is over its size limit.
+
+        Args:
+            key: Entry key
+            value: Entry data
+        """
+        data = zlib.compress(value)
+        if len(data) > self.max_size_bytes:
+            logger.debug(f"Entry of {len(data)} bytes exceeds cache size limit, not cached")
+            return
+        with self._lock:
+            conn = self._connect()
+            conn.execute(
+                "INSERT OR REPLACE INTO entries (key, data, size, last_access) VALUES (?, ?, ?, ?)",
+                (key, data, len(data), time.time())
+            )
+            self._evict(conn)
+            conn.commit()
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Get cache usage counters.
+
+        Returns:
+            Dictionary with hits, misses, evictions, entry count and stored size
+        """
+        with self._lock:
+            entries, size = self._connect().execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries"
+            ).fetchone()
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'entries': entries,
+            'size_bytes': size
+        }
+
+    def clear(self) -> None:
+        """Remove every cached entry."""
+        with self._lock:
+            conn = self._connect()
+            conn.execute("DELETE FROM entries")
+            conn.commit()
+
+    def close(self) -> None:
+        """Close the underlying database connection."""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open the database on first use and create the schema."""
+        if self._conn is None:
+            self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(str(self.cache_path), check_same_thread=False)
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS entries ("
+                "key TEXT PRIMARY KEY, data BLOB NOT NULL, "
+                "size INTEGER NOT NULL, last_access REAL NOT NULL)"
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS entries_last_access ON entries (last_access)"
+            )
+        return self._conn
+
+    def _evict(self, conn: sqlite3.Connection) -> None:
+        """Delete least recently used entries until the cache fits its size limit."""
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+        if total <= self.max_size_bytes:
+            return
+        for key, size in conn.execute(
+            "SELECT key, size FROM entries ORDER BY last_access ASC"
+        ).fetchall():
+            if total <= self.max_size_bytes:
+                break
+            conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+            total -= size
+            self.evictions += 1
+
+
+class ExtractionCache(SQLiteCache):
+    """
+    On-disk cache of extracted PDF page texts.
+
+    Entries are keyed by the SHA-256 of the PDF bytes plus the extractor
+    version, so renamed or copied files still hit and extractor changes
+    invalidate old entries.
+    """
+
+    def __init__(self, cache_path: Optional[str] = None,
+                 max_size_bytes: int = 256 * 1024 * 1024):
+        """
+        Args:
+            cache_path: Database file (``extraction.sqlite`` in ``cache_dir()`` if omitted)
+            max_size_bytes: Stored size above which old entries are evicted
+        """
+        super().__init__(cache_path or str(cache_dir() / 'extraction.sqlite'), max_size_bytes)
+
+    @staticmethod
+    def make_key(pdf_path: str, extractor_version: str) -> str:
+        """
+        Build the cache key for a PDF file.
+
+        Args:
+            pdf_path: Path to the PDF file
+            extractor_version: Version string of the extractor producing the text
+
+        Returns:
+            Content-addressed cache key
+        """
+        return f"{file_content_hash(pdf_path)}:{extractor_version}"
+
+    def get(self, key: str) -> Optional[List[str]]:
+        """
+        Look up cached page texts.
+
+        Args:
+            key: Key returned by ``make_key``
+
+        Returns:
+            List of page texts, or None on a cache miss
+        """
+        data = self.get_bytes(key)
+        return json.loads(data.decode('utf-8')) if data is not None else None
+
+    def put(self, key: str, pages: List[str]) -> None:
+        """
+        Store page texts.
+
+        Args:
+            key: Key returned by ``make_key``
+            pages: List of page texts in page order
+        """
+        self.put_bytes(key, json.dumps(pages).encode('utf-8'))
+
+
+class PageStatisticsCache(SQLiteCache):
+    """
+    On-disk store of per-page feature statistics.
+
+    Entries are keyed by a page fingerprint plus the versions of the
+    extractor and statistics code, so an unchanged page of a revised
+    document is never extracted or parsed again.
+    """
+
+    def __init__(self, cache_path: Optional[str] = None,
+                 max_size_bytes: int = 512 * 1024 * 1024):
+        """
+        Args:
+            cache_path: Database file (``page_statistics.sqlite`` in ``cache_dir()`` if omitted)
+            max_size_bytes: Stored size above which old entries are evicted
+        """
+        super().__init__(cache_path or str(cache_dir() / 'page_statistics.sqlite'), max_size_bytes)
+
+    @staticmethod
+    def make_key(fingerprint: str, version: str) -> str:
+        """
+        Build the cache key for a page.
+
+        Args:
+            fingerprint: Page fingerprint from ``PDFExtractor.page_fingerprints``
+            version: Combined version string of the code producing the statistics
+
+        Returns:
+            Cache key
+        """
+        return f"{fingerprint}:{version}"
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up the statistics of a page.
+
+        Args:
+            key: Key returned by ``make_key``
+
+        Returns:
+            Serialized page statistics, or None on a cache miss
+        """
+        data = self.get_bytes(key)
+        return json.loads(data.decode('utf-8')) if data is not None else None
+
+    def put(self, key: str, statistics: Dict[str, Any]) -> None:
+        """
+        Store the statistics of a page.
+
+        Args:
+            key: Key returned by ``make_key``
+            statistics: JSON-serializable page statistics
+        """
+        self.put_bytes(key, json.dumps(statistics).encode('utf-8'))
+
+
+class ParseCache(SQLiteCache):
+    """
+    On-disk cache of spaCy parses.
+
+    Docs are serialized with ``DocBin`` (only the token attributes the
+    syntactic statistics read) and keyed by the SHA-256 of the parsed text
+    plus the pipeline version, so features can be recomputed from a cached
+    parse without loading the model.
+    """
+
+    ATTRS = ('ORTH', 'SPACY', 'TAG', 'POS', 'DEP', 'HEAD', 'SENT_START')
+
+    def __init__(self, cache_path: Optional[str] = None,
+                 max_size_bytes: int = 1024 * 1024 * 1024):
+        """
+        Args:
+            cache_path: Database file (``parses.sqlite`` in ``cache_dir()`` if omitted)
+            max_size_bytes: Stored size above which old entries are evicted
+        """
+        super().__init__(cache_path or str(cache_dir() / 'parses.sqlite'), max_size_bytes)
+        self._vocab = None
+
+    @staticmethod
+    def make_key(text: str, pipeline_version: str) -> str:
+        """
+        Build the cache key for a text.
+
+        Args:
+            text: Text passed to the pipeline
+            pipeline_version: Model name and version plus the loaded components
+
+        Returns:
+            Content-addressed cache key
+        """
+        digest = hashlib.sha256(text.encode('utf-8', 'surrogatepass')).hexdigest()
+        return f"{digest}:{pipeline_version}"
+
+    def get(self, key: str):
+        """
+        Look up a parse.
+
+        Args:
+            key: Key returned by ``make_key``
+
+        Returns:
+            spaCy Doc, or None on a cache miss
+        """
+        data = self.get_bytes(key)
+        if data is None:
+            return None
+        from spacy.tokens import DocBin
+        from spacy.vocab import Vocab
+
+        if self._vocab is None:
+            # DocBin stores its strings, so cached Docs need no model vocab
+            self._vocab = Vocab()
+        return next(DocBin().from_bytes(data).get_docs(self._vocab))
+
+    def put(self, key: str, doc) -> None:
+        """
+        Store a parse.
+
+        Args:
+            key: Key returned by ``make_key``
+            doc: Parsed spaCy Doc
+        """
+        from spacy.tokens import DocBin
+
+        doc_bin = DocBin(attrs=list(self.ATTRS))
+        doc_bin.add(doc)
+        self.put_bytes(key, doc_bin.to_bytes())
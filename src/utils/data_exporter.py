@@ -1,5 +1,4 @@
-from typing import Dict, Any
-import pandas as pd
+from typing import Dict, Any, Iterable, Optional
 import json
 from pathlib import Path
 import logging
@@ -44,6 +43,7 @@ class DataExporter:
             }
             
             # Save as CSV for easy ML processing
+            import pandas as pd
             df = pd.DataFrame([flat_data])
             csv_path = self.output_dir / 'training_data.csv'
             df.to_csv(csv_path, mode='a', header=not csv_path.exists(), index=False)
@@ -51,4 +51,24 @@ class DataExporter:
             return str(csv_path)
         except Exception as e:
             logger.error(f"Error exporting data: {str(e)}")
+            return ""
+
+    def export_to_store(self, results: Iterable[Dict[str, Any]],
+                        doc_ids: Optional[Iterable[str]] = None) -> str:
+        """
+        Append a batch of results to the columnar feature store under the
+        output directory (see ``FeatureStore``).
+        """
+        from src.utils.feature_store import FeatureStore
+
+        store_path = self.output_dir / 'feature_store'
+        try:
+            store = FeatureStore(str(store_path))
+            try:
+                store.append_results(results, doc_ids)
+            finally:
+                store.close()
+            return str(store_path)
+        except Exception as e:
+            logger.error(f"Error exporting to feature store: {str(e)}")
             return "" 
\ No newline at end of file
@@ -1,4 +1,3 @@
-import pandas as pd
 from typing import Dict, Any, List
 import json
 from pathlib import Path
@@ -53,6 +52,7 @@ class DataFormatter:
         }
         
         # Convert to DataFrame and save as CSV
+        import pandas as pd
         df = pd.DataFrame([ml_features])
         df.to_csv(output_path, index=False)
         
@@ -0,0 +1,313 @@
+import json
+import logging
+import os
+import sqlite3
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+import numpy as np
+from src.features.schema import FeatureSchema, FeatureVector, feature_schema
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_STORE_PATH = 'data/feature_store'
+
+# Bump when the on-disk layout changes, so stale stores are rejected
+STORE_VERSION = 1
+
+# Stylometric scores stored as columns after the schema features
+ANALYSIS_COLUMNS = ('style_complexity', 'style_consistency')
+
+_MANIFEST = 'manifest.json'
+_METADATA = 'metadata.sqlite'
+_COLUMNS_DIR = 'columns'
+_DTYPE = np.dtype('<f4')
+
+
+class FeatureStore:
+    """
+    Columnar store of document features, one memory-mapped file per column.
+
+    Every column is a raw little-endian float32 array; the columns are the
+    features of a ``FeatureSchema`` followed by ``ANALYSIS_COLUMNS``. Reads
+    map the files, so any subset of columns of millions of documents is
+    available without parsing or copying. Document ids and the rest of each
+    result's metadata live in a SQLite table keyed by row.
+
+    The number of committed rows is kept in a manifest that is replaced
+    atomically after each append. Data written past it by an interrupted
+    append is invisible to readers and overwritten by the next append, so
+    a batch is either stored completely or not at all. A store has a single
+    writer; readers in other processes see new rows after ``refresh``.
+    """
+
+    def __init__(self, path: str = DEFAULT_STORE_PATH, schema: Optional[FeatureSchema] = None):
+        """
+        Open a store, creating it if missing.
+
+        Args:
+            path: Store directory
+            schema: Feature schema of a new store (the current one if omitted);
+                an existing store keeps the schema it was created with
+        """
+        self.path = Path(path)
+        manifest_path = self.path / _MANIFEST
+        if manifest_path.exists():
+            manifest = json.loads(manifest_path.read_text(encoding='utf-8'))
+            if manifest.get('version') != STORE_VERSION:
+                raise ValueError(f"Not a feature store (version {STORE_VERSION}): {self.path}")
+            stored_schema = feature_schema(manifest['schema_version'])
+            if schema is not None and schema.fingerprint != stored_schema.fingerprint:
+                raise ValueError(f"Feature store {self.path} uses schema version {stored_schema.version}")
+            self.schema = stored_schema
+            self.columns = tuple(manifest['columns'])
+            if self.columns != self.schema.columns + ANALYSIS_COLUMNS:
+                raise ValueError(f"Columns of feature store {self.path} do not match its schema")
+            self.rows = manifest['rows']
+        else:
+            self.schema = schema or feature_schema()
+            self.columns = self.schema.columns + ANALYSIS_COLUMNS
+            self.rows = 0
+            (self.path / _COLUMNS_DIR).mkdir(parents=True, exist_ok=True)
+            self._write_manifest()
+        self._positions = {name: i for i, name in enumerate(self.columns)}
+        self._maps: Dict[str, np.ndarray] = {}
+        self._index: Optional[Dict[str, int]] = None
+        self._conn = sqlite3.connect(str(self.path / _METADATA), check_same_thread=False)
+        with self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS documents "
+                "(row INTEGER PRIMARY KEY, doc_id TEXT NOT NULL, metadata TEXT NOT NULL)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS documents_doc_id ON documents (doc_id)")
+            # Metadata of an append that never committed
+            self._conn.execute("DELETE FROM documents WHERE row >= ?", (self.rows,))
+
+    def __len__(self) -> int:
+        return self.rows
+
+    def __contains__(self, doc_id: str) -> bool:
+        return doc_id in self.index
+
+    def close(self) -> None:
+        self._maps = {}
+        self._conn.close()
+
+    @property
+    def index(self) -> Dict[str, int]:
+        """Latest row of every document id."""
+        if self._index is None:
+            self._index = dict(self._conn.execute(
+                "SELECT doc_id, row FROM documents WHERE row < ? ORDER BY row", (self.rows,)
+            ).fetchall())
+        return self._index
+
+    def refresh(self) -> None:
+        """Pick up rows appended by another process since the store was opened."""
+        manifest = json.loads((self.path / _MANIFEST).read_text(encoding='utf-8'))
+        if manifest['rows'] != self.rows:
+            self.rows = manifest['rows']
+            self._maps = {}
+            self._index = None
+
+    def append(self, doc_ids: Sequence[str], features: np.ndarray,
+               metadata: Optional[Sequence[Dict[str, Any]]] = None) -> range:
+        """
+        Append a batch of documents atomically.
+
+        A document appended again keeps its earlier rows; the index points
+        to the latest one.
+
+        Args:
+            doc_ids: Identifier of every document
+            features: Matrix of shape (documents, len(columns))
+            metadata: JSON-serializable metadata of every document
+
+        Returns:
+            Rows of the appended documents
+        """
+        features = np.asarray(features, dtype=_DTYPE)
+        if features.shape != (len(doc_ids), len(self.columns)):
+            raise ValueError(f"Expected {len(doc_ids)} rows of {len(self.columns)} columns, "
+                             f"got shape {features.shape}")
+        if metadata is None:
+            metadata = [{} for _ in doc_ids]
+        elif len(metadata) != len(doc_ids):
+            raise ValueError("Expected one metadata record per document")
+        start, end = self.rows, self.rows + len(doc_ids)
+        if start == end:
+            return range(start, end)
+
+        # Column-major copy, so every column is one contiguous write
+        for position, values in enumerate(np.ascontiguousarray(features.T)):
+            with open(self._column_path(position), 'r+b' if start else 'wb') as f:
+                f.truncate(start * _DTYPE.itemsize)
+                f.seek(start * _DTYPE.itemsize)
+                f.write(values.tobytes())
+                f.flush()
+                os.fsync(f.fileno())
+        with self._conn:
+            self._conn.execute("DELETE FROM documents WHERE row >= ?", (start,))
+            self._conn.executemany(
+                "INSERT INTO documents (row, doc_id, metadata) VALUES (?, ?, ?)",
+                [(row, doc_id, json.dumps(record))
+                 for row, doc_id, record in zip(range(start, end), doc_ids, metadata)]
+            )
+        self.rows = end
+        self._write_manifest()
+
+        self._maps = {}
+        if self._index is not None:
+            self._index.update(zip(doc_ids, range(start, end)))
+        return range(start, end)
+
+    def append_results(self, results: Iterable[Dict[str, Any]],
+                       doc_ids: Optional[Iterable[str]] = None) -> int:
+        """
+        Append analysis results as one batch; results of failed analyses are skipped.
+
+        Args:
+            results: Analysis result dictionaries
+            doc_ids: Identifier of every result (its file name if omitted)
+
+        Returns:
+            Number of documents appended
+        """
+        results = list(results)
+        doc_ids = list(doc_ids) if doc_ids is not None else [
+            result.get('metadata', {}).get('filename', '') for result in results
+        ]
+        if len(doc_ids) != len(results):
+            raise ValueError("Expected one document id per result")
+        kept = [(doc_id, result) for doc_id, result in zip(doc_ids, results)
+                if 'error' not in result.get('metadata', {}) and 'features' in result]
+        matrix = np.full((len(kept), len(self.columns)), np.nan, dtype=_DTYPE)
+        width = len(self.schema)
+        for row, (_, result) in zip(matrix, kept):
+            self.schema.encode(result['features'], out=row[:width])
+            row[width:] = self._analysis_scores(result)
+        self.append([doc_id for doc_id, _ in kept], matrix,
+                    [self._result_metadata(result) for _, result in kept])
+        return len(kept)
+
+    def column(self, name: str) -> np.ndarray:
+        """Read-only memory-mapped values of one column, a row per document."""
+        if name not in self._positions:
+            raise KeyError(name)
+        if not self.rows:
+            return np.zeros(0, dtype=_DTYPE)
+        values = self._maps.get(name)
+        if values is None:
+            values = np.memmap(self._column_path(self._positions[name]), dtype=_DTYPE, mode='r',
+                               shape=(self.rows,))
+            self._maps[name] = values
+        return values
+
+    def read(self, columns: Optional[Sequence[str]] = None,
+             rows: Optional[Union[slice, np.ndarray]] = None) -> Dict[str, np.ndarray]:
+        """
+        Values of a subset of columns.
+
+        Args:
+            columns: Column names (all if omitted)
+            rows: Rows to read; slices stay memory-mapped views, index
+                arrays copy the selected rows
+
+        Returns:
+            Dictionary of column name -> values
+        """
+        columns = self.columns if columns is None else columns
+        if rows is None:
+            return {name: self.column(name) for name in columns}
+        return {name: self.column(name)[rows] for name in columns}
+
+    def matrix(self, columns: Optional[Sequence[str]] = None,
+               rows: Optional[Union[slice, np.ndarray]] = None) -> np.ndarray:
+        """Columns stacked into one float32 matrix of shape (rows, columns); this copies."""
+        values = self.read(columns, rows)
+        if not values:
+            return np.zeros((0, 0), dtype=_DTYPE)
+        return np.stack(list(values.values()), axis=1)
+
+    def frame(self, columns: Optional[Sequence[str]] = None,
+              rows: Optional[Union[slice, np.ndarray]] = None):
+        """Columns as a pandas DataFrame indexed by document id."""
+        import pandas as pd
+
+        values = self.read(columns, rows)
+        selected = np.arange(self.rows)[rows if rows is not None else slice(None)]
+        return pd.DataFrame(values, index=pd.Index(self.doc_ids(selected), name='doc_id'))
+
+    def latest_rows(self) -> np.ndarray:
+        """Sorted rows of the latest version of every document."""
+        return np.sort(np.fromiter(self.index.values(), dtype=np.int64, count=len(self.index)))
+
+    def rows_of(self, doc_ids: Iterable[str]) -> np.ndarray:
+        """Latest row of every document id, -1 for unknown ids."""
+        index = self.index
+        return np.array([index.get(doc_id, -1) for doc_id in doc_ids], dtype=np.int64)
+
+    def doc_ids(self, rows: Optional[np.ndarray] = None) -> List[str]:
+        """Document id of every row (all rows if omitted)."""
+        return [doc_id for doc_id, _ in self._records(rows, 'doc_id')]
+
+    def metadata(self, rows: Optional[np.ndarray] = None) -> List[Dict[str, Any]]:
+        """Metadata record of every row (all rows if omitted)."""
+        return [json.loads(record) for record, _ in self._records(rows, 'metadata')]
+
+    def vector(self, doc_id: str) -> FeatureVector:
+        """Feature dictionary view of the latest row of a document."""
+        row = self.index[doc_id]
+        values = np.array([self.column(name)[row] for name in self.schema.columns], dtype=_DTYPE)
+        return self.schema.view(values)
+
+    def _records(self, rows: Optional[np.ndarray], field: str) -> List[Tuple[Any, int]]:
+        if rows is None:
+            return self._conn.execute(
+                f"SELECT {field}, row FROM documents WHERE row < ? ORDER BY row", (self.rows,)
+            ).fetchall()
+        rows = np.asarray(rows, dtype=np.int64)
+        found = {}
+        unique = np.unique(rows).tolist()
+        # SQLite limits the number of bound parameters per statement
+        for start in range(0, len(unique), 900):
+            chunk = unique[start:start + 900]
+            found.update((row, value) for value, row in self._conn.execute(
+                f"SELECT {field}, row FROM documents WHERE row IN ({','.join('?' * len(chunk))})", chunk
+            ))
+        return [(found[row], row) for row in rows.tolist()]
+
+    def _column_path(self, position: int) -> Path:
+        return self.path / _COLUMNS_DIR / f'{position:05d}.f32'
+
+    def _write_manifest(self) -> None:
+        manifest = {
+            'version': STORE_VERSION,
+            'schema_version': self.schema.version,
+            'fingerprint': self.schema.fingerprint,
+            'columns': list(self.columns),
+            'rows': self.rows
+        }
+        path = self.path / _MANIFEST
+        partial = path.with_suffix(path.suffix + '.tmp')
+        with open(partial, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f)
+            f.flush()
+            os.fsync(f.fileno())
+        partial.replace(path)
+
+    @staticmethod
+    def _analysis_scores(result: Dict[str, Any]) -> List[float]:
+        style_metrics = result.get('analysis', {}).get('style_metrics', {})
+        return [
+            style_metrics.get('complexity', {}).get('score', np.nan),
+            style_metrics.get('consistency', {}).get('score', np.nan)
+        ]
+
+    @staticmethod
+    def _result_metadata(result: Dict[str, Any]) -> Dict[str, Any]:
+        analysis = result.get('analysis', {})
+        return {
+            **result.get('metadata', {}),
+            'style_classification': analysis.get('style_metrics', {}).get('classification'),
+            **analysis.get('writing_patterns', {})
+        }
@@ -0,0 +1,31 @@
+import os
+from pathlib import Path
+
+
+def cache_dir() -> Path:
+    """
+    Directory of the on-disk caches, independent of the working directory.
+
+    ``$STILO_CACHE_DIR`` if set, else ``stilo`` under ``$XDG_CACHE_HOME``
+    (``~/.cache`` if unset).
+    """
+    override = os.environ.get('STILO_CACHE_DIR')
+    if override:
+        return Path(override).expanduser()
+    base = os.environ.get('XDG_CACHE_HOME') or Path.home() / '.cache'
+    return Path(base).expanduser() / 'stilo'
+
+
+def data_dir() -> Path:
+    """
+    Directory of built data files such as the syllable lexicon, independent
+    of the working directory.
+
+    ``$STILO_DATA_DIR`` if set, else ``stilo`` under ``$XDG_DATA_HOME``
+    (``~/.local/share`` if unset).
+    """
+    override = os.environ.get('STILO_DATA_DIR')
+    if override:
+        return Path(override).expanduser()
+    base = os.environ.get('XDG_DATA_HOME') or Path.home() / '.local' / 'share'
+    return Path(base).expanduser() / 'stilo'
@@ -0,0 +1,14 @@
+import pytest
+from pathlib import Path
+
+ASSETS_DIR = Path(__file__).resolve().parent.parent / 'assets'
+
+@pytest.fixture
+def test_pdf():
+    return str(ASSETS_DIR / 'SA-41.pdf')
+
+@pytest.fixture(autouse=True)
+def isolated_user_dirs(tmp_path, monkeypatch):
+    # Default caches must never land in the real user directories
+    monkeypatch.setenv('STILO_CACHE_DIR', str(tmp_path / 'user_cache'))
+    monkeypatch.setenv('STILO_DATA_DIR', str(tmp_path / 'user_data'))
@@ -9,4 +9,33 @@ def test_analyze_document(analysis_app, test_pdf):
     results = analysis_app.analyze_document(test_pdf)
     assert 'metadata' in results
     assert 'analysis' in results
-    assert 'features' in results 
\ No newline at end of file
+    assert 'features' in results 
+def test_windowed_metrics_of_windows_and_pages(test_pdf):
+    results = StylometricAnalysisApp(window_size=50, window_stride=25).analyze_document(test_pdf)
+    windowed = results['windowed']
+    assert windowed['window_stride'] == 25
+    assert len(windowed['pages']['flesch_reading_ease']) == results['metadata']['page_count']
+    assert len(windowed['windows']['type_token_ratio']) == len(windowed['windows']['start_token'])
+    assert sum(windowed['pages']['lexical_words']) > 0
+
+def test_whole_document_window_reproduces_document_metrics(test_pdf, tmp_path):
+    import spacy
+    from src.utils.cache import ExtractionCache, PageStatisticsCache
+
+    extraction_cache = ExtractionCache(str(tmp_path / 'extraction.sqlite'))
+    results = StylometricAnalysisApp(extraction_cache=extraction_cache, window_size=10**9).analyze_document(test_pdf)
+    windows = results['windowed']['windows']
+    assert len(windows['start_token']) == 1
+    for metric, value in results['features']['readability'].items():
+        assert windows[metric][0] == pytest.approx(value), metric
+    assert windows['type_token_ratio'][0] == pytest.approx(results['features']['lexical']['type_token_ratio'])
+
+    incremental = StylometricAnalysisApp(
+        extraction_cache=extraction_cache, incremental=True, window_size=10**9,
+        page_cache=PageStatisticsCache(str(tmp_path / 'pages.sqlite'))
+    )
+    incremental.syntactic_extractor._nlp = spacy.blank('en')
+    incremental.syntactic_extractor._nlp.add_pipe('sentencizer')
+    assert incremental.analyze_document(test_pdf)['windowed'] == results['windowed']
+    incremental._extract_pages = None  # a second run takes every page from the page cache
+    assert incremental.analyze_document(test_pdf)['windowed'] == results['windowed']
@@ -0,0 +1,50 @@
+import numpy as np
+import pytest
+from scipy.spatial.distance import cdist
+from src.models.attribution import DeltaAttributor, delta_distances
+
+FUNCTION_WORDS = ['the', 'of', 'and', 'but', 'a', 'to', 'in', 'it', "don't", 'on', 'with']
+CONTENT = ['river', 'stone', 'light', 'garden', 'letter', 'window', 'winter', 'voice']
+
+def author_text(rng, weights, length=400):
+    vocabulary = FUNCTION_WORDS[:8] + [word for word in CONTENT]
+    p = np.concatenate((weights, np.full(len(CONTENT), 0.05)))
+    return ' '.join(rng.choice(vocabulary, size=length, p=p / p.sum()))
+
+def test_attributes_texts_to_their_authors():
+    rng = np.random.default_rng(0)
+    styles = {
+        'austen': np.array([8, 6, 1, 1, 3, 3, 2, 1], dtype=float),
+        'brontë': np.array([2, 1, 7, 5, 3, 3, 2, 1], dtype=float),
+        'carroll': np.array([3, 3, 3, 3, 1, 1, 6, 6], dtype=float),
+    }
+    texts, authors = [], []
+    for author, weights in styles.items():
+        for _ in range(5):
+            texts.append(author_text(rng, weights))
+            authors.append(author)
+    attributor = DeltaAttributor(FUNCTION_WORDS).fit(texts, authors)
+    assert "don't" not in attributor.function_words
+    for author, weights in styles.items():
+        query = author_text(rng, weights)
+        for method in ('burrows', 'quadratic', 'cosine'):
+            assert attributor.attribute(query, method)[0][0] == author
+    distances = attributor.distances([author_text(rng, styles['carroll'])], level='text')
+    assert distances.shape == (1, 15)
+    assert attributor.reference_authors[int(distances.argmin())] == 'carroll'
+
+def test_delta_distances_match_reference_formulas():
+    rng = np.random.default_rng(1)
+    queries, candidates = rng.normal(size=(7, 20)), rng.normal(size=(500, 20))
+    np.testing.assert_allclose(delta_distances(queries, candidates, 'burrows'),
+                               cdist(queries, candidates, 'cityblock') / 20)
+    np.testing.assert_allclose(delta_distances(queries, candidates, 'quadratic'),
+                               cdist(queries, candidates, 'sqeuclidean') / 20, atol=1e-12)
+    np.testing.assert_allclose(delta_distances(queries, candidates, 'cosine'),
+                               cdist(queries, candidates, 'cosine'), atol=1e-12)
+
+def test_max_features_keeps_most_frequent_words():
+    attributor = DeltaAttributor(FUNCTION_WORDS, max_features=2)
+    attributor.fit(['the the of it', 'the of of a'], ['x', 'y'])
+    assert attributor.function_words == ['of', 'the']
+    assert attributor.frequencies(['The OF, of.']).tolist() == [[pytest.approx(2 / 3), pytest.approx(1 / 3)]]
@@ -0,0 +1,162 @@
+from src.utils.cache import ExtractionCache, ParseCache
+
+def test_extraction_cache_roundtrip_and_counters(tmp_path, test_pdf):
+    cache = ExtractionCache(str(tmp_path / 'extraction.sqlite'))
+    key = cache.make_key(test_pdf, '1')
+    assert cache.get(key) is None
+    cache.put(key, ['page one', '', 'page three'])
+    assert cache.get(key) == ['page one', '', 'page three']
+    assert cache.make_key(test_pdf, '2') != key
+    stats = cache.stats()
+    assert stats['hits'] == 1 and stats['misses'] == 1 and stats['entries'] == 1
+
+def test_extraction_cache_evicts_least_recently_used(tmp_path):
+    cache = ExtractionCache(str(tmp_path / 'extraction.sqlite'), max_size_bytes=40)
+    cache.put('a', ['a' * 40])
+    cache.put('b', ['b' * 40])
+    cache.get('a')
+    cache.put('c', ['c' * 40])
+    assert cache.get('b') is None
+    assert cache.get('a') is not None and cache.get('c') is not None
+    assert cache.stats()['evictions'] >= 1
+
+def test_parse_cache_skips_the_model(tmp_path):
+    import spacy
+    from spacy.tokens import Doc
+    from src.features.syntactic_features import SyntacticFeatureExtractor
+    from src.utils.cache import ParseCache
+
+    nlp = spacy.blank('en')
+    words = ['She', 'said', 'that', 'he', 'left', '.', 'Dogs', 'bark', '.']
+    heads = [1, 1, 4, 4, 1, 1, 7, 7, 7]
+    deps = ['nsubj', 'ROOT', 'mark', 'nsubj', 'ccomp', 'punct', 'nsubj', 'ROOT', 'punct']
+    pos = ['PRON', 'VERB', 'SCONJ', 'PRON', 'VERB', 'PUNCT', 'NOUN', 'VERB', 'PUNCT']
+    text = "She said that he left . Dogs bark ."
+
+    class FakePipeline:
+        calls = 0
+        def __call__(self, text):
+            FakePipeline.calls += 1
+            return Doc(nlp.vocab, words=words, heads=heads, deps=deps, pos=pos)
+        def pipe(self, texts, **kwargs):
+            return (self(text) for text in texts)
+
+    cache = ParseCache(str(tmp_path / 'parses.sqlite'))
+    first = SyntacticFeatureExtractor(parse_cache=cache)
+    first._nlp = FakePipeline()
+    expected = first.extract_features(text)
+    assert FakePipeline.calls == 1
+
+    second = SyntacticFeatureExtractor(parse_cache=cache)
+    second._nlp = None  # the model would be loaded on a miss
+    assert second.extract_features(text) == expected
+    assert list(second.extract_features_batch([text, text])) == [expected, expected]
+    assert cache.stats()['hits'] == 3
+    assert ParseCache.make_key(text, first.pipeline_version) != ParseCache.make_key(
+        text, SyntacticFeatureExtractor(tier='fast').pipeline_version
+    )
+
+def test_cached_parse_batch_streams_in_groups(tmp_path):
+    import spacy
+    from src.features.syntactic_features import SyntacticFeatureExtractor
+
+    nlp = spacy.blank('en')
+    piped = []
+
+    class FakePipeline:
+        def pipe(self, texts, **kwargs):
+            for text in texts:
+                piped.append(text)
+                yield nlp(text)
+
+    consumed = []
+    def texts():
+        for i in range(7):
+            consumed.append(i)
+            yield f"Text number {i % 5} ."
+
+    extractor = SyntacticFeatureExtractor(parse_cache=ParseCache(str(tmp_path / 'parses.sqlite')))
+    extractor._nlp = FakePipeline()
+    docs = extractor.parse_batch(texts(), batch_size=3)
+    assert next(docs).text == "Text number 0 ."
+    assert consumed == [0, 1, 2]
+    assert [doc.text for doc in docs] == [f"Text number {i % 5} ." for i in range(1, 7)]
+    # Texts 5 and 6 repeat texts 0 and 1, which earlier groups cached
+    assert piped == [f"Text number {i} ." for i in range(5)]
+
+def test_default_cache_paths_ignore_the_working_directory(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.delenv('STILO_CACHE_DIR')
+    monkeypatch.setenv('XDG_CACHE_HOME', str(tmp_path / 'xdg'))
+    assert ExtractionCache().cache_path == tmp_path / 'xdg' / 'stilo' / 'extraction.sqlite'
+    monkeypatch.setenv('STILO_CACHE_DIR', str(tmp_path / 'custom'))
+    assert ParseCache().cache_path == tmp_path / 'custom' / 'parses.sqlite'
+
+def test_page_cache_only_in_incremental_mode(tmp_path):
+    from src.stylometric_analysis_app import StylometricAnalysisApp
+
+    extraction_cache = ExtractionCache(str(tmp_path / 'extraction.sqlite'))
+    assert StylometricAnalysisApp(extraction_cache=extraction_cache).page_cache is None
+    incremental = StylometricAnalysisApp(extraction_cache=extraction_cache, incremental=True)
+    assert incremental.page_cache.cache_path == tmp_path / 'user_cache' / 'page_statistics.sqlite'
+
+def write_pdf(path, page_texts):
+    """Write a minimal PDF with one line of Helvetica text per page."""
+    objects = [b"<< /Type /Catalog /Pages 2 0 R >>", None,
+               b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    kids = []
+    for text in page_texts:
+        content = f"BT /F1 12 Tf 72 720 Td ({text}) Tj ET".encode('latin-1')
+        objects.append(b"<< /Length %d >>\nstream\n%s\nendstream" % (len(content), content))
+        objects.append(b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+                       b"/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>" % len(objects))
+        kids.append(b"%d 0 R" % len(objects))
+    objects[1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (b" ".join(kids), len(kids))
+
+    data = b"%PDF-1.4\n"
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(data))
+        data += b"%d 0 obj\n%s\nendobj\n" % (number, body)
+    xref = len(data)
+    data += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    data += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    data += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+    path.write_bytes(data)
+
+def test_incremental_analysis_reuses_unchanged_pages(tmp_path):
+    import spacy
+    from src.stylometric_analysis_app import StylometricAnalysisApp
+    from src.utils.cache import PageStatisticsCache
+
+    def make_app(incremental):
+        app = StylometricAnalysisApp(
+            extraction_cache=ExtractionCache(str(tmp_path / 'extraction.sqlite')), incremental=incremental,
+            page_cache=PageStatisticsCache(str(tmp_path / 'pages.sqlite')) if incremental else None
+        )
+        app.syntactic_extractor._nlp = spacy.blank('en')
+        app.syntactic_extractor._nlp.add_pipe('sentencizer')
+        return app
+
+    pdf = tmp_path / 'report.pdf'
+    first_page = "The committee met on Monday. Every member attended the long meeting."
+    write_pdf(pdf, [first_page, "Short words win. Nobody objected to the plan!"])
+    assert make_app(True).analyze_document(str(pdf))['metadata']['page_count'] == 2
+
+    write_pdf(pdf, [first_page, "A revised second page now says something different."])
+    app = make_app(True)
+    fingerprints = app.pdf_extractor.page_fingerprints(str(pdf))
+    assert len(set(fingerprints)) == 2
+    incremental = app.analyze_document(str(pdf))
+    assert app.page_cache.stats()['hits'] == 1
+    assert app.page_cache.stats()['misses'] == 1
+
+    full = make_app(False).analyze_document(str(pdf))
+    assert full['features']['readability']['flesch_reading_ease'] != 0
+    for group in ('lexical', 'structural', 'readability'):
+        assert incremental['features'][group] == full['features'][group], group
+
+    again = make_app(True)
+    assert again.analyze_document(str(pdf))['features'] == incremental['features']
+    assert again.page_cache.stats()['hits'] == 2
+    assert again.page_cache.stats()['misses'] == 0
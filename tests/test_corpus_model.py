@@ -0,0 +1,57 @@
+import json
+import numpy as np
+from src.models.corpus_model import STYLE_COLUMNS, CorpusStyleModel
+
+def corpus(rng, documents=3000):
+    """Three well separated styles with a few missing features."""
+    centers = rng.normal(scale=10, size=(3, len(STYLE_COLUMNS)))
+    labels = rng.integers(0, 3, documents)
+    features = centers[labels] + rng.normal(size=(documents, len(STYLE_COLUMNS)))
+    features[rng.random(features.shape) < 0.01] = np.nan
+    return features, labels
+
+def same_partition(a, b):
+    pairs = set(zip(a.tolist(), b.tolist()))
+    return len(pairs) == len(set(a.tolist())) == len(set(b.tolist()))
+
+def test_streamed_fit_recovers_styles_and_persists(tmp_path):
+    features, labels = corpus(np.random.default_rng(0))
+    model = CorpusStyleModel(n_clusters=3, batch_size=256)
+    model.fit(lambda: (features[i:i + 100] for i in range(0, len(features), 100)))
+    assert model.documents == len(features)
+    assert same_partition(model.predict(features), labels)
+
+    path = tmp_path / 'model.joblib'
+    model.save(str(path))
+    loaded = CorpusStyleModel.load(str(path))
+    np.testing.assert_allclose(loaded.project(features[:10]), model.project(features[:10]))
+
+    groups = {'lexical': dict(zip(STYLE_COLUMNS[:5], features[0, :5])),
+              'other': dict(zip(STYLE_COLUMNS[5:], features[0, 5:]))}
+    assigned = loaded.assign(groups)
+    assert assigned['cluster'] == model.predict(features[:1])[0]
+    assert len(assigned['projection']) == 2
+
+def test_partial_fit_buffers_rows():
+    features, labels = corpus(np.random.default_rng(1))
+    model = CorpusStyleModel(n_clusters=3, batch_size=500)
+    for row in features[:400]:
+        model.partial_fit(row[np.newaxis, :])
+    assert not model.is_fitted and model.documents == 0
+    model.partial_fit(features[400:]).flush()
+    assert model.documents == len(features)
+    assert same_partition(model.predict(features), labels)
+
+def test_corpus_model_command(tmp_path):
+    from src.main import main
+
+    features, _ = corpus(np.random.default_rng(2), documents=60)
+    for index, row in enumerate(features):
+        results = {'metadata': {}, 'features': {'all': dict(zip(STYLE_COLUMNS, np.nan_to_num(row).tolist()))}}
+        (tmp_path / f'{index}.json').write_text(json.dumps(results))
+    (tmp_path / 'failed.json').write_text(json.dumps({'metadata': {'error': 'x'}, 'features': {}}))
+    model_path = tmp_path / 'model.joblib'
+    main(['corpus-model', str(tmp_path), '--model', str(model_path), '--clusters', '3', '--batch-size', '16'])
+    assert CorpusStyleModel.load(str(model_path)).documents == 60
+    main(['corpus-model', str(tmp_path), '--model', str(model_path), '--update'])
+    assert CorpusStyleModel.load(str(model_path)).documents == 120
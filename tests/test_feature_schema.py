@@ -0,0 +1,68 @@
+import numpy as np
+import pytest
+import spacy
+from spacy.tokens import Doc
+from src.features.lexical_features import LexicalFeatureExtractor
+from src.features.readability_features import ReadabilityAnalyzer
+from src.features.schema import FeatureSchema, feature_schema, register_schema
+from src.features.statistics import SyntacticStatistics
+from src.features.structural_features import StructuralFeatureExtractor
+from src.ml.feature_processor import FeatureProcessor
+
+TEXT = "The quick brown fox jumps over the lazy dog.\n\nIt was not amused. Naïve café owners cheered."
+
+def test_extractors_write_into_a_preallocated_row():
+    schema = feature_schema()
+    matrix = schema.empty(2)
+    lexical = LexicalFeatureExtractor().extract_features(TEXT, out=matrix[1])
+    structural = StructuralFeatureExtractor().extract_features(TEXT, out=matrix[1])
+    readability = ReadabilityAnalyzer().analyze(TEXT, out=matrix[1])
+    assert np.isnan(matrix[0]).all()
+
+    view = schema.view(matrix[1])
+    expected = {**lexical, **structural, **readability}
+    # Frequencies of letters outside a-z are not part of the schema
+    assert set(view) == set(expected) - {'freq_ï', 'freq_é'}
+    for name in view:
+        assert view[name] == pytest.approx(expected[name], rel=1e-6)
+    assert view.to_dict()['syntactic'] == {}
+    with pytest.raises(KeyError):
+        view['pos_noun']
+
+def test_syntactic_features_fit_the_schema():
+    vocab = spacy.blank('en').vocab
+    doc = Doc(vocab, words=['Dogs', 'bark', 'loudly', '.'], pos=['NOUN', 'VERB', 'ADV', 'PUNCT'],
+              deps=['nsubj', 'ROOT', 'advmod', 'punct'], heads=[1, 1, 1, 1], sent_starts=[1, 0, 0, 0])
+    features = SyntacticStatistics.from_doc(doc).finalize()
+    schema = feature_schema()
+    assert schema.write(features, schema.empty()) == 0
+    assert 'dep_root' in features
+
+def test_encode_batch_and_decode_round_trip():
+    schema = feature_schema()
+    results = [
+        {'lexical': {'avg_word_length': 4.5, 'freq_a': 0.1}, 'readability': {'lix': 30.0}},
+        {'structural': {'paragraph_count': 3}, 'syntactic': {}},
+    ]
+    matrix = schema.encode_batch(results)
+    assert matrix.shape == (2, len(schema)) and matrix.dtype == np.float32
+    assert schema.decode(matrix[0]) == {
+        'lexical': {'avg_word_length': 4.5, 'freq_a': pytest.approx(0.1)},
+        'syntactic': {}, 'structural': {}, 'readability': {'lix': 30.0}
+    }
+    row = schema.encode(results[1], out=matrix[0])
+    assert row.base is matrix and dict(schema.view(matrix[0])) == {'paragraph_count': 3.0}
+
+    frame = FeatureProcessor().feature_matrix({'features': groups} for groups in results)
+    assert list(frame.columns) == list(schema.columns) and frame.shape == (2, len(schema))
+
+def test_schema_registry_is_versioned():
+    current = feature_schema()
+    assert len(current.fingerprint) == 16
+    register_schema(current)
+    with pytest.raises(ValueError):
+        register_schema(FeatureSchema({'lexical': ('avg_word_length',)}, current.version))
+    with pytest.raises(ValueError):
+        FeatureSchema({'a': ('x',), 'b': ('x',)}, 99)
+    with pytest.raises(ValueError):
+        feature_schema(current.version + 1000)
@@ -0,0 +1,83 @@
+import numpy as np
+import pytest
+from src.features.schema import FeatureSchema
+from src.utils.data_exporter import DataExporter
+from src.utils.feature_store import ANALYSIS_COLUMNS, FeatureStore
+
+def make_result(filename, words, complexity=0.5, classification='Academic'):
+    return {
+        'metadata': {'filename': filename, 'page_count': 2},
+        'analysis': {
+            'style_metrics': {'complexity': {'score': complexity}, 'consistency': {'score': 0.25},
+                              'classification': classification},
+            'writing_patterns': {'vocabulary_usage': 'Rich'}
+        },
+        'features': {'lexical': {'avg_word_length': words, 'freq_a': 0.1, 'freq_é': 0.01},
+                     'syntactic': {}, 'structural': {'paragraph_count': 3}, 'readability': {'lix': 40.0}}
+    }
+
+def test_appends_are_readable_as_memory_mapped_columns(tmp_path):
+    store = FeatureStore(str(tmp_path / 'store'))
+    assert store.columns[-len(ANALYSIS_COLUMNS):] == ANALYSIS_COLUMNS
+    failed = {'metadata': {'error': 'unreadable', 'filename': 'bad.pdf'}, 'features': {}}
+    assert store.append_results([make_result('a.pdf', 4.0), failed, make_result('b.pdf', 5.0)]) == 2
+    assert store.append_results([make_result('a.pdf', 6.0, complexity=0.9)]) == 1
+
+    words = store.column('avg_word_length')
+    assert isinstance(words, np.memmap) and words.dtype == np.float32
+    assert words.tolist() == [4.0, 5.0, 6.0]
+    assert np.isnan(store.column('pos_noun')).all()
+    assert store.read(['style_complexity'], rows=slice(1, 3))['style_complexity'].tolist() == \
+        pytest.approx([0.5, 0.9])
+    assert store.index == {'a.pdf': 2, 'b.pdf': 1}
+    assert store.latest_rows().tolist() == [1, 2]
+    assert store.rows_of(['b.pdf', 'missing.pdf']).tolist() == [1, -1]
+    assert store.metadata([2])[0] == {'filename': 'a.pdf', 'page_count': 2,
+                                      'style_classification': 'Academic', 'vocabulary_usage': 'Rich'}
+    assert dict(store.vector('a.pdf')) == {'avg_word_length': 6.0, 'freq_a': pytest.approx(0.1),
+                                           'paragraph_count': 3.0, 'lix': 40.0}
+    frame = store.frame(['avg_word_length', 'lix'], rows=store.latest_rows())
+    assert frame.index.tolist() == ['b.pdf', 'a.pdf'] and frame['avg_word_length'].tolist() == [5.0, 6.0]
+    assert store.matrix(['lix', 'paragraph_count']).shape == (3, 2)
+    store.close()
+
+    reopened = FeatureStore(str(tmp_path / 'store'))
+    assert len(reopened) == 3 and reopened.doc_ids() == ['a.pdf', 'b.pdf', 'a.pdf']
+    reopened.close()
+
+def test_interrupted_append_is_invisible_and_overwritten(tmp_path):
+    path = tmp_path / 'store'
+    store = FeatureStore(str(path))
+    store.append_results([make_result('a.pdf', 4.0)])
+    # An append that wrote data and metadata but never committed its manifest
+    with open(path / 'columns' / '00000.f32', 'ab') as f:
+        f.write(np.array([99.0, 99.0], dtype='<f4').tobytes())
+    with store._conn:
+        store._conn.execute("INSERT INTO documents VALUES (5, 'ghost.pdf', '{}')")
+    store.close()
+
+    store = FeatureStore(str(path))
+    assert len(store) == 1 and 'ghost.pdf' not in store
+    store.append_results([make_result('b.pdf', 5.0)])
+    assert store.column('avg_word_length').tolist() == [4.0, 5.0]
+    assert store.doc_ids() == ['a.pdf', 'b.pdf']
+    store.close()
+
+def test_store_rejects_another_schema(tmp_path):
+    FeatureStore(str(tmp_path / 'store')).close()
+    with pytest.raises(ValueError):
+        FeatureStore(str(tmp_path / 'store'), schema=FeatureSchema({'lexical': ('avg_word_length',)}, 1))
+
+def test_reader_sees_new_rows_after_refresh(tmp_path):
+    writer = FeatureStore(str(tmp_path / 'store'))
+    reader = FeatureStore(str(tmp_path / 'store'))
+    writer.append_results([make_result('a.pdf', 4.0)])
+    assert len(reader) == 0
+    reader.refresh()
+    assert reader.column('avg_word_length').tolist() == [4.0] and 'a.pdf' in reader
+
+def test_data_exporter_appends_to_the_store(tmp_path):
+    exporter = DataExporter(str(tmp_path / 'data'))
+    path = exporter.export_to_store([make_result('a.pdf', 4.0), make_result('b.pdf', 5.0)], ['x', 'y'])
+    store = FeatureStore(path)
+    assert store.doc_ids() == ['x', 'y']
@@ -0,0 +1,19 @@
+import pytest
+from src.features.lexical_features import LexicalFeatureExtractor
+
+TEXTS = [
+    "",
+    "The cat sat on the mat. The cat, the mat!",
+    "Ünïcode wörds and ÜNÏCODE WÖRDS, 日本語 text; once once twice.",
+    "İstanbul lowercases to more code points than it has.",
+]
+
+@pytest.mark.parametrize('text', TEXTS)
+def test_backends_produce_identical_features(text):
+    vectorized = LexicalFeatureExtractor(backend='numpy').extract_features(text)
+    reference = LexicalFeatureExtractor(backend='python').extract_features(text)
+    assert vectorized == reference
+
+def test_unknown_backend_is_rejected():
+    with pytest.raises(ValueError):
+        LexicalFeatureExtractor(backend='cuda')
@@ -0,0 +1,35 @@
+import numpy as np
+import pytest
+from src.features.ngram_features import NgramFeatureExtractor
+from src.preprocessing.tokenized_document import TokenizedDocument
+
+def test_equal_ngrams_share_buckets_regardless_of_position():
+    extractor = NgramFeatureExtractor(char_range=(3, 3), word_range=None, norm=None,
+                                      alternate_sign=False)
+    vector = extractor.extract_features("abc abc")
+    # 'abc' twice, 'bc ', 'c a', ' ab' once each
+    assert sorted(vector.data.tolist()) == [1, 1, 1, 2]
+
+def test_case_and_whitespace_are_normalized():
+    extractor = NgramFeatureExtractor()
+    first = extractor.extract_features("The quick\nbrown fox")
+    second = extractor.extract_features(TokenizedDocument("the QUICK brown\tfox"))
+    assert (first != second).nnz == 0
+
+def test_word_ngrams_count_every_window():
+    extractor = NgramFeatureExtractor(char_range=None, word_range=(1, 3), norm=None,
+                                      alternate_sign=False, n_features=1 << 20)
+    vector = extractor.extract_features("one two three four")
+    assert vector.sum() == 4 + 3 + 2
+
+def test_transform_stacks_fixed_width_rows():
+    extractor = NgramFeatureExtractor(n_features=1024)
+    matrix = extractor.transform(["First document.", "", "A second, longer document."])
+    assert matrix.shape == (3, 1024)
+    assert matrix[1].nnz == 0
+    norms = np.sqrt(np.asarray(matrix.multiply(matrix).sum(axis=1)).ravel())
+    assert norms[[0, 2]] == pytest.approx([1, 1], abs=1e-6)
+
+def test_invalid_range_rejected():
+    with pytest.raises(ValueError):
+        NgramFeatureExtractor(char_range=(3, 2))
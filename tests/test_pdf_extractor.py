@@ -0,0 +1,64 @@
+from src.preprocessing.pdf_extractor import PDFExtractor, _looks_broken
+
+def test_parallel_extraction_matches_serial(test_pdf):
+    serial = PDFExtractor(max_workers=1).extract_text(test_pdf)
+    parallel = PDFExtractor(max_workers=2, chunk_size=1, parallel_threshold=1).extract_text(test_pdf)
+    assert parallel == serial
+    assert serial
+
+def test_iter_pages_streams_numbered_pages(test_pdf):
+    extractor = PDFExtractor(max_workers=1)
+    pages = list(extractor.iter_pages(test_pdf))
+    assert [number for number, _ in pages] == list(range(1, len(pages) + 1))
+    assert extractor.get_page_count() == len(pages)
+    assert '\n'.join(text for _, text in pages if text) == extractor.extract_text(test_pdf)
+
+def test_fast_strategy_reports_tier_per_page(test_pdf):
+    extractor = PDFExtractor(max_workers=1, strategy='fast')
+    pages = extractor.extract_pages(test_pdf)
+    report = extractor.get_extraction_report()
+    assert len(report) == len(pages) == extractor.get_page_count()
+    assert all(entry['tier'] in ('fast', 'layout', 'empty') for entry in report)
+    assert all(entry['tier'] == 'empty' for entry in report if not entry['has_text_layer'])
+    assert all(entry['chars'] == len(text) for entry, text in zip(report, pages))
+    assert extractor.cache_version != PDFExtractor(strategy='layout').cache_version
+
+def test_empty_fast_text_looks_broken():
+    assert _looks_broken('', min_chars=0)
+    assert not _looks_broken('A usable line of text.', min_chars=0)
+
+def test_short_document_is_opened_once(test_pdf, monkeypatch):
+    import pdfplumber
+    opened = []
+    original_open = pdfplumber.open
+
+    def counting_open(*args, **kwargs):
+        opened.append(args[0])
+        return original_open(*args, **kwargs)
+
+    monkeypatch.setattr(pdfplumber, 'open', counting_open)
+    extractor = PDFExtractor(max_workers=2, parallel_threshold=10**6)
+    pages = extractor.extract_pages(test_pdf)
+    assert len(opened) == 1
+    assert extractor.get_page_count() == len(pages)
+    assert extractor.extract_text(test_pdf) == PDFExtractor(max_workers=1).extract_text(test_pdf)
+
+def test_pages_without_text_layer_skip_the_layout_tier(tmp_path, monkeypatch):
+    import pdfplumber
+    from PyPDF2 import PdfWriter
+
+    writer = PdfWriter()
+    writer.add_blank_page(width=200, height=200)
+    path = tmp_path / 'scanned.pdf'
+    with open(path, 'wb') as f:
+        writer.write(f)
+
+    def failing_open(*args, **kwargs):
+        raise AssertionError("pdfplumber opened for a page without a text layer")
+
+    monkeypatch.setattr(pdfplumber, 'open', failing_open)
+    extractor = PDFExtractor(max_workers=1, strategy='fast')
+    assert extractor.extract_pages(str(path)) == ['']
+    assert extractor.get_extraction_report() == [
+        {'page': 1, 'has_text_layer': False, 'tier': 'empty', 'chars': 0}
+    ]
@@ -0,0 +1,37 @@
+import math
+import pytest
+from src.features.readability_features import ReadabilityAnalyzer
+from src.features.readability_formulas import READABILITY_METRICS, WordSet, readability_scores
+from src.features.statistics import ReadabilityStatistics
+from src.preprocessing.tokenized_document import TokenizedDocument
+
+def test_counts_record_from_one_pass(tmp_path):
+    analyzer = ReadabilityAnalyzer(lexicon_path=str(tmp_path / 'missing.bin'))
+    doc = TokenizedDocument("The cat sat (quietly)! Extraordinary circumstances, Mr. Smith's dog.")
+    easy_words = WordSet(['the', 'cat', 'sat', 'dog', "mr."])
+    stats = ReadabilityStatistics.from_document(doc, analyzer.syllable_counter, easy_words)
+    counts = stats.counts()
+    assert counts['words'] == 9 and counts['sentences'] == 3
+    # quietly, extraordinary, circumstances, smith's
+    assert counts['difficult_words'] == 4
+    # the same words, as their cores are longer than six characters
+    assert counts['long_words'] == 4
+
+def test_formulas_from_counts():
+    scores = readability_scores(words=100, sentences=5, syllables=150, polysyllables=10,
+                                long_words=20, difficult_words=8, characters=450)
+    assert list(scores) == list(READABILITY_METRICS)
+    assert scores['dale_chall_score'] == pytest.approx(0.1579 * 8 + 0.0496 * 20 + 3.6365)
+    assert scores['coleman_liau_index'] == pytest.approx(0.0588 * 450 - 0.296 * 5 - 15.8)
+    assert scores['lix'] == pytest.approx(20 + 20)
+    assert scores['rix'] == pytest.approx(4)
+    assert scores['linsear_write'] == pytest.approx((90 + 30) / 5 / 2)
+    assert scores['smog_index'] == pytest.approx(1.0430 * math.sqrt(10 * 30 / 5) + 3.1291)
+    empty = readability_scores(0, 0, 0, 0, 0, 0, 0)
+    assert all(value == 0 for value in empty.values())
+
+def test_dale_chall_list_is_loaded():
+    metrics = ReadabilityAnalyzer().analyze("The boy ran home. It was a good day.")
+    assert set(READABILITY_METRICS) <= set(metrics)
+    # every word is on the Dale-Chall list
+    assert metrics['dale_chall_score'] == pytest.approx(0.0496 * 4.5)
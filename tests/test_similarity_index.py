@@ -0,0 +1,71 @@
+import json
+import numpy as np
+import pytest
+from src.models.similarity_index import StyleSimilarityIndex
+
+COLUMNS = tuple(f'f{i}' for i in range(6))
+
+def brute_force(index, vectors, ids, point, k):
+    mean, scale = np.nanmean(vectors, axis=0), np.nanstd(vectors, axis=0)
+    distances = np.linalg.norm(np.nan_to_num((vectors - mean) / scale) - (point - mean) / scale, axis=1)
+    return [ids[i] for i in np.argsort(distances, kind='stable')[:k]]
+
+@pytest.mark.parametrize('method', ['exact', 'lsh'])
+def test_queries_match_brute_force(method):
+    rng = np.random.default_rng(0)
+    vectors = rng.normal(size=(2000, len(COLUMNS))) * [1, 10, 100, 1, 1, 1]
+    ids = [f'doc{i}' for i in range(len(vectors))]
+    index = StyleSimilarityIndex(COLUMNS, method=method)
+    index.add(ids, vectors)
+    for point in vectors[:20] + rng.normal(scale=0.01, size=(20, len(COLUMNS))):
+        found = [doc_id for doc_id, _ in index.query(point, k=5)]
+        expected = brute_force(index, vectors, ids, point, 5)
+        if method == 'exact':
+            assert found == expected
+        else:
+            assert found[0] == expected[0]
+
+def test_add_remove_replace_and_persist(tmp_path):
+    rng = np.random.default_rng(1)
+    vectors = rng.normal(size=(300, len(COLUMNS)))
+    index = StyleSimilarityIndex(COLUMNS)
+    index.add([f'doc{i}' for i in range(300)], vectors)
+    assert index.query_id('doc7', k=3)[0][0] != 'doc7'
+
+    # Changes after the build are seen without a rebuild
+    index.add('new', vectors[7] + 1e-6)
+    assert index.query_id('doc7', k=1)[0][0] == 'new'
+    assert index.remove(['new', 'missing']) == 1
+    assert 'new' not in index and len(index) == 300
+    assert all(doc_id != 'new' for doc_id, _ in index.query(vectors[7], k=5))
+    index.add('doc7', vectors[8])
+    assert len(index) == 300
+    assert index.query(vectors[8], k=2)[0][1] == pytest.approx(0)
+
+    path = tmp_path / 'index.joblib'
+    index.save(str(path))
+    loaded = StyleSimilarityIndex.load(str(path))
+    assert loaded.query(vectors[3], k=4) == index.query(vectors[3], k=4)
+    assert StyleSimilarityIndex(COLUMNS).query(vectors[0]) == []
+
+def test_index_command(tmp_path, capsys):
+    from src.main import main
+    from src.models.corpus_model import STYLE_COLUMNS
+
+    rng = np.random.default_rng(2)
+    folder = tmp_path / 'results'
+    folder.mkdir()
+    for i, row in enumerate(rng.normal(size=(30, len(STYLE_COLUMNS)))):
+        features = {'all': dict(zip(STYLE_COLUMNS, row.tolist()))}
+        results = {'metadata': {'filename': f'doc{i}.pdf'}, 'features': features}
+        (folder / f'doc{i}.json').write_text(json.dumps(results))
+    index_path = str(tmp_path / 'index.joblib')
+
+    main(['index', '--index', index_path, 'add', str(folder)])
+    main(['index', '--index', index_path, 'query', str(folder / 'doc3.json'), '-k', '3'])
+    lines = capsys.readouterr().out.splitlines()
+    assert len(lines) == 3 and all('doc3.pdf' not in line for line in lines)
+    main(['index', '--index', index_path, 'remove', 'doc0.pdf'])
+    main(['index', '--index', index_path, 'query', 'doc1.pdf', '-k', '40'])
+    lines = capsys.readouterr().out.splitlines()
+    assert len(lines) == 28
@@ -0,0 +1,68 @@
+import numpy as np
+import pytest
+from src.features.hashing import mix64
+from src.features.sketches import HyperLogLog, VocabularySketch
+from src.features.statistics import LexicalStatistics, split_text
+from src.features.lexical_features import LexicalFeatureExtractor
+
+def random_hashes(size, seed=0):
+    return mix64(np.random.default_rng(seed).integers(0, 2**63, size=size, dtype=np.uint64))
+
+def test_hyperloglog_estimate_within_error_bound():
+    sketch = HyperLogLog()
+    sketch.add(random_hashes(200000))
+    assert abs(sketch.estimate() / 200000 - 1) < 4 * sketch.relative_error
+
+def test_vocabulary_sketch_is_exact_until_sample_fills():
+    words = np.array([1, 2, 2, 3, 3, 3, 4], dtype=np.uint64)
+    sketch = VocabularySketch()
+    sketch.add(mix64(words))
+    assert sketch.is_exact
+    assert sketch.type_count() == 4
+    assert sketch.hapax_count() == 2
+    assert sketch.error_bounds()['type_count'] == 0
+
+def test_merged_shards_equal_single_pass():
+    hashes = random_hashes(100000, seed=1) % np.uint64(30000)
+    hashes = mix64(hashes)
+    whole = VocabularySketch()
+    whole.add(hashes)
+    merged = VocabularySketch()
+    for shard in np.array_split(hashes, 5):
+        part = VocabularySketch()
+        part.add(shard)
+        merged = merged.merge(VocabularySketch.from_dict(part.to_dict()))
+    assert not whole.is_exact
+    assert np.array_equal(whole.distinct.registers, merged.distinct.registers)
+    assert np.array_equal(whole.sample.values, merged.sample.values)
+    assert np.array_equal(whole.sample.counts, merged.sample.counts)
+    assert merged.hapax_count() == pytest.approx(whole.hapax_count())
+
+def test_approximate_statistics_merge_like_the_extractor():
+    text = ' '.join(f"word{i % 9000} filler{i % 7}" for i in range(30000))
+    expected = LexicalFeatureExtractor(vocabulary_mode='approximate').extract_features(text)
+    stats = LexicalStatistics('approximate')
+    for chunk in split_text(text, 20000):
+        stats.update(chunk)
+    assert stats.finalize() == expected
+
+    exact = LexicalFeatureExtractor().extract_features(text)
+    assert expected['type_token_ratio'] == pytest.approx(exact['type_token_ratio'], rel=0.04)
+
+def test_sample_of_exactly_k_words_stays_exact():
+    sketch = VocabularySketch(sample_size=8)
+    sketch.add(random_hashes(8, seed=2))
+    assert sketch.is_exact
+    assert sketch.type_count() == 8
+    sketch.add(random_hashes(9, seed=2))
+    assert not sketch.is_exact
+
+def test_statistics_use_the_extractor_sketch_settings():
+    text = ' '.join(f"word{i % 3000}" for i in range(10000))
+    extractor = LexicalFeatureExtractor(vocabulary_mode='approximate', sketch_precision=10, sketch_sample_size=256)
+    stats = LexicalStatistics('approximate', sketch_precision=10, sketch_sample_size=256)
+    for chunk in split_text(text, 5000):
+        stats.update(chunk)
+    restored = LexicalStatistics.from_dict(stats.to_dict())
+    assert restored.vocabulary.sample.k == 256
+    assert restored.finalize() == extractor.extract_features(text)
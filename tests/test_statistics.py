@@ -0,0 +1,56 @@
+from src.features.statistics import (
+    LexicalStatistics, StructuralStatistics, ReadabilityStatistics, SEPARATOR, split_text
+)
+from src.features.lexical_features import LexicalFeatureExtractor
+from src.features.structural_features import StructuralFeatureExtractor
+from src.features.readability_features import ReadabilityAnalyzer
+
+CHUNKS = [
+    "The first page ends mid sentence",
+    "and the second continues it. A new paragraph\n\nstarts here!  ",
+    "\n\nThird page... Is it? Yes.",
+    "   ",
+    "Done"
+]
+
+def assert_same_features(merged, expected):
+    # Means and variances come from exact sums, so merging is not approximate
+    assert merged == expected
+
+def test_merged_statistics_match_whole_text_features():
+    text = ' '.join(CHUNKS)
+    analyzer = ReadabilityAnalyzer()
+    lexical, structural, readability = LexicalStatistics(), StructuralStatistics(), ReadabilityStatistics()
+    for chunk in CHUNKS:
+        lexical.update(chunk)
+        structural.update(chunk)
+        readability.update(chunk, analyzer._count_syllables)
+
+    assert_same_features(lexical.finalize(), LexicalFeatureExtractor().extract_features(text))
+    assert_same_features(structural.finalize(), StructuralFeatureExtractor().extract_features(text))
+    assert_same_features(readability.finalize(analyzer), analyzer.analyze(text))
+
+def test_statistics_survive_serialization():
+    stats = StructuralStatistics.from_text(CHUNKS[1]).merge(StructuralStatistics.from_text(CHUNKS[2]))
+    restored = StructuralStatistics.from_dict(stats.to_dict())
+    assert restored.finalize() == stats.finalize()
+
+def test_split_text_round_trips():
+    text = ' '.join(CHUNKS) * 3
+    for chunk_size in (1, 7, 40, 1000):
+        assert SEPARATOR.join(split_text(text, chunk_size)) == text
+
+def test_parallel_map_reduce_matches_single_pass(tmp_path):
+    from src.stylometric_analysis_app import StylometricAnalysisApp
+    from src.utils.cache import ExtractionCache, PageStatisticsCache
+
+    app = StylometricAnalysisApp(
+        extraction_cache=ExtractionCache(str(tmp_path / 'extraction.sqlite')),
+        page_cache=PageStatisticsCache(str(tmp_path / 'pages.sqlite')),
+        workers=2, chunk_size=25
+    )
+    text = ' '.join(CHUNKS) * 4
+    reduced = app._map_reduce_features(text)
+    assert reduced['lexical'] == app.lexical_extractor.extract_features(text)
+    assert reduced['structural'] == app.structural_extractor.extract_features(text)
+    assert reduced['readability'] == app.readability_analyzer.analyze(text)
@@ -0,0 +1,43 @@
+import numpy as np
+import pytest
+from src.models.stylometric_model import CATEGORIES, SCORING_COLUMNS, StylometricAnalyzer
+
+def random_groups(rng):
+    lexical = {'vocabulary_richness': rng.choice([0.3, 0.7, rng.random()]), 'type_token_ratio': rng.random()}
+    syntactic = {'sentence_complexity': rng.choice([0.3, 0.7, rng.random(), rng.random() * 60])}
+    structural = {'structure_consistency': rng.choice([0.3, 0.7, rng.random()])}
+    readability = {'flesch_reading_ease': rng.uniform(-20, 120), 'gunning_fog': rng.uniform(0, 25)}
+    return lexical, syntactic, structural, readability
+
+def test_batch_matches_single_document_analysis():
+    rng = np.random.default_rng(0)
+    analyzer = StylometricAnalyzer()
+    groups = [random_groups(rng) for _ in range(300)]
+    # Extra columns in any order are ignored
+    columns = ('extra',) + tuple(reversed(SCORING_COLUMNS))
+    matrix = np.vstack([analyzer.feature_row(*group, columns=columns) for group in groups])
+    batch = analyzer.analyze_batch(matrix, columns)
+
+    for row, group in enumerate(groups):
+        analysis = analyzer.analyze(*group)['analysis']
+        style, patterns, summary = analysis['style_metrics'], analysis['writing_patterns'], analysis['summary_metrics']
+        label = lambda name: CATEGORIES[name][batch[name][row]]
+        assert round(batch['complexity_score'][row], 2) == style['complexity']['score']
+        assert label('complexity_level') == style['complexity']['level']
+        assert label('consistency_level') == style['consistency']['level']
+        assert label('classification') == style['classification']
+        assert label('vocabulary_usage') == patterns['vocabulary_usage']
+        assert label('sentence_structure') == patterns['sentence_structure']
+        assert label('text_organization') == patterns['text_organization']
+        for name in ('readability', 'vocabulary', 'structure'):
+            assert round(batch[f'{name}_score'][row], 2) == summary[name]['score']
+            assert label(f'{name}_interpretation') == summary[name]['interpretation']
+
+def test_batch_treats_missing_features_as_zero():
+    analyzer = StylometricAnalyzer()
+    batch = analyzer.analyze_batch(np.full((2, len(SCORING_COLUMNS)), np.nan))
+    single = analyzer.analyze({}, {}, {}, {})['analysis']
+    classification = single['style_metrics']['classification']
+    assert analyzer.labels('classification', batch['classification']).tolist() == [classification] * 2
+    with pytest.raises(ValueError):
+        analyzer.analyze_batch(np.zeros((2, 3)), ('a', 'b', 'c'))
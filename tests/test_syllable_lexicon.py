@@ -0,0 +1,54 @@
+from src.features.readability_features import ReadabilityAnalyzer
+from src.features.statistics import ReadabilityStatistics
+from src.features.syllable_lexicon import (
+    SyllableCounter, SyllableLexicon, build_lexicon, default_lexicon_path, heuristic_syllables, word_core
+)
+from src.preprocessing.tokenized_document import TokenizedDocument
+
+ENTRIES = {'the': 1, 'fire': 2, 'beautiful': 3, "don't": 1, 'area': 3}
+
+def test_lexicon_lookup_strips_punctuation_and_case(tmp_path):
+    path = tmp_path / 'syllables.bin'
+    assert build_lexicon(ENTRIES, str(path)) == len(ENTRIES)
+    counter = SyllableCounter(SyllableLexicon(str(path)))
+    doc = TokenizedDocument("The fire, \"Beautiful!\" Don't area unknownish -- fire")
+    counts = counter.count_tokens(doc)
+    assert counts.tolist() == [1, 2, 3, 1, 3, heuristic_syllables('unknownish'), 1, 2]
+    assert counts.tolist() == [counter.count(token) for token in doc.tokens()]
+
+def test_heuristic_only_without_lexicon():
+    counter = SyllableCounter()
+    doc = TokenizedDocument("Readability formulas count syllables, syllables again.")
+    assert counter.count_tokens(doc).tolist() == [heuristic_syllables(word_core(token)) for token in doc.tokens()]
+
+def test_heuristic_counts_the_stripped_word(tmp_path):
+    # A trailing period must not hide the silent e
+    doc = TokenizedDocument('"There." -- there')
+    assert SyllableCounter().count_tokens(doc).tolist() == [1, 1, 1]
+    path = tmp_path / 'syllables.bin'
+    build_lexicon(ENTRIES, str(path))
+    counter = SyllableCounter(SyllableLexicon(str(path)))
+    assert counter.count_tokens(doc).tolist() == [1, 1, 1]
+    assert [counter.count(token) for token in doc.tokens()] == [1, 1, 1]
+    assert SyllableCounter().count('(there!)') == 1
+
+def test_default_lexicon_ignores_the_working_directory(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    build_lexicon(ENTRIES)
+    assert default_lexicon_path() == str(tmp_path / 'user_data' / 'syllable_lexicon.bin')
+    assert ReadabilityAnalyzer().syllable_counter.lexicon is not None
+
+def test_heuristic_cache_is_bounded():
+    counter = SyllableCounter(cache_size=8)
+    counter.count_tokens(TokenizedDocument(' '.join(f'word{i}' for i in range(100))))
+    assert counter._heuristic.cache_info().currsize == 8
+
+def test_statistics_match_per_token_counting(tmp_path):
+    path = tmp_path / 'syllables.bin'
+    build_lexicon(ENTRIES, str(path))
+    analyzer = ReadabilityAnalyzer(lexicon_path=str(path))
+    doc = TokenizedDocument("The beautiful fire burned. The area was unknownish!")
+    vectorized = ReadabilityStatistics.from_document(doc, analyzer.syllable_counter)
+    per_token = ReadabilityStatistics.from_document(doc, analyzer._count_syllables)
+    assert vectorized.to_dict() == per_token.to_dict()
+    assert ReadabilityAnalyzer(lexicon_path=str(tmp_path / 'missing.bin')).syllable_counter.lexicon is None
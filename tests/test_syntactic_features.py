@@ -0,0 +1,115 @@
+import pytest
+import spacy
+from collections import Counter
+from spacy.tokens import Doc
+from src.features.syntactic_features import SyntacticFeatureExtractor
+from src.preprocessing.tokenized_document import TokenizedDocument
+from src.stylometric_analysis_app import StylometricAnalysisApp
+from src.utils.cache import ExtractionCache, PageStatisticsCache
+
+@pytest.fixture
+def extractor():
+    # A blank pipeline keeps the tests independent of installed models
+    extractor = SyntacticFeatureExtractor()
+    extractor._nlp = spacy.blank('en')
+    extractor._nlp.add_pipe('sentencizer')
+    return extractor
+
+TEXTS = [
+    "A short one.",
+    "Two sentences here. And a second, longer sentence follows it.",
+    "",
+    "Three. Very. Short.",
+]
+
+def test_batch_matches_single_documents_in_order(extractor):
+    batched = list(extractor.extract_features_batch(TEXTS, batch_size=2))
+    assert batched == [extractor.extract_features(text) for text in TEXTS]
+
+def test_batch_accepts_tokenized_documents(extractor):
+    docs = [TokenizedDocument(text) for text in TEXTS]
+    assert list(extractor.extract_features_batch(docs)) == list(extractor.extract_features_batch(TEXTS))
+
+def test_analyze_documents_keeps_order_and_isolates_failures(extractor, test_pdf, tmp_path):
+    app = StylometricAnalysisApp(
+        extraction_cache=ExtractionCache(str(tmp_path / 'extraction.sqlite')),
+        page_cache=PageStatisticsCache(str(tmp_path / 'pages.sqlite')),
+        parse_batch_size=2
+    )
+    app.syntactic_extractor = extractor
+    missing = str(tmp_path / 'missing.pdf')
+    results = app.analyze_documents([test_pdf, missing, test_pdf])
+    assert [result['metadata'].get('error') is None for result in results] == [True, False, True]
+    single = app.analyze_document(test_pdf)
+    assert results[0]['features'] == results[2]['features'] == single['features']
+
+def test_chunked_parse_matches_single_pass(extractor):
+    sentences = ["The cat sat on the mat.", "Did it rain?", "Yes!", "A much longer sentence, with a clause, follows here."]
+    paragraphs = [' '.join(sentences[i % 4:] + sentences[:i % 4]) for i in range(40)]
+    text = '\n\n'.join(paragraphs)
+    single = extractor.features_from_doc(extractor.nlp(text))
+    extractor.chunk_size = 300
+    assert extractor.extract_features(text) == pytest.approx(single)
+
+def test_split_at_boundaries_prefers_paragraphs():
+    from src.features.syntactic_features import split_at_boundaries
+    text = "First paragraph. Still first.\n\nSecond one here. " * 20
+    pieces = list(split_at_boundaries(text, 100))
+    assert ''.join(pieces) == text
+    assert all(len(piece) <= 100 for piece in pieces)
+    assert all(piece.endswith('\n\n') for piece in pieces[:-1])
+
+def test_fast_tier_omits_dependency_features(extractor):
+    extractor.tier = 'fast'
+    text = "The cat sat on the mat. It purred."
+    features = extractor.extract_features(text)
+    assert 'avg_sentence_length' in features and 'function_word_ratio' in features
+    assert 'avg_parse_tree_depth' not in features
+    assert not any(name.startswith('dep_') for name in features)
+    extractor.chunk_size = 10
+    assert extractor.extract_features(text).keys() == features.keys()
+
+def test_unknown_tier_rejected():
+    with pytest.raises(ValueError):
+        SyntacticFeatureExtractor(tier='medium')
+
+def reference_statistics(doc):
+    """Token-by-token computation the array-based statistics must reproduce."""
+    def get_depth(token):
+        return max([get_depth(child) for child in token.children] or [0]) + 1
+    sentences = list(doc.sents)
+    return {
+        'pos': Counter(token.pos_ for token in doc),
+        'dep': Counter(token.dep_ for token in doc),
+        'patterns': set((token.dep_, token.head.pos_) for token in doc),
+        'lengths': [len(sent) for sent in sentences],
+        'verbs': [sum(token.pos_ == 'VERB' for token in sent) for sent in sentences],
+        'depths': [get_depth(sent.root) for sent in sentences],
+        'breadths': [len(list(sent.root.children)) for sent in sentences],
+    }
+
+def test_array_statistics_match_token_walk():
+    from src.features.statistics import Moments, SyntacticStatistics
+    nlp = spacy.blank('en')
+    words = ['She', 'said', 'that', 'he', 'left', '.', 'Dogs', 'bark', 'loudly', '.']
+    heads = [1, 1, 4, 4, 1, 1, 7, 7, 7, 7]
+    deps = ['nsubj', 'ROOT', 'mark', 'nsubj', 'ccomp', 'punct', 'nsubj', 'ROOT', 'advmod', 'punct']
+    pos = ['PRON', 'VERB', 'SCONJ', 'PRON', 'VERB', 'PUNCT', 'NOUN', 'VERB', 'ADV', 'PUNCT']
+    doc = Doc(nlp.vocab, words=words, heads=heads, deps=deps, pos=pos)
+    for target in (doc, doc[6:]):
+        reference = reference_statistics(target)
+        stats = SyntacticStatistics.from_doc(target)
+        assert stats.pos_counts == reference['pos']
+        assert stats.dep_counts == reference['dep']
+        assert stats.patterns == reference['patterns']
+        for name, key in (('sentence_lengths', 'lengths'), ('verb_counts', 'verbs'),
+                          ('tree_depths', 'depths'), ('root_breadths', 'breadths')):
+            assert getattr(stats, name).to_list() == Moments.from_values(reference[key]).to_list()
+
+def test_deep_tree_does_not_recurse():
+    from src.features.statistics import SyntacticStatistics
+    nlp = spacy.blank('en')
+    size = 5000
+    # A chain: every token heads the next one
+    doc = Doc(nlp.vocab, words=['w'] * size, heads=[0] + list(range(size - 1)), deps=['dep'] * size)
+    assert SyntacticStatistics.from_doc(doc).tree_depths.to_list() == [1, size, size * size]
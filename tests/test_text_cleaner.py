@@ -0,0 +1,10 @@
+import nltk
+from src.preprocessing.text_cleaner import TextCleaner
+
+def test_construction_and_cleaning_are_offline(monkeypatch):
+    def no_download(*args, **kwargs):
+        raise AssertionError("TextCleaner must not download NLTK data")
+    monkeypatch.setattr(nltk, 'download', no_download)
+
+    cleaner = TextCleaner()
+    assert cleaner.clean("Hello,  World! 42\n") == "hello world"
@@ -0,0 +1,33 @@
+import re
+import pytest
+from src.preprocessing.tokenized_document import TokenizedDocument
+
+TEXTS = [
+    "",
+    "   \n ",
+    "Hello, world! This is a test... Is it? Yes.\n\nNew paragraph_2 here.",
+    "  Leading and trailing space.\n \n\nSecond?!third  ",
+    "Ünïcode wörds, İstanbul and 日本語. Line two",
+]
+
+@pytest.mark.parametrize('text', TEXTS)
+def test_matches_regex_tokenization(text):
+    doc = TokenizedDocument(text)
+    assert doc.words() == re.findall(r'\b\w+\b', text)
+    assert doc.words(lowercase=True) == re.findall(r'\b\w+\b', text.lower())
+    assert doc.tokens() == text.split()
+    assert doc.whitespace_count == sum(1 for char in text if char.isspace())
+    assert doc.punctuation_count == sum(
+        1 for char in text if not char.isalnum() and not char.isspace()
+    )
+
+    paragraphs = re.split(r'\n\s*\n', text.strip())
+    assert doc.paragraph_lengths.tolist() == [len(p) for p in paragraphs]
+
+    sentences = re.split(r'[.!?]+', text)
+    starts, ends = doc.segments(doc.terminator_starts, doc.terminator_ends)
+    assert doc.stripped_lengths(starts, ends).tolist() == [len(s.strip()) for s in sentences]
+
+    sentence_ends = list(re.finditer(r'[.!?]+(?=\s+|$)', text))
+    assert doc.sentence_end_starts.tolist() == [match.start() for match in sentence_ends]
+    assert doc.sentence_end_ends.tolist() == [match.end() for match in sentence_ends]
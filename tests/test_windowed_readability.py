@@ -0,0 +1,64 @@
+import numpy as np
+import pytest
+from src.features.lexical_features import LexicalFeatureExtractor
+from src.features.readability_features import ReadabilityAnalyzer
+from src.features.readability_formulas import READABILITY_METRICS
+from src.features.windowed_readability import LEXICAL_WINDOW_METRICS, WindowedReadability
+from src.preprocessing.tokenized_document import TokenizedDocument
+
+TEXT = (
+    "The committee reviewed the preliminary evaluation. Nobody objected! "
+    "Considerable uncertainty remained about implementation timelines, "
+    "so members requested additional documentation? Short words win. "
+    "It was decided that the remaining questions would wait until autumn"
+)
+
+@pytest.fixture
+def analyzer(tmp_path):
+    return ReadabilityAnalyzer(lexicon_path=str(tmp_path / 'missing.bin'))
+
+@pytest.mark.parametrize('window_size, stride', [(5, 1), (7, 3), (4, 9), (100, 10)])
+def test_windows_match_analyzing_each_window(analyzer, window_size, stride):
+    windows = analyzer.analyze_windows(TEXT, window_size, stride)
+    n = len(TEXT.split())
+    assert windows['start_token'][0] == 0
+    assert np.all(np.diff(windows['start_token']) == stride)
+    if stride <= window_size:
+        assert windows['end_token'][-1] == n
+    for index, (start, end) in enumerate(zip(windows['start_char'], windows['end_char'])):
+        expected = analyzer.analyze(TEXT[start:end])
+        for metric in READABILITY_METRICS:
+            assert windows[metric][index] == pytest.approx(expected[metric]), metric
+
+def test_whole_document_span_matches_analyze(analyzer):
+    text = TEXT + "!! ... final words. . "
+    windowed = WindowedReadability(TokenizedDocument(text), analyzer.syllable_counter)
+    span = windowed.spans([0], [windowed.token_count])
+    expected = analyzer.analyze(text)
+    for metric, value in expected.items():
+        assert span[metric][0] == pytest.approx(value), metric
+
+def test_sections_and_empty_input(analyzer):
+    windowed = WindowedReadability(TokenizedDocument(TEXT), analyzer.syllable_counter)
+    cut = TEXT.index('Considerable')
+    sections = windowed.sections([0, cut], [cut, len(TEXT)])
+    assert sections['words'].tolist() == [len(TEXT[:cut].split()), len(TEXT[cut:].split())]
+    assert sections['sentences'].tolist() == [2, 3]
+
+    empty = analyzer.analyze_windows('', 10)
+    assert all(len(values) == 0 for values in empty.values())
+    assert np.all(analyzer.analyze_windows('word', 10)['sentences'] == [1])
+
+def test_lexical_metrics_match_the_extractor(analyzer):
+    text = TEXT + " The the committee, THE committee's (members) waited; waited again."
+    doc = TokenizedDocument(text)
+    windowed = WindowedReadability(doc, analyzer.syllable_counter)
+    extractor = LexicalFeatureExtractor()
+    windows = windowed.windows(6, 2)
+    # Unsorted spans are counted one by one
+    spans = windowed.spans([10, 0, 3], [40, 12, 3])
+    for result in (windows, spans):
+        for index, (start, end) in enumerate(zip(result['start_char'], result['end_char'])):
+            expected = extractor.extract_features(text[start:end])
+            for metric in LEXICAL_WINDOW_METRICS:
+                assert result[metric][index] == pytest.approx(expected[metric]), metric